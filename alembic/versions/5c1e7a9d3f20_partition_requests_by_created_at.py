@@ -0,0 +1,112 @@
+"""partition requests by created_at
+
+Revision ID: 5c1e7a9d3f20
+Revises: 2bbb15736d9b
+Create Date: 2026-10-19 09:12:05.118342
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from db.partitioning import (
+    PREMAKE_PARTITIONS,
+    create_partition_sql,
+    interval_start,
+    next_interval_start,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d3f20'
+down_revision: Union[str, None] = '2bbb15736d9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEGACY_PARTITION = "requests_legacy"
+
+
+def _request_columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('client_id', sa.UUID(), nullable=False),
+        sa.Column('channel_id', sa.UUID(), nullable=False),
+        sa.Column('provider_id', sa.UUID(), nullable=True),
+        sa.Column('receiver_id', sa.UUID(), nullable=False),
+        sa.Column('template_id', sa.UUID(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', postgresql.ENUM('PENDING', 'ACCEPTED', 'REJECTED', name='notificationstatus', create_type=False), nullable=False),
+        sa.Column('error_message', sa.String(), nullable=True),
+        sa.Column('request_source', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['channel_id'], ['channels.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['provider_id'], ['providers.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['receiver_id'], ['receivers.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['template_id'], ['templates.id'], ondelete='SET NULL'),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('clients', sa.Column('retention_days', sa.Integer(), nullable=True))
+
+    # Existing rows become the first partition instead of being copied: the old
+    # table is attached as-is for everything before the current interval.
+    boundary = interval_start(datetime.utcnow())
+    bound = boundary.isoformat(sep=' ')
+    op.execute("UPDATE requests SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+    op.rename_table('requests', LEGACY_PARTITION)
+    op.alter_column(LEGACY_PARTITION, 'created_at', nullable=False)
+    op.execute(f"ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT requests_pkey")
+    op.execute(f"ALTER TABLE {LEGACY_PARTITION} ADD CONSTRAINT {LEGACY_PARTITION}_pkey PRIMARY KEY (id, created_at)")
+
+    op.create_table(
+        'requests',
+        *_request_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+
+    start = boundary
+    for _ in range(PREMAKE_PARTITIONS + 1):
+        op.execute(create_partition_sql(start))
+        start = next_interval_start(start)
+
+    # Only rows of the current interval are moved; everything older stays in place.
+    op.execute(
+        "INSERT INTO requests (id, client_id, channel_id, provider_id, receiver_id, template_id, payload, "
+        "status, error_message, request_source, created_at, updated_at) "
+        "SELECT id, client_id, channel_id, provider_id, receiver_id, template_id, payload, "
+        "status, error_message, request_source, created_at, updated_at "
+        f"FROM {LEGACY_PARTITION} WHERE created_at >= '{bound}'"
+    )
+    op.execute(f"DELETE FROM {LEGACY_PARTITION} WHERE created_at >= '{bound}'")
+
+    # A validated CHECK matching the bound lets ATTACH skip its own full-table scan.
+    op.execute(f"ALTER TABLE {LEGACY_PARTITION} ADD CONSTRAINT {LEGACY_PARTITION}_bound CHECK (created_at < '{bound}')")
+    op.execute(f"ALTER TABLE requests ATTACH PARTITION {LEGACY_PARTITION} FOR VALUES FROM (MINVALUE) TO ('{bound}')")
+    op.execute(f"ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT {LEGACY_PARTITION}_bound")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        'requests_unpartitioned',
+        *_request_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(
+        "INSERT INTO requests_unpartitioned (id, client_id, channel_id, provider_id, receiver_id, template_id, "
+        "payload, status, error_message, request_source, created_at, updated_at) "
+        "SELECT id, client_id, channel_id, provider_id, receiver_id, template_id, "
+        "payload, status, error_message, request_source, created_at, updated_at FROM requests"
+    )
+    op.drop_table('requests')  # drops every partition with it
+    op.rename_table('requests_unpartitioned', 'requests')
+    op.execute("ALTER TABLE requests RENAME CONSTRAINT requests_unpartitioned_pkey TO requests_pkey")
+    op.alter_column('requests', 'created_at', nullable=True)
+    op.drop_column('clients', 'retention_days')
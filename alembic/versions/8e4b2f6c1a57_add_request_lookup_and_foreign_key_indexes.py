@@ -0,0 +1,67 @@
+"""add request lookup and foreign key indexes
+
+Revision ID: 8e4b2f6c1a57
+Revises: 5c1e7a9d3f20
+Create Date: 2026-10-19 11:47:31.502116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.partitioning import create_partitioned_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2f6c1a57'
+down_revision: Union[str, None] = '5c1e7a9d3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, columns, include, where) for indexes on the partitioned requests table.
+REQUEST_INDEXES = [
+    # Receiver inbox listing (keyset on id) and ON DELETE CASCADE from receivers.
+    ('ix_requests_receiver_id_id', 'receiver_id, id', 'status', None),
+    # Per-client time range queries and ON DELETE CASCADE from clients.
+    ('ix_requests_client_id_created_at', 'client_id, created_at', None, None),
+    # ON DELETE CASCADE / SET NULL from channels, providers and templates.
+    ('ix_requests_channel_id', 'channel_id', None, None),
+    ('ix_requests_provider_id', 'provider_id', None, 'provider_id IS NOT NULL'),
+    ('ix_requests_template_id', 'template_id', None, 'template_id IS NOT NULL'),
+    # Requests still waiting for a status transition, oldest first.
+    ('ix_requests_pending_created_at', 'created_at', None, "status = 'PENDING'"),
+]
+
+# (name, table, columns) for indexes on the regular tables; each supports a keyset
+# listing by parent id as well as the cascade from that parent.
+TABLE_INDEXES = [
+    ('ix_receivers_client_id_id', 'receivers', ['client_id', 'id']),
+    ('ix_providers_channel_id_id', 'providers', ['channel_id', 'id']),
+    ('ix_templates_channel_id_id', 'templates', ['channel_id', 'id']),
+    ('ix_templates_provider_id_id', 'templates', ['provider_id', 'id']),
+    # ProviderDAO.get_provider_by_name matches on lower(name).
+    ('ix_providers_lower_name', 'providers', [sa.text('lower(name)')]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in TABLE_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+        conn = op.get_bind()
+        for name, columns, include, where in REQUEST_INDEXES:
+            create_partitioned_index_concurrently(conn, name, columns, include=include, where=where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _columns, _include, _where in REQUEST_INDEXES:
+        # Dropping the parent index drops every partition index attached to it.
+        op.drop_index(name, table_name='requests', if_exists=True)
+
+    with op.get_context().autocommit_block():
+        for name, table, _columns in TABLE_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,36 @@
+"""add request message id
+
+Revision ID: a3d9c4e71b08
+Revises: 8e4b2f6c1a57
+Create Date: 2026-10-19 14:05:12.640391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.partitioning import create_partitioned_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9c4e71b08'
+down_revision: Union[str, None] = '8e4b2f6c1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A nullable column without a default is a catalog-only change on every partition.
+    op.add_column('requests', sa.Column('message_id', sa.String(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        create_partitioned_index_concurrently(
+            op.get_bind(), 'ix_requests_message_id', 'message_id', where='message_id IS NOT NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_requests_message_id', table_name='requests', if_exists=True)
+    op.drop_column('requests', 'message_id')
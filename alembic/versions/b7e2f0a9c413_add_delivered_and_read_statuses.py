@@ -0,0 +1,39 @@
+"""add delivered and read statuses
+
+Revision ID: b7e2f0a9c413
+Revises: a3d9c4e71b08
+Create Date: 2026-10-19 16:21:44.205817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f0a9c413'
+down_revision: Union[str, None] = 'a3d9c4e71b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Appending enum values only touches the catalog; no rows are rewritten.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE notificationstatus ADD VALUE IF NOT EXISTS 'DELIVERED'")
+        op.execute("ALTER TYPE notificationstatus ADD VALUE IF NOT EXISTS 'READ'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop enum values: fold them back into ACCEPTED and swap the type.
+    op.execute("UPDATE requests SET status = 'ACCEPTED' WHERE status IN ('DELIVERED', 'READ')")
+    op.drop_index('ix_requests_pending_created_at', table_name='requests')
+    op.execute("ALTER TYPE notificationstatus RENAME TO notificationstatus_old")
+    op.execute("CREATE TYPE notificationstatus AS ENUM ('PENDING', 'ACCEPTED', 'REJECTED')")
+    op.execute(
+        "ALTER TABLE requests ALTER COLUMN status TYPE notificationstatus "
+        "USING status::text::notificationstatus"
+    )
+    op.execute("DROP TYPE notificationstatus_old")
+    op.execute("CREATE INDEX ix_requests_pending_created_at ON requests (created_at) WHERE status = 'PENDING'")
@@ -0,0 +1,55 @@
+"""add content addressed payloads
+
+Revision ID: c5f1a8e2d934
+Revises: b7e2f0a9c413
+Create Date: 2026-10-19 16:42:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.partitioning import create_partitioned_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1a8e2d934'
+down_revision: Union[str, None] = 'b7e2f0a9c413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'payloads',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('hash'),
+    )
+    op.create_index('ix_payloads_created_at', 'payloads', ['created_at'])
+
+    # Existing rows keep their inline payload; the column is NULL for them.
+    op.add_column('requests', sa.Column('payload_hash', sa.String(length=64), nullable=True))
+    op.create_foreign_key('requests_payload_hash_fkey', 'requests', 'payloads', ['payload_hash'], ['hash'])
+
+    with op.get_context().autocommit_block():
+        create_partitioned_index_concurrently(
+            op.get_bind(), 'ix_requests_payload_hash', 'payload_hash', where='payload_hash IS NOT NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold shared bodies back into the rows before the column goes away.
+    op.execute(
+        "UPDATE requests r SET payload = (p.body::jsonb || r.payload::jsonb)::json "
+        "FROM payloads p WHERE r.payload_hash = p.hash"
+    )
+    op.drop_index('ix_requests_payload_hash', table_name='requests', if_exists=True)
+    op.drop_constraint('requests_payload_hash_fkey', 'requests', type_='foreignkey')
+    op.drop_column('requests', 'payload_hash')
+    op.drop_index('ix_payloads_created_at', table_name='payloads')
+    op.drop_table('payloads')
@@ -0,0 +1,35 @@
+"""add client delivery mode
+
+Revision ID: d2a7c6b1e845
+Revises: c5f1a8e2d934
+Create Date: 2026-10-19 17:05:12.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c6b1e845'
+down_revision: Union[str, None] = 'c5f1a8e2d934'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+delivery_mode = sa.Enum('GROUP', 'CURSOR', name='deliverymode')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    delivery_mode.create(op.get_bind(), checkfirst=True)
+    # A constant default is stored in the catalog, so existing rows are not rewritten.
+    op.add_column(
+        'clients',
+        sa.Column('delivery_mode', delivery_mode, server_default='GROUP', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('clients', 'delivery_mode')
+    delivery_mode.drop(op.get_bind(), checkfirst=True)
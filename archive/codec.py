@@ -0,0 +1,44 @@
+import gzip
+from typing import IO
+
+from config.client import ConfigClient
+
+try:
+    import zstandard
+except ImportError:  # optional: archives are written with gzip when zstandard is missing
+    zstandard = None
+
+ZSTD_LEVEL: int = int(ConfigClient.get_property("ZSTD_LEVEL", section="ARCHIVE"))
+
+ZSTD_SUFFIX = ".jsonl.zst"
+GZIP_SUFFIX = ".jsonl.gz"
+
+
+def archive_suffix() -> str:
+    """
+    File suffix for newly written archives, which decides their compression.
+    """
+    return ZSTD_SUFFIX if zstandard is not None else GZIP_SUFFIX
+
+
+def open_for_write(path: str) -> IO[str]:
+    """
+    Open a compressed JSONL file for writing, compressed according to its suffix.
+    """
+    if path.endswith(ZSTD_SUFFIX):
+        return zstandard.open(path, "wt", cctx=zstandard.ZstdCompressor(level=ZSTD_LEVEL), encoding="utf-8")
+    return gzip.open(path, "wt", encoding="utf-8")
+
+
+def open_for_read(path: str) -> IO[str]:
+    """
+    Open a compressed JSONL archive for reading line by line.
+
+    Raises:
+        RuntimeError: If the file is zstd-compressed and zstandard is not installed.
+    """
+    if path.endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.open(path, "rt", encoding="utf-8")
+    return gzip.open(path, "rt", encoding="utf-8")
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import IO, Any, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Text, column, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from archive.codec import archive_suffix, open_for_write
+from archive.manifest import ARCHIVE_DIRECTORY, ArchiveFile, Manifest, archive_path, load_manifest, save_manifest
+from config.client import ConfigClient
+from db.partitioning import PARENT_TABLE, get_retention_days, list_partitions
+from models import Request
+
+ARCHIVE_AFTER_DAYS: int = int(ConfigClient.get_property("ARCHIVE_AFTER_DAYS", section="ARCHIVE"))
+ROWS_PER_FILE: int = int(ConfigClient.get_property("ROWS_PER_FILE", section="ARCHIVE"))
+FETCH_SIZE: int = int(ConfigClient.get_property("FETCH_SIZE", section="ARCHIVE"))
+
+# Typed columns, so JSON payloads, enums and UUIDs come back as Python values.
+_COLUMNS = [column(c.name, c.type) for c in Request.__table__.columns] + [column("shared_body", Text)]
+# Selected by name: `.columns()` labels result columns by position, and the
+# partitions' physical column order (set by migrations) differs from the model's.
+_SELECT_LIST = ", ".join(f"r.{c.name}" for c in Request.__table__.columns) + ", p.body AS shared_body"
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="microseconds")
+    if isinstance(value, (date, UUID)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+
+class _PartitionWriter:
+    """
+    Writes one partition's rows, already sorted by (client_id, created_at), into
+    files of at most `rows_per_file` rows while tracking each file's ranges.
+    """
+
+    def __init__(self, partition: str, directory: str, rows_per_file: int):
+        self.partition = partition
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self.files: List[ArchiveFile] = []
+        self._handle: Optional[IO[str]] = None
+        self._current: Optional[ArchiveFile] = None
+
+    def write_rows(self, rows: Sequence[Any]) -> None:
+        for row in rows:
+            if self._current is None or self._current.rows >= self.rows_per_file:
+                self._roll()
+            record = dict(row._mapping)
+            # Archives are self-contained: shared bodies are folded back into the payload.
+            shared_body = record.pop("shared_body")
+            if shared_body is not None:
+                record["payload"] = {**json.loads(shared_body), **record["payload"]}
+            client_id = str(record["client_id"])
+            created_at = record["created_at"].isoformat(timespec="microseconds")
+            self._handle.write(json.dumps(record, default=_json_default, separators=(",", ":")) + "\n")
+
+            current = self._current
+            if not current.rows:
+                current.min_client_id = client_id
+                current.min_created_at = current.max_created_at = created_at
+            current.max_client_id = client_id
+            current.min_created_at = min(current.min_created_at, created_at)
+            current.max_created_at = max(current.max_created_at, created_at)
+            current.rows += 1
+
+    def close(self) -> List[ArchiveFile]:
+        self._finish()
+        return self.files
+
+    def _roll(self) -> None:
+        self._finish()
+        name = f"{self.partition}_{len(self.files):05d}{archive_suffix()}"
+        self._handle = open_for_write(archive_path(name, self.directory))
+        self._current = ArchiveFile(name, self.partition, 0, 0, "", "", "", "")
+
+    def _finish(self) -> None:
+        if self._handle is None:
+            return
+        self._handle.flush()
+        self._handle.close()
+        path = archive_path(self._current.name, self.directory)
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+        self._current.size_bytes = os.path.getsize(path)
+        self.files.append(self._current)
+        self._handle = self._current = None
+
+
+async def export_partition(engine: AsyncEngine, partition: str, directory: str = ARCHIVE_DIRECTORY) -> List[ArchiveFile]:
+    """
+    Write every row of `partition` to compressed JSONL files, streamed through a
+    server-side cursor in `FETCH_SIZE` batches; compression runs off the event loop.
+
+    Returns:
+        List[ArchiveFile]: The files written, durable on disk.
+    """
+    writer = _PartitionWriter(partition, directory, ROWS_PER_FILE)
+    query = text(
+        f"SELECT {_SELECT_LIST} FROM {partition} r "
+        "LEFT JOIN payloads p ON p.hash = r.payload_hash "
+        "ORDER BY r.client_id, r.created_at, r.id"
+    ).columns(*_COLUMNS)
+    try:
+        async with engine.connect() as conn:
+            result = await conn.stream(query)
+            async for rows in result.partitions(FETCH_SIZE):
+                await asyncio.to_thread(writer.write_rows, rows)
+    finally:
+        files = await asyncio.to_thread(writer.close)
+    return files
+
+
+async def archive_partitions(engine: AsyncEngine, now: Optional[datetime] = None, directory: str = ARCHIVE_DIRECTORY) -> List[str]:
+    """
+    Move every partition older than `ARCHIVE_AFTER_DAYS` to archive files and drop it.
+
+    A partition is recorded in the manifest before it is dropped, so a pass that
+    dies midway either re-exports the partition (overwriting its files) or finds
+    it archived and only drops it. Rows updated between the export and the drop
+    are lost, which is why the archive age should be well past the point where
+    requests still change status.
+
+    Returns:
+        List[str]: Names of the partitions that were archived.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=ARCHIVE_AFTER_DAYS)
+    os.makedirs(directory, exist_ok=True)
+    manifest = await asyncio.to_thread(load_manifest, directory)
+
+    async with engine.connect() as conn:
+        partitions = await list_partitions(conn)
+    archived: List[str] = []
+    for name, upper_bound in sorted(partitions):
+        if upper_bound is None or upper_bound > cutoff:
+            continue
+        if name not in manifest.partitions:
+            files = await export_partition(engine, name, directory)
+            manifest.files.extend(files)
+            await asyncio.to_thread(save_manifest, manifest, directory)
+            logger.info("Archived partition %s to %d files (%d rows)", name, len(files), sum(f.rows for f in files))
+        await drop_partition(engine, name)
+        archived.append(name)
+    return archived
+
+
+async def drop_partition(engine: AsyncEngine, name: str) -> None:
+    """
+    Detach a partition without blocking the parent table, then drop it.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} CONCURRENTLY"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+
+
+async def prune_archive(engine: AsyncEngine, now: Optional[datetime] = None, directory: str = ARCHIVE_DIRECTORY) -> List[str]:
+    """
+    Delete archive files whose rows are all older than the longest client
+    retention, the same rule partition maintenance applies to live partitions.
+
+    Returns:
+        List[str]: Names of the deleted files.
+    """
+    now = now or datetime.utcnow()
+    async with engine.connect() as conn:
+        retention_days = await get_retention_days(conn)
+    cutoff = (now - timedelta(days=retention_days)).isoformat(timespec="microseconds")
+
+    manifest = await asyncio.to_thread(load_manifest, directory)
+    expired = [f for f in manifest.files if f.max_created_at < cutoff]
+    if not expired:
+        return []
+    # Drop the entries first: a file missing from the manifest is never read,
+    # while a manifest entry without its file would fail queries.
+    await asyncio.to_thread(save_manifest, Manifest(files=[f for f in manifest.files if f not in expired]), directory)
+    for archive_file in expired:
+        try:
+            os.remove(archive_path(archive_file.name, directory))
+        except FileNotFoundError:
+            pass
+    logger.info("Pruned %d archive files older than %s", len(expired), cutoff)
+    return [f.name for f in expired]
@@ -0,0 +1,87 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from config.client import ConfigClient
+
+ARCHIVE_DIRECTORY: str = ConfigClient.get_property("DIRECTORY", section="ARCHIVE")
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class ArchiveFile:
+    """
+    One archive file and the value ranges it covers.
+
+    Rows are written sorted by (client_id, created_at), so a client's rows sit in
+    few files and the client range alone rules out most files for a query.
+    UUIDs and timestamps are stored as canonical strings, whose lexical order
+    matches their natural order.
+    """
+    name: str
+    partition: str
+    rows: int
+    size_bytes: int
+    min_client_id: str
+    max_client_id: str
+    min_created_at: str
+    max_created_at: str
+
+    def might_contain(self, client_id: str, start: Optional[str] = None, end: Optional[str] = None) -> bool:
+        """
+        Whether the file can hold rows of `client_id` created within [start, end).
+        """
+        if not self.min_client_id <= client_id <= self.max_client_id:
+            return False
+        if start is not None and self.max_created_at < start:
+            return False
+        if end is not None and self.min_created_at >= end:
+            return False
+        return True
+
+
+@dataclass
+class Manifest:
+    """
+    Index of every archive file, kept as one JSON document next to the files.
+    """
+    files: List[ArchiveFile]
+
+    @property
+    def partitions(self) -> Dict[str, List[ArchiveFile]]:
+        partitions: Dict[str, List[ArchiveFile]] = {}
+        for archive_file in self.files:
+            partitions.setdefault(archive_file.partition, []).append(archive_file)
+        return partitions
+
+
+def archive_path(name: str, directory: str = ARCHIVE_DIRECTORY) -> str:
+    return os.path.join(directory, name)
+
+
+def load_manifest(directory: str = ARCHIVE_DIRECTORY) -> Manifest:
+    """
+    Read the manifest, or an empty one if nothing was archived yet.
+    """
+    try:
+        with open(archive_path(MANIFEST_NAME, directory), encoding="utf-8") as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        return Manifest(files=[])
+    return Manifest(files=[ArchiveFile(**entry) for entry in document["files"]])
+
+
+def save_manifest(manifest: Manifest, directory: str = ARCHIVE_DIRECTORY) -> None:
+    """
+    Replace the manifest atomically, so readers never see a partial one and a
+    crash leaves the previous version in place.
+    """
+    path = archive_path(MANIFEST_NAME, directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": [asdict(archive_file) for archive_file in manifest.files]}, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional
+from uuid import UUID
+
+from archive.codec import open_for_read
+from archive.manifest import ARCHIVE_DIRECTORY, ArchiveFile, archive_path, load_manifest
+from enums.notification_status import NotificationStatus
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    # Archived timestamps are naive UTC, like the created_at column.
+    return value.replace(tzinfo=None).isoformat(timespec="microseconds") if value else None
+
+
+def select_files(
+    client_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    directory: str = ARCHIVE_DIRECTORY,
+) -> List[ArchiveFile]:
+    """
+    Archive files that may hold rows of `client_id` created within [start, end),
+    decided from the manifest alone without opening any file.
+    """
+    manifest = load_manifest(directory)
+    client, start_ts, end_ts = str(client_id), _timestamp(start), _timestamp(end)
+    return [f for f in manifest.files if f.might_contain(client, start_ts, end_ts)]
+
+
+def scan_files(
+    files: List[ArchiveFile],
+    client_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    receiver_id: Optional[UUID] = None,
+    status: Optional[NotificationStatus] = None,
+    limit: Optional[int] = None,
+    directory: str = ARCHIVE_DIRECTORY,
+) -> Iterator[str]:
+    """
+    Yield matching archived requests as JSON lines, reading `files` one line at a time.
+
+    Files are sorted by client, so reading a file stops at the first row past `client_id`.
+    """
+    client, start_ts, end_ts = str(client_id), _timestamp(start), _timestamp(end)
+    receiver = str(receiver_id) if receiver_id else None
+    remaining = limit
+    for archive_file in files:
+        with open_for_read(archive_path(archive_file.name, directory)) as f:
+            for line in f:
+                record = json.loads(line)
+                if record["client_id"] < client:
+                    continue
+                if record["client_id"] > client:
+                    break
+                if start_ts is not None and record["created_at"] < start_ts:
+                    continue
+                if end_ts is not None and record["created_at"] >= end_ts:
+                    continue
+                if receiver is not None and record["receiver_id"] != receiver:
+                    continue
+                if status is not None and record["status"] != status.value:
+                    continue
+                yield line
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining <= 0:
+                        return
@@ -0,0 +1,104 @@
+"""
+Benchmark of the notification stream entry codecs.
+
+For each codec and a few representative entries, measures the Redis memory a
+stream of such entries takes (reported per 1M entries, from MEMORY USAGE) and
+the CPU time to encode and decode one entry.
+
+    python -m benchmarks.stream_codec --redis-url redis://localhost:6379/15 --entries 100000
+
+The benchmark writes to `bench:stream_codec:*` keys and deletes them when done;
+the URL is required so that it is never pointed at a production Redis by accident.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from redis import asyncio as aioredis
+
+from schema.notification import NotificationRequestData
+from websocket_manager.entry_codec import JSON, MSGPACK, MSGPACK_ZSTD, decode_entry, encode_entry, resolve_codec
+
+KEY_PREFIX = "bench:stream_codec"
+PIPELINE_SIZE = 1000
+CPU_ITERATIONS = 20_000
+
+
+def sample_entries() -> Dict[str, Dict[str, Any]]:
+    """
+    Entries as `_add_entry` writes them: a typical inline notification, a large
+    inline one, and a reference to a body in the payload store.
+    """
+    small = NotificationRequestData(
+        user_id="user-1234567", type="info", color_code="#1e88e5", title="Your order has shipped",
+        message="Order #48213 is on its way and should arrive by Thursday.", timeout=5000, is_sticky=False,
+    )
+    large = small.model_copy(update={
+        "message": "Your weekly activity summary. " * 100,
+        "metadata": {f"key_{i}": f"value number {i}" for i in range(20)},
+    })
+    timestamp = time.time()
+    return {
+        "inline": {"message": small.model_dump_json(exclude_unset=True), "timestamp": timestamp},
+        "inline-large": {"message": large.model_dump_json(exclude_unset=True), "timestamp": timestamp},
+        "reference": {"h": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                      "v": json.dumps({"user_id": "user-1234567"}), "timestamp": timestamp},
+    }
+
+
+def per_call_us(fn: Callable[[], Any], iterations: int = CPU_ITERATIONS) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def stream_bytes_per_million(client: aioredis.Redis, key: str, encoded: Dict[str, Any], entries: int) -> float:
+    await client.delete(key)
+    try:
+        written = 0
+        while written < entries:
+            batch = min(PIPELINE_SIZE, entries - written)
+            async with client.pipeline(transaction=False) as pipe:
+                for _ in range(batch):
+                    pipe.xadd(key, encoded)
+                await pipe.execute()
+            written += batch
+        usage = await client.memory_usage(key, samples=0)
+        return usage * 1_000_000 / entries
+    finally:
+        await client.delete(key)
+
+
+async def run(redis_url: str, entries: int, codecs: List[str]) -> None:
+    client = aioredis.from_url(redis_url, decode_responses=False)
+    samples = sample_entries()
+    print(f"{'codec':<14}{'entry':<14}{'bytes/entry':>12}{'MiB per 1M':>12}{'encode us':>11}{'decode us':>11}")
+    try:
+        for codec in codecs:
+            if resolve_codec(codec) != codec:
+                print(f"{codec:<14}skipped: optional dependency not installed")
+                continue
+            for name, fields in samples.items():
+                encoded = encode_entry(fields, codec)
+                # What the binary client hands back for the entry.
+                raw = {k.encode(): v if isinstance(v, bytes) else v.encode() for k, v in encoded.items()}
+                size = sum(len(k) + len(v) for k, v in raw.items())
+                memory = await stream_bytes_per_million(client, f"{KEY_PREFIX}:{codec}:{name}", encoded, entries)
+                encode_us = per_call_us(lambda: encode_entry(fields, codec))
+                decode_us = per_call_us(lambda: decode_entry(raw))
+                print(f"{codec:<14}{name:<14}{size:>12}{memory / 2 ** 20:>12.1f}{encode_us:>11.2f}{decode_us:>11.2f}")
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Redis memory and CPU cost of the stream entry codecs.")
+    parser.add_argument("--redis-url", required=True, help="URL of a scratch Redis database")
+    parser.add_argument("--entries", type=int, default=100_000, help="entries written per codec and sample")
+    parser.add_argument("--codecs", default=f"{JSON},{MSGPACK},{MSGPACK_ZSTD}", help="comma-separated codecs to compare")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.redis_url, args.entries, args.codecs.split(",")))
@@ -0,0 +1,130 @@
+"""
+Benchmark of the notification stream layouts.
+
+Builds the same workload in both layouts and reports the Redis memory each takes,
+per user, from the change in INFO `used_memory` (which, unlike MEMORY USAGE,
+includes the keyspace overhead of every extra key):
+  - `per_user`: one stream per user with its own consumer group, every entry
+    delivered and a share of them still pending;
+  - `sharded`: the same entries spread over `--shards` shard streams, one
+    consumer group per shard, and a per-user index of the pending entries.
+
+    python -m benchmarks.stream_layout --redis-url redis://localhost:6379/15 --users 100000
+
+The benchmark writes to `bench:stream_layout:*` keys and deletes them when done;
+the URL is required so that it is never pointed at a production Redis by accident.
+"""
+import argparse
+import asyncio
+import zlib
+from typing import Any, Dict
+
+from redis import asyncio as aioredis
+
+from benchmarks.stream_codec import sample_entries
+from websocket_manager.entry_codec import encode_entry
+
+KEY_PREFIX = "bench:stream_layout"
+GROUP_NAME = "bench_group"
+PIPELINE_USERS = 200
+
+
+async def used_memory(client: aioredis.Redis) -> int:
+    return int((await client.info("memory"))["used_memory"])
+
+
+async def delete_keys(client: aioredis.Redis) -> None:
+    batch = []
+    async for key in client.scan_iter(match=f"{KEY_PREFIX}:*", count=1000):
+        batch.append(key)
+        if len(batch) >= 1000:
+            await client.unlink(*batch)
+            batch = []
+    if batch:
+        await client.unlink(*batch)
+
+
+async def build_per_user(client: aioredis.Redis, encoded: Dict[str, Any], users: int, entries: int, pending: int) -> None:
+    for first in range(0, users, PIPELINE_USERS):
+        async with client.pipeline(transaction=False) as pipe:
+            for user in range(first, min(first + PIPELINE_USERS, users)):
+                key = f"{KEY_PREFIX}:user:{user}"
+                for _ in range(entries):
+                    pipe.xadd(key, encoded)
+                pipe.xgroup_create(key, GROUP_NAME, id="0")
+                # Deliver everything; the last `pending` entries stay unacknowledged.
+                pipe.xreadgroup(GROUP_NAME, str(user), {key: ">"}, count=entries)
+            results = await pipe.execute()
+        ids = [
+            [msg_id for msg_id, _fields in reply[0][1]]
+            for reply in results[entries + 1::entries + 2]
+        ]
+        async with client.pipeline(transaction=False) as pipe:
+            for user, user_ids in zip(range(first, first + PIPELINE_USERS), ids):
+                acked = user_ids[:len(user_ids) - pending]
+                if acked:
+                    pipe.xack(f"{KEY_PREFIX}:user:{user}", GROUP_NAME, *acked)
+            await pipe.execute()
+
+
+async def build_sharded(
+    client: aioredis.Redis, encoded: Dict[str, Any], users: int, entries: int, pending: int, shards: int
+) -> None:
+    for shard in range(shards):
+        await client.xgroup_create(f"{KEY_PREFIX}:shard:{shard}", GROUP_NAME, id="$", mkstream=True)
+    for first in range(0, users, PIPELINE_USERS):
+        batch = range(first, min(first + PIPELINE_USERS, users))
+        async with client.pipeline(transaction=False) as pipe:
+            for user in batch:
+                shard = zlib.crc32(str(user).encode()) % shards
+                for _ in range(entries):
+                    pipe.xadd(f"{KEY_PREFIX}:shard:{shard}", {**encoded, "u": str(user)})
+            results = await pipe.execute()
+        async with client.pipeline(transaction=False) as pipe:
+            for index, user in enumerate(batch):
+                user_ids = results[index * entries:(index + 1) * entries]
+                unacked = user_ids[len(user_ids) - pending:]
+                if unacked:
+                    pipe.zadd(
+                        f"{KEY_PREFIX}:index:{user}",
+                        {msg_id: int(msg_id.split(b"-")[0]) for msg_id in unacked},
+                    )
+            await pipe.execute()
+    # Each shard's group has read everything and keeps nothing pending.
+    for shard in range(shards):
+        await client.xgroup_setid(f"{KEY_PREFIX}:shard:{shard}", GROUP_NAME, id="$")
+
+
+async def run(redis_url: str, users: int, entries: int, pending: int, shards: int) -> None:
+    client = aioredis.from_url(redis_url, decode_responses=False)
+    encoded = encode_entry(sample_entries()["inline"])
+    print(f"{users} users x {entries} entries ({pending} pending each), {shards} shards")
+    print(f"{'layout':<10}{'keys':>10}{'MiB':>10}{'bytes/user':>12}")
+    try:
+        await delete_keys(client)
+        for layout in ("per_user", "sharded"):
+            before = await used_memory(client)
+            if layout == "per_user":
+                await build_per_user(client, encoded, users, entries, pending)
+            else:
+                await build_sharded(client, encoded, users, entries, pending, shards)
+            used = await used_memory(client) - before
+            keys = 0
+            async for _key in client.scan_iter(match=f"{KEY_PREFIX}:*", count=1000):
+                keys += 1
+            print(f"{layout:<10}{keys:>10}{used / 2 ** 20:>10.1f}{used / users:>12.0f}")
+            await delete_keys(client)
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Redis memory of per-user and sharded notification streams.")
+    parser.add_argument("--redis-url", required=True, help="URL of a scratch Redis database")
+    parser.add_argument("--users", type=int, default=100_000, help="number of users")
+    parser.add_argument("--entries", type=int, default=10, help="entries per user")
+    parser.add_argument("--pending", type=int, default=2, help="entries per user left unacknowledged")
+    parser.add_argument("--shards", type=int, default=64, help="number of shard streams")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.redis_url, args.users, args.entries, min(args.pending, args.entries), args.shards))
@@ -1,16 +1,20 @@
 class Endpoints:
     class Client:
         CREATE = "/clients"
+        GET_ALL = "/clients"
         REGENERATE_API_KEY = "/clients/{client_id}/regenerate_api_key"
         MARK_CLIENT_INACTIVE = "/clients/{client_id}/mark_inactive"
+        DELIVERY_MODE = "/clients/{client_id}/delivery_mode"
 
     class Channel:
         CREATE = "/channels"
+        GET_ALL = "/channels"
         GET_BY_NAME = "/channels/name/{name}"
         MARK_CHANNEL_INACTIVE = "/channels/{channel_id}/mark_inactive"
 
     class Provider:
         CREATE = "/providers"
+        GET_ALL = "/providers"
         GET_BY_NAME = "/providers/name/{name}"
         GET_BY_CHANNEL = "/channels/{channel_id}/providers"
         MARK_PROVIDER_INACTIVE = "/providers/{provider_id}/mark_inactive"
@@ -33,6 +37,21 @@ class Endpoints:
     class Notification:
         SEND = "/notification/send"
         ACKNOWLEDGE = "/notification/acknowledge"
+        ACKNOWLEDGE_BULK = "/notification/acknowledge/bulk"
+        UNREAD = "/notification/unread"
+        INBOX = "/notification/inbox"
+        PUBLISH_TOPIC = "/notification/topic"
+        BROADCAST = "/notification/broadcast"
+
+    class Webhook:
+        INGEST = "/webhooks/{provider_id}"
+
+    class Archive:
+        REQUESTS = "/archive/requests"
+
+    class Metrics:
+        GET_ALL = "/metrics"
+        LATENCY = "/metrics/latency"
 
     class WebSocket:
         WS_CONNECTION = "/ws/{client_name}/{user_id}"
@@ -11,6 +11,7 @@ class ErrorCodes:
         GET_ALL_FAILED = 2006
         DELETE_FAILED = 2007
         GET_BY_NAME_FAILED = 2008
+        UPDATE_FAILED = 2009
 
     class Channel(int, Enum):
         CREATE_FAILED = 2101
@@ -52,3 +53,32 @@ class ErrorCodes:
         GET_BY_ID_FAILED = 2502
         GET_BY_RECEIVER_FAILED = 2503
         STATUS_UPDATE_FAILED = 2504
+
+    class Pagination(int, Enum):
+        INVALID_CURSOR = 2601
+
+    class Notification(int, Enum):
+        ACKNOWLEDGE_FAILED = 2701
+        UNREAD_COUNT_FAILED = 2702
+        TOO_MANY_USERS = 2703
+        INBOX_FAILED = 2704
+        TOPIC_PUBLISH_FAILED = 2705
+        SEGMENT_WITHOUT_CLIENT = 2706
+        BROADCAST_FAILED = 2707
+
+    class Webhook(int, Enum):
+        PROVIDER_NOT_FOUND = 2801
+        INVALID_SIGNATURE = 2802
+        INVALID_PAYLOAD = 2803
+        PAYLOAD_TOO_LARGE = 2804
+        ENQUEUE_FAILED = 2805
+
+    class Archive(int, Enum):
+        INVALID_TIME_RANGE = 2901
+        QUERY_FAILED = 2902
+
+    class Payload(int, Enum):
+        STORE_FAILED = 3001
+        GET_FAILED = 3002
+        DELETE_FAILED = 3003
+        NOT_FOUND = 3004
@@ -12,6 +12,7 @@ class ErrorMessages:
         DELETE_FAILED = "An error occurred while deleting the client. Please try again later."
         NOT_FOUND = "Client not found for the given client ID."
         GET_BY_NAME_FAILED = "We couldn't retrieve the client details using the provided name. Please check and try again."
+        UPDATE_FAILED = "An error occurred while updating the client. Please try again later."
 
     class Channel(str, Enum):
         CREATE_FAILED = "We were unable to create a new channel at this time. Please try again later."
@@ -61,3 +62,32 @@ class ErrorMessages:
         GET_BY_RECEIVER_FAILED = "We couldn't retrieve requests for the specified receiver. Please check the receiver ID and try again."
         STATUS_UPDATE_FAILED = "An error occurred while updating the request status. Please try again later."
         NOT_FOUND = "Request not found for the given request ID."
+
+    class Pagination(str, Enum):
+        INVALID_CURSOR = "The pagination cursor is invalid or has expired. Please restart from the first page."
+
+    class Notification(str, Enum):
+        ACKNOWLEDGE_FAILED = "We couldn't acknowledge the notifications. Please try again later."
+        UNREAD_COUNT_FAILED = "We couldn't retrieve unread notification counts. Please try again later."
+        TOO_MANY_USERS = "Too many user IDs were requested at once. Please split the lookup into smaller batches."
+        INBOX_FAILED = "We couldn't retrieve the notification inbox. Please try again later."
+        TOPIC_PUBLISH_FAILED = "We couldn't publish the notification to the topic. Please try again later."
+        SEGMENT_WITHOUT_CLIENT = "A broadcast segment can only be used together with a client ID."
+        BROADCAST_FAILED = "We couldn't queue the broadcast. Please try again later."
+
+    class Webhook(str, Enum):
+        PROVIDER_NOT_FOUND = "No active provider exists for this webhook URL."
+        INVALID_SIGNATURE = "The webhook signature could not be verified."
+        INVALID_PAYLOAD = "The webhook payload could not be parsed."
+        PAYLOAD_TOO_LARGE = "The webhook payload exceeds the maximum accepted size."
+        ENQUEUE_FAILED = "We couldn't queue the webhook for processing. Please retry later."
+
+    class Archive(str, Enum):
+        INVALID_TIME_RANGE = "The start of the time range must be before its end."
+        QUERY_FAILED = "We couldn't read the request archive. Please try again later."
+
+    class Payload(str, Enum):
+        STORE_FAILED = "We couldn't store the notification body. Please try again later."
+        GET_FAILED = "We couldn't load the notification body. Please try again later."
+        DELETE_FAILED = "An error occurred while deleting unused notification bodies."
+        NOT_FOUND = "The notification body could not be found."
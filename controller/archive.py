@@ -0,0 +1,80 @@
+import logging
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from archive.query import scan_files, select_files
+from config.client import ConfigClient
+from constants.endpoints import Endpoints
+from constants.error_codes import ErrorCodes
+from constants.error_messages import ErrorMessages
+from dependencies.authentication import get_superuser
+from enums.notification_status import NotificationStatus
+from exception.app_exception import AppException
+from schema.base import ErrorResponse
+from utils.streaming import NDJSON_MEDIA_TYPE
+
+MAX_QUERY_ROWS: int = int(ConfigClient.get_property("MAX_QUERY_ROWS", section="ARCHIVE"))
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api",
+    tags=["Archive"],
+)
+
+
+@router.get(
+    path=Endpoints.Archive.REQUESTS,
+    status_code=status.HTTP_200_OK,
+    summary="Search archived requests",
+    description=(
+        "Streams a client's archived requests as newline-delimited JSON. Only archive files whose "
+        "client and `created_at` ranges overlap the query are read."
+    ),
+    responses={
+        200: {"description": "Archived requests streamed as NDJSON", "content": {NDJSON_MEDIA_TYPE: {}}},
+        400: {"description": "Invalid time range", "model": ErrorResponse},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+        500: {"description": "Internal server error", "model": ErrorResponse},
+    },
+)
+async def search_archived_requests(
+    client_id: UUID = Query(..., description="Client whose requests to search"),
+    start: Optional[datetime] = Query(None, description="Only requests created at or after this time (UTC)"),
+    end: Optional[datetime] = Query(None, description="Only requests created before this time (UTC)"),
+    receiver_id: Optional[UUID] = Query(None, description="Only requests sent to this receiver"),
+    request_status: Optional[NotificationStatus] = Query(None, alias="status", description="Only requests in this status"),
+    limit: int = Query(MAX_QUERY_ROWS, ge=1, le=MAX_QUERY_ROWS, description="Maximum number of requests to return"),
+    admin_user: str = Depends(get_superuser),
+) -> StreamingResponse:
+    """
+    Search the request archive. The manifest is consulted up front so that errors
+    surface as a status code; matching rows are then decompressed and streamed.
+    """
+    if start and end and start >= end:
+        raise AppException(
+            error_code=ErrorCodes.Archive.INVALID_TIME_RANGE,
+            error_message=ErrorMessages.Archive.INVALID_TIME_RANGE,
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        files = await run_in_threadpool(select_files, client_id, start, end)
+    except Exception as e:
+        logger.error("Failed to read the archive manifest: %s", e)
+        raise AppException(
+            error_code=ErrorCodes.Archive.QUERY_FAILED,
+            error_message=ErrorMessages.Archive.QUERY_FAILED,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error=str(e),
+        )
+    logger.debug("Archive query for client %s reads %d files", client_id, len(files))
+    # A plain iterator: Starlette pulls it from a worker thread, keeping decompression off the event loop.
+    return StreamingResponse(
+        scan_files(files, client_id, start, end, receiver_id, request_status, limit),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
@@ -1,11 +1,13 @@
 import logging
 from uuid import UUID
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query
 
 from constants.endpoints import Endpoints
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
+from db.session import async_session
 from dependencies.authentication import get_superuser
 from dependencies.dao import get_channel_dao
 from exception.app_exception import AppException
@@ -13,7 +15,9 @@ from mappers.channel import ChannelMapper
 from models.channel import Channel
 from repository.channel import ChannelDAO
 from schema.base import ErrorResponse, Response
-from schema.channel import ChannelCreate, ChannelDetails, ChannelDetailsResponse
+from schema.channel import ChannelCreate, ChannelDetails, ChannelDetailsListResponse, ChannelDetailsResponse
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, STREAM_BATCH_SIZE, decode_cursor, split_page
+from utils.streaming import ndjson_response
   
 
 logger = logging.getLogger(__name__)
@@ -136,4 +140,51 @@ async def get_channel_by_name(
         data=ChannelMapper.model_to_channel_response(channel=channel),
         message="Channel details retrieved successfully",
         status_code=status.HTTP_200_OK,
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    path=Endpoints.Channel.GET_ALL,
+    response_model=ChannelDetailsListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get all channels",
+    description=(
+        "Retrieves channels one keyset page at a time. Pass the returned `next_cursor` as `cursor` "
+        "to fetch the next page, or set `stream=true` to receive every channel as newline-delimited JSON."
+    ),
+    responses={
+        200: {"description": "Channels retrieved successfully", "model": ChannelDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
+        500: {"description": "Internal server error", "model": ErrorResponse},
+    },
+)
+async def get_all_channels(
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of channels per page"),
+    stream: bool = Query(False, description="Stream all channels as NDJSON instead of returning a page"),
+    admin_user: str = Depends(get_superuser),
+    channel_dao: ChannelDAO = Depends(get_channel_dao),
+):
+    """
+    Retrieve all channels.
+    """
+    if stream:
+        async def rows():
+            # The streaming body outlives the request-scoped session, so it owns its own.
+            async with async_session() as session:
+                async for channel in ChannelDAO(session).stream_all_channels(batch_size=STREAM_BATCH_SIZE):
+                    yield channel
+
+        return ndjson_response(rows(), ChannelMapper.model_to_channel_response)
+
+    channels: List[Channel] = await channel_dao.get_all_channels(
+        after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    channels, next_cursor = split_page(channels, limit)
+
+    return ChannelDetailsListResponse(
+        data=[ChannelMapper.model_to_channel_response(channel=c) for c in channels],
+        next_cursor=next_cursor,
+        message="Channels retrieved successfully",
+        status_code=status.HTTP_200_OK,
+    )
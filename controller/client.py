@@ -1,20 +1,25 @@
 import logging
 from uuid import UUID
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query
 
 from constants.endpoints import Endpoints
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
+from db.session import async_session
 from dependencies.authentication import get_superuser
 from dependencies.dao import get_client_dao
+from enums.delivery_mode import DeliveryMode
 from exception.app_exception import AppException
 from mappers.client import ClientMapper
 from models.client import Client
 from repository.client import ClientDAO
 from schema.base import ErrorResponse, Response
-from schema.client import ClientCreate
+from schema.client import ClientCreate, ClientDetailsListResponse
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, STREAM_BATCH_SIZE, decode_cursor, split_page
 from utils.security import generate_api_key
+from utils.streaming import ndjson_response
 
 
 logger = logging.getLogger(__name__)
@@ -52,6 +57,7 @@ async def create_client(
     client_model: Client = ClientMapper.client_create_to_model(
         client_name=client_create.client_name,
         hashed_api_key=hashed_key,
+        delivery_mode=client_create.delivery_mode,
     )
 
     # Persist the new client asynchronously
@@ -108,6 +114,51 @@ async def regenerate_api_key(
     )
 
 
+@router.put(
+    path=Endpoints.Client.DELIVERY_MODE,
+    response_model=Response,
+    status_code=status.HTTP_200_OK,
+    summary="Set client's delivery mode",
+    description=(
+        "Chooses how the client's users read their notification streams: `group` keeps every "
+        "delivered entry pending until it is acknowledged, `cursor` reads with plain XREAD from "
+        "the last delivered entry and keeps no per-message state in Redis. Applies to new connections."
+    ),
+    responses={
+        200: {"description": "Client delivery mode updated successfully", "model": Response},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+        404: {"description": "Client not found", "model": ErrorResponse},
+        500: {"description": "Internal server error", "model": ErrorResponse},
+    },
+)
+async def set_delivery_mode(
+    client_id: UUID,
+    delivery_mode: DeliveryMode = Query(..., description="The delivery mode to use"),
+    admin_user: str = Depends(get_superuser),
+    client_dao: ClientDAO = Depends(get_client_dao),
+):
+    """
+    Switch a client between consumer-group and cursor delivery.
+    """
+    client = await client_dao.get_client_by_id(client_id)
+    if client is None:
+        raise AppException(
+            error_code=ErrorCodes.Client.NOT_FOUND,
+            error_message=ErrorMessages.Client.NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
+            error=f"Client with id {client_id} not found.",
+        )
+
+    client.delivery_mode = delivery_mode
+    updated_client = await client_dao.update_client(client)
+
+    return Response(
+        data=updated_client.delivery_mode,
+        message="Client delivery mode updated successfully",
+        status_code=status.HTTP_200_OK,
+    )
+
+
 @router.delete(
     path=Endpoints.Client.MARK_CLIENT_INACTIVE,
     response_model=Response,
@@ -148,4 +199,52 @@ async def soft_delete_client(
         data=updated_client.client_name,
         message="Client marked inactive successfully",
         status_code=status.HTTP_200_OK,
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    path=Endpoints.Client.GET_ALL,
+    response_model=ClientDetailsListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get all clients",
+    description=(
+        "Retrieves clients one keyset page at a time. Pass the returned `next_cursor` as `cursor` "
+        "to fetch the next page, or set `stream=true` to receive every client as newline-delimited JSON."
+    ),
+    responses={
+        200: {"description": "Clients retrieved successfully", "model": ClientDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+        500: {"description": "Internal server error", "model": ErrorResponse},
+    },
+)
+async def get_all_clients(
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of clients per page"),
+    stream: bool = Query(False, description="Stream all clients as NDJSON instead of returning a page"),
+    admin_user: str = Depends(get_superuser),
+    client_dao: ClientDAO = Depends(get_client_dao),
+):
+    """
+    Retrieve all clients.
+    """
+    if stream:
+        async def rows():
+            # The streaming body outlives the request-scoped session, so it owns its own.
+            async with async_session() as session:
+                async for client in ClientDAO(session).stream_all_clients(batch_size=STREAM_BATCH_SIZE):
+                    yield client
+
+        return ndjson_response(rows(), ClientMapper.model_to_client_details)
+
+    clients: List[Client] = await client_dao.get_all_clients(
+        after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    clients, next_cursor = split_page(clients, limit)
+
+    return ClientDetailsListResponse(
+        data=[ClientMapper.model_to_client_details(client=c) for c in clients],
+        next_cursor=next_cursor,
+        message="Clients retrieved successfully",
+        status_code=status.HTTP_200_OK,
+    )
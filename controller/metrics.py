@@ -0,0 +1,69 @@
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+
+from constants.endpoints import Endpoints
+from dependencies.authentication import get_superuser
+from schema.base import ErrorResponse, Response
+from utils.metrics import metrics
+from websocket_manager.lifecycle import LOOKBACK_SEC, RETENTION_SEC, latency_summary
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api",
+    tags=["Metrics"],
+)
+
+
+@router.get(
+    path=Endpoints.Metrics.GET_ALL,
+    response_model=Response,
+    status_code=status.HTTP_200_OK,
+    summary="Get service metrics",
+    description="Returns this node's counters and gauges along with every registered collector, such as delivery latency percentiles.",
+    responses={
+        200: {"description": "Metrics fetched successfully", "model": Response},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+    },
+)
+async def get_metrics(admin_user: str = Depends(get_superuser)) -> Response:
+    """
+    Snapshot of the metrics registry.
+    """
+    return Response(
+        data=await metrics.snapshot(),
+        message="Metrics fetched successfully",
+        status_code=status.HTTP_200_OK,
+    )
+
+
+@router.get(
+    path=Endpoints.Metrics.LATENCY,
+    response_model=Response,
+    status_code=status.HTTP_200_OK,
+    summary="Get notification latency percentiles",
+    description=(
+        "Returns p50/p95/p99 latencies in milliseconds per client and stage: `queue` (API call to stream), "
+        "`deliver` (stream to WebSocket frame) and `read` (stream to acknowledgement)."
+    ),
+    responses={
+        200: {"description": "Latency percentiles fetched successfully", "model": Response},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+    },
+)
+async def get_latency(
+    client_id: Optional[UUID] = Query(None, description="Only report this client"),
+    lookback_sec: int = Query(LOOKBACK_SEC, ge=1, le=RETENTION_SEC, description="How far back to aggregate"),
+    admin_user: str = Depends(get_superuser),
+) -> Response:
+    """
+    Latency percentiles merged from the per-window histograms.
+    """
+    return Response(
+        data=await latency_summary(str(client_id) if client_id else None, lookback_sec),
+        message="Latency percentiles fetched successfully",
+        status_code=status.HTTP_200_OK,
+    )
@@ -1,23 +1,64 @@
 import logging
-from fastapi import APIRouter, Depends
+import json
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
 from fastapi import status
 
 from constants.endpoints import Endpoints
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
-from dependencies.authentication import get_client
-from dependencies.dao import get_channel_dao, get_receiver_dao, get_request_dao
+from db.json import RawJSON
+from dependencies.authentication import get_client, get_superuser
+from dependencies.dao import get_channel_dao, get_payload_dao, get_receiver_dao, get_request_dao
+from enums.delivery_mode import DeliveryMode
 from exception.app_exception import AppException
 from models.client import Client
 from repository.channel import ChannelDAO
+from repository.payload import PayloadDAO
 from repository.receiver import ReceiverDAO
 from repository.request import RequestDAO
-from schema.notification import AcknowledgeRequest, AcknowledgeResponse, NotificationRequestData, NotificationResponse, NotificationData
-from websocket_manager.streams import acknowledge_notifications, publish_message
+from config.client import ConfigClient
+from schema.notification import (
+    AcknowledgeRequest,
+    AcknowledgeResponse,
+    BroadcastData,
+    BroadcastRequestData,
+    BroadcastResponse,
+    BulkAcknowledgeData,
+    BulkAcknowledgeRequest,
+    BulkAcknowledgeResponse,
+    InboxData,
+    InboxItem,
+    InboxResponse,
+    NotificationData,
+    NotificationRequestData,
+    NotificationResponse,
+    TopicNotificationData,
+    TopicNotificationRequestData,
+    TopicNotificationResponse,
+    UnreadCountResponse,
+)
+from schema.websocket import STREAM_ID_PATTERN
+from websocket_manager.backlog import get_inbox_page
+from websocket_manager.broadcast import publish_broadcast
+from websocket_manager.lifecycle import now_ms, record_published, record_read
+from websocket_manager.payloads import is_out_of_line, render_message, split_notification, store_payload
+from websocket_manager.streams import (
+    acknowledge_notifications,
+    acknowledge_notifications_bulk,
+    publish_message,
+    publish_reference,
+)
+from websocket_manager.topics import publish_topic
+from websocket_manager.unread import adjust_unread, adjust_unread_many, get_unread_counts
 
 from mappers.receiver import ReceiverMapper
 from schema.receiver import ReceiverCreate
 
+MAX_UNREAD_BATCH_SIZE: int = int(ConfigClient.get_property("MAX_BATCH_SIZE", section="UNREAD"))
+INBOX_PAGE_SIZE: int = int(ConfigClient.get_property("INBOX_PAGE_SIZE", section="BACKLOG"))
+INBOX_MAX_PAGE_SIZE: int = int(ConfigClient.get_property("INBOX_MAX_PAGE_SIZE", section="BACKLOG"))
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -36,7 +77,8 @@ async def send_notification(
     client: Client = Depends(get_client),
     channel_dao: ChannelDAO = Depends(get_channel_dao),
     receiver_dao: ReceiverDAO = Depends(get_receiver_dao),
-    request_dao: RequestDAO = Depends(get_request_dao)
+    request_dao: RequestDAO = Depends(get_request_dao),
+    payload_dao: PayloadDAO = Depends(get_payload_dao)
 ) -> NotificationResponse:
     """
     Endpoint to send a notification. Validates the API key and user headers 
@@ -52,19 +94,46 @@ async def send_notification(
         channel_dao: DAO for channel operations.
         receiver_dao: DAO for receiver operations.
         request_dao: DAO for request operations.
+        payload_dao: DAO for the shared payload store.
     
     Returns:
         NotificationResponse: A status message along with the user id and message id.
     """
+    called_at_ms = now_ms()
     logger.info(
         "Notification request from: %s for user %s: %s",
         client.client_name, notification.user_id, notification.message
     )
-    # Publish message and capture the message id returned from redis
-    message_id = await publish_message(
-        user_id=notification.user_id,
-        message=notification.model_dump_json(exclude_unset=True)
-    )
+    # The notification is serialized once; the stream entry and the request row
+    # reuse that text. Large bodies are stored once by hash, and the stream entry
+    # and the request row then only carry the hash and the user's variables.
+    body, variables = split_notification(notification)
+    payload_hash = await store_payload(body, payload_dao) if is_out_of_line(body) else None
+    message = None if payload_hash else RawJSON(render_message(body, variables))
+
+    # Publish message and capture the message id returned from redis.
+    # Cursor-mode clients read without consumer groups, so none is created for them.
+    consumer_group = client.delivery_mode == DeliveryMode.GROUP
+    if payload_hash:
+        message_id = await publish_reference(
+            notification.user_id,
+            payload_hash,
+            variables,
+            client_id=str(client.id),
+            consumer_group=consumer_group,
+            notification_type=notification.type.value,
+        )
+    else:
+        message_id = await publish_message(
+            user_id=notification.user_id,
+            message=message,
+            client_id=str(client.id),
+            consumer_group=consumer_group,
+            notification_type=notification.type.value,
+        )
+    if message_id:
+        await _adjust_unread_safely(client, notification.user_id, 1)
+        await record_published(str(client.id), notification.user_id, message_id, called_at_ms)
     
     # Fetch channel by name "push_notification"
     channel = await channel_dao.get_channel_by_name("push_notification")
@@ -96,8 +165,10 @@ async def send_notification(
         client_id=client.id,
         channel_id=channel.id,
         receiver_id=receiver_created.id,
-        payload=notification.model_dump(exclude_unset=True),
+        payload=variables if payload_hash else message,
         request_source="notification",
+        message_id=message_id,
+        payload_hash=payload_hash,
     )
     
     return NotificationResponse(
@@ -110,6 +181,86 @@ async def send_notification(
     )
 
 
+@router.post(
+    path=Endpoints.Notification.PUBLISH_TOPIC,
+    summary="Publish Notification To Topic",
+    description=(
+        "Sends a notification to every socket of the authenticated client subscribed to the topic, "
+        "such as `org:123`, or to a matching filter, such as `org:*`. The notification is written once "
+        "to a shared stream, however many sockets receive it."
+    ),
+    response_model=TopicNotificationResponse,
+)
+async def publish_topic_notification(
+    notification: TopicNotificationRequestData,
+    client: Client = Depends(get_client),
+) -> TopicNotificationResponse:
+    """
+    Endpoint to publish a notification to a topic. Topic notifications go to the
+    sockets subscribed at the time; they are not stored per user, so they have
+    no request record, unread count or acknowledgement.
+    """
+    logger.info("Topic notification from: %s for topic %s: %s", client.client_name, notification.topic, notification.message)
+    message = notification.model_dump_json(exclude_unset=True, exclude={"topic"})
+    message_id = await publish_topic(str(client.id), notification.topic, message, notification.type.value)
+    if not message_id:
+        raise AppException(
+            error_code=ErrorCodes.Notification.TOPIC_PUBLISH_FAILED,
+            error_message=ErrorMessages.Notification.TOPIC_PUBLISH_FAILED,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error=f"Could not publish to topic '{notification.topic}'"
+        )
+    return TopicNotificationResponse(
+        status_code=200,
+        message="Notification published successfully",
+        data=TopicNotificationData(topic=notification.topic, message_id=message_id)
+    )
+
+
+@router.post(
+    path=Endpoints.Notification.BROADCAST,
+    summary="Broadcast Notification",
+    description=(
+        "Sends a notification to every connected socket on every node (admin only), optionally only to "
+        "the sockets of one client, and of its users whose receiver `meta_data` contains `segment`. "
+        "The broadcast is written once to a shared stream and fanned out by each node."
+    ),
+    response_model=BroadcastResponse,
+)
+async def broadcast_notification(
+    notification: BroadcastRequestData,
+    admin_user: str = Depends(get_superuser),
+) -> BroadcastResponse:
+    """
+    Endpoint to broadcast a notification to connected sockets. Like topic
+    notifications, broadcasts only reach sockets connected at the time and are
+    not stored per user.
+    """
+    if notification.segment and not notification.client_id:
+        raise AppException(
+            error_code=ErrorCodes.Notification.SEGMENT_WITHOUT_CLIENT,
+            error_message=ErrorMessages.Notification.SEGMENT_WITHOUT_CLIENT,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error="segment requires client_id"
+        )
+    logger.info("Broadcast from %s for client %s, segment %s", admin_user, notification.client_id, notification.segment)
+    message = notification.model_dump_json(exclude_unset=True, exclude={"client_id", "segment"})
+    client_id = str(notification.client_id) if notification.client_id else None
+    message_id = await publish_broadcast(message, client_id, notification.segment, notification.type.value)
+    if not message_id:
+        raise AppException(
+            error_code=ErrorCodes.Notification.BROADCAST_FAILED,
+            error_message=ErrorMessages.Notification.BROADCAST_FAILED,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error="Could not add the broadcast to the stream"
+        )
+    return BroadcastResponse(
+        status_code=200,
+        message="Broadcast queued successfully",
+        data=BroadcastData(message_id=message_id)
+    )
+
+
 @router.post(
     path=Endpoints.Notification.ACKNOWLEDGE,
     summary="Acknowledge Notifications",
@@ -123,22 +274,170 @@ async def send_notification(
 async def acknowledge_notification(
     req: AcknowledgeRequest,
     client: Client = Depends(get_client),
+    request_dao: RequestDAO = Depends(get_request_dao),
 ) -> AcknowledgeResponse:
     """
     Endpoint to explicitly acknowledge notifications.
     Call this endpoint with the user ID and message IDs that should be acknowledged.
+    The matching request records move to READ.
+    """
+    entries = [(req.user_id, message_id) for message_id in req.message_ids]
+    if client.delivery_mode == DeliveryMode.CURSOR:
+        # Cursor-mode streams have no consumer group to acknowledge in; the requests
+        # newly moved to READ tell how many entries were still unread.
+        updated = await request_dao.mark_acknowledged_by_user(client.id, entries)
+        acknowledged = updated.get(req.user_id, 0)
+    else:
+        try:
+            acknowledged = await acknowledge_notifications(req.user_id, req.message_ids)
+        except Exception as e:
+            raise AppException(
+                error_code=ErrorCodes.Request.STATUS_UPDATE_FAILED,
+                error_message=ErrorMessages.Request.STATUS_UPDATE_FAILED,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error=str(e)
+            )
+        await request_dao.mark_acknowledged(client.id, entries)
+    # Only entries that were still pending count, so repeated acks are harmless.
+    if acknowledged:
+        await _adjust_unread_safely(client, req.user_id, -acknowledged)
+        await record_read(str(client.id), {req.user_id: req.message_ids})
+    return AcknowledgeResponse(
+        status_code=200,
+        message="Notifications acknowledged successfully",
+        data=True
+    )
+
+
+@router.post(
+    path=Endpoints.Notification.ACKNOWLEDGE_BULK,
+    summary="Acknowledge Notifications In Bulk",
+    description=(
+        "Acknowledge notifications for many users in one call. The stream acknowledgements are "
+        "pipelined into a single Redis round trip and the request records are updated in batches."
+    ),
+    response_model=BulkAcknowledgeResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def acknowledge_notifications_for_users(
+    req: BulkAcknowledgeRequest,
+    client: Client = Depends(get_client),
+    request_dao: RequestDAO = Depends(get_request_dao),
+) -> BulkAcknowledgeResponse:
     """
+    Endpoint to acknowledge notifications across users.
+    Entries for the same user are merged; acknowledging an entry twice is a no-op.
+    """
+    acks: Dict[str, List[str]] = {}
+    for item in req.acknowledgements:
+        acks.setdefault(item.user_id, []).extend(item.message_ids)
+    acks = {user_id: list(dict.fromkeys(message_ids)) for user_id, message_ids in acks.items()}
+
+    entries = [(user_id, message_id) for user_id, message_ids in acks.items() for message_id in message_ids]
+    if client.delivery_mode == DeliveryMode.CURSOR:
+        # No consumer groups: count what the request records say was newly read.
+        acknowledged = await request_dao.mark_acknowledged_by_user(client.id, entries)
+        updated = sum(acknowledged.values())
+    else:
+        acknowledged = await acknowledge_notifications_bulk(acks)
+        updated = None
     try:
-        await acknowledge_notifications(req.user_id, req.message_ids)
+        await adjust_unread_many(str(client.id), {user_id: -count for user_id, count in acknowledged.items()})
+    except Exception as e:
+        logger.error("Failed to adjust unread counters for %d users: %s", len(acknowledged), e)
+    await record_read(str(client.id), {user_id: acks[user_id] for user_id, count in acknowledged.items() if count})
+    if updated is None:
+        updated = await request_dao.mark_acknowledged(client.id, entries)
+    return BulkAcknowledgeResponse(
+        status_code=200,
+        message="Notifications acknowledged successfully",
+        data=BulkAcknowledgeData(acknowledged=acknowledged, updated_requests=updated)
+    )
+
+
+@router.get(
+    path=Endpoints.Notification.UNREAD,
+    summary="Get Unread Counts",
+    description=(
+        "Returns the number of unacknowledged notifications for one or more users of the "
+        "authenticated client. Pass `user_ids` once per user to look several up in one call."
+    ),
+    response_model=UnreadCountResponse,
+)
+async def get_unread_count(
+    user_ids: List[str] = Query(..., min_length=1, description="User IDs to look up"),
+    client: Client = Depends(get_client),
+) -> UnreadCountResponse:
+    """
+    Endpoint to fetch unread counters, read with a single MGET for all requested users.
+    """
+    if len(user_ids) > MAX_UNREAD_BATCH_SIZE:
+        raise AppException(
+            error_code=ErrorCodes.Notification.TOO_MANY_USERS,
+            error_message=ErrorMessages.Notification.TOO_MANY_USERS,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error=f"At most {MAX_UNREAD_BATCH_SIZE} user IDs per request"
+        )
+    try:
+        counts = await get_unread_counts(str(client.id), list(dict.fromkeys(user_ids)))
     except Exception as e:
         raise AppException(
-            error_code=ErrorCodes.Request.STATUS_UPDATE_FAILED,
-            error_message=ErrorMessages.Request.STATUS_UPDATE_FAILED,
+            error_code=ErrorCodes.Notification.UNREAD_COUNT_FAILED,
+            error_message=ErrorMessages.Notification.UNREAD_COUNT_FAILED,
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             error=str(e)
         )
-    return AcknowledgeResponse(
+    return UnreadCountResponse(
         status_code=200,
-        message="Notifications acknowledged successfully",
-        data=True
-    )
\ No newline at end of file
+        message="Unread counts fetched successfully",
+        data=counts
+    )
+
+
+@router.get(
+    path=Endpoints.Notification.INBOX,
+    summary="Get Notification Inbox",
+    description=(
+        "Returns a user's notifications of the authenticated client, newest first. Page back by "
+        "passing the previous page's `next_cursor`, or a backlog summary's `inbox_cursor`, as `before`."
+    ),
+    response_model=InboxResponse,
+)
+async def get_inbox(
+    user_id: str,
+    before: Optional[str] = Query(None, pattern=STREAM_ID_PATTERN, description="Only notifications older than this message ID"),
+    limit: int = Query(INBOX_PAGE_SIZE, ge=1, le=INBOX_MAX_PAGE_SIZE, description="Page size"),
+    client: Client = Depends(get_client),
+) -> InboxResponse:
+    """
+    Endpoint to page through a user's notification stream, for notifications a
+    backlog summary left out.
+    """
+    try:
+        frames, next_cursor = await get_inbox_page(user_id, limit, before)
+    except Exception as e:
+        raise AppException(
+            error_code=ErrorCodes.Notification.INBOX_FAILED,
+            error_message=ErrorMessages.Notification.INBOX_FAILED,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error=str(e)
+        )
+    return InboxResponse(
+        status_code=200,
+        message="Inbox fetched successfully",
+        data=InboxData(
+            items=[InboxItem(**json.loads(frame)) for _msg_id, frame in frames],
+            next_cursor=next_cursor
+        )
+    )
+
+
+async def _adjust_unread_safely(client: Client, user_id: str, delta: int) -> None:
+    """
+    Update a user's unread counter without failing the request; a counter that
+    misses an update is corrected by the unread reconciler.
+    """
+    try:
+        await adjust_unread(str(client.id), user_id, delta)
+    except Exception as e:
+        logger.error("Failed to adjust unread counter for user %s by %d: %s", user_id, delta, e)
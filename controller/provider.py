@@ -1,13 +1,14 @@
 import logging
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query
 from sqlalchemy.exc import SQLAlchemyError
 
 from constants.endpoints import Endpoints
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
+from db.session import async_session
 from dependencies.authentication import get_superuser
 from dependencies.dao import get_provider_dao
 from exception.app_exception import AppException
@@ -20,6 +21,8 @@ from schema.provider import (
     ProviderDetailsListResponse,
     ProviderDetailsResponse
 )
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, STREAM_BATCH_SIZE, decode_cursor, split_page
+from utils.streaming import ndjson_response
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -122,20 +125,84 @@ async def get_provider_by_name(
     )
 
 
+@router.get(
+    path=Endpoints.Provider.GET_ALL,
+    response_model=ProviderDetailsListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get all providers",
+    description=(
+        "Retrieves providers one keyset page at a time. Pass the returned `next_cursor` as `cursor` "
+        "to fetch the next page, or set `stream=true` to receive every provider as newline-delimited JSON."
+    ),
+    responses={
+        200: {"description": "Providers retrieved successfully", "model": ProviderDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
+        500: {"description": "Internal server error", "model": ErrorResponse},
+    },
+)
+async def get_all_providers(
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of providers per page"),
+    stream: bool = Query(False, description="Stream all providers as NDJSON instead of returning a page"),
+    admin_user: str = Depends(get_superuser),
+    provider_dao: ProviderDAO = Depends(get_provider_dao),
+) -> ProviderDetailsListResponse:
+    """
+    Endpoint to retrieve all providers.
+
+    Args:
+        cursor (Optional[str]): Cursor of the page to fetch; the first page when omitted.
+        limit (int): Maximum number of providers per page.
+        stream (bool): Whether to stream every provider as NDJSON.
+        admin_user (str): The authenticated superuser.
+        provider_dao (ProviderDAO): Data access object for provider operations.
+
+    Returns:
+        ProviderDetailsListResponse: The response containing a page of provider details.
+    """
+    if stream:
+        async def rows():
+            # The streaming body outlives the request-scoped session, so it owns its own.
+            async with async_session() as session:
+                async for provider in ProviderDAO(session).stream_all_providers(batch_size=STREAM_BATCH_SIZE):
+                    yield provider
+
+        return ndjson_response(rows(), ProviderMapper.model_to_provider_response)
+
+    providers: List[Provider] = await provider_dao.get_all_providers(
+        after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    providers, next_cursor = split_page(providers, limit)
+    provider_list = [ProviderMapper.model_to_provider_response(provider=provider) for provider in providers]
+    return ProviderDetailsListResponse(
+        data=provider_list,
+        next_cursor=next_cursor,
+        message="Providers retrieved successfully",
+        status_code=status.HTTP_200_OK,
+    )
+
+
 @router.get(
     path=Endpoints.Provider.GET_BY_CHANNEL,
     response_model=ProviderDetailsListResponse,
     status_code=status.HTTP_200_OK,
     summary="Get all providers by channel ID",
-    description="Retrieves all providers associated with the given channel id.",
+    description=(
+        "Retrieves the providers associated with the given channel id, one keyset page at a time, "
+        "or every provider as newline-delimited JSON when `stream=true`."
+    ),
     responses={
         200: {"description": "Providers retrieved successfully", "model": ProviderDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
         404: {"description": "Providers not found", "model": ErrorResponse},
         500: {"description": "Internal server error", "model": ErrorResponse},
     },
 )
 async def get_providers_by_channel_id(
     channel_id: UUID,
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of providers per page"),
+    stream: bool = Query(False, description="Stream all providers as NDJSON instead of returning a page"),
     admin_user: str = Depends(get_superuser),
     provider_dao: ProviderDAO = Depends(get_provider_dao),
 ) -> ProviderDetailsListResponse:
@@ -144,23 +211,40 @@ async def get_providers_by_channel_id(
 
     Args:
         channel_id (UUID): The channel ID.
+        cursor (Optional[str]): Cursor of the page to fetch; the first page when omitted.
+        limit (int): Maximum number of providers per page.
+        stream (bool): Whether to stream every provider as NDJSON.
         admin_user (str): The authenticated superuser.
         provider_dao (ProviderDAO): Data access object for provider operations.
 
     Returns:
-        ProviderDetailsListResponse: The response containing a list of provider details.
+        ProviderDetailsListResponse: The response containing a page of provider details.
     """
-    providers: List[Provider] = await provider_dao.get_providers_by_channel_id(channel_id=channel_id)
-    if not providers:
+    if stream:
+        async def rows():
+            async with async_session() as session:
+                async for provider in ProviderDAO(session).stream_providers_by_channel_id(
+                    channel_id=channel_id, batch_size=STREAM_BATCH_SIZE
+                ):
+                    yield provider
+
+        return ndjson_response(rows(), ProviderMapper.model_to_provider_response)
+
+    providers: List[Provider] = await provider_dao.get_providers_by_channel_id(
+        channel_id=channel_id, after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    if not providers and cursor is None:
         raise AppException(
             error_code=ErrorCodes.Provider.NOT_FOUND,
             error_message=ErrorMessages.Provider.NOT_FOUND,
             status_code=status.HTTP_404_NOT_FOUND,
             error=f"No providers found for channel id '{channel_id}'.",
         )
+    providers, next_cursor = split_page(providers, limit)
     provider_list = [ProviderMapper.model_to_provider_response(provider=provider) for provider in providers]
     return ProviderDetailsListResponse(
         data=provider_list,
+        next_cursor=next_cursor,
         message="Providers retrieved successfully",
         status_code=status.HTTP_200_OK,
     )
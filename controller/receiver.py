@@ -1,12 +1,13 @@
 import logging
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query
 
 from constants.endpoints import Endpoints
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
+from db.session import async_session
 from dependencies.authentication import get_superuser
 from dependencies.dao import get_receiver_dao
 from exception.app_exception import AppException
@@ -18,6 +19,8 @@ from schema.receiver import (
     ReceiverDetailsListResponse,
     ReceiverDetails
 )
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, STREAM_BATCH_SIZE, decode_cursor, split_page
+from utils.streaming import ndjson_response
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -31,43 +34,69 @@ router: APIRouter = APIRouter(
     response_model=ReceiverDetailsListResponse,
     status_code=status.HTTP_200_OK,
     summary="Get all receivers by client ID",
-    description="Retrieves all receivers associated with the provided client ID.",
+    description=(
+        "Retrieves the receivers associated with the provided client ID, one keyset page at a time. "
+        "Pass the returned `next_cursor` as `cursor` to fetch the next page, or set `stream=true` "
+        "to receive every receiver as newline-delimited JSON."
+    ),
     responses={
         200: {"description": "Receivers retrieved successfully", "model": ReceiverDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
         404: {"description": "Receivers not found", "model": ErrorResponse},
         500: {"description": "Internal server error", "model": ErrorResponse},
     },
 )
 async def get_receivers_by_client_id(
     client_id: UUID,
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of receivers per page"),
+    stream: bool = Query(False, description="Stream all receivers as NDJSON instead of returning a page"),
     admin_user: str = Depends(get_superuser),
     receiver_dao: ReceiverDAO = Depends(get_receiver_dao),
 ) -> ReceiverDetailsListResponse:
     """
-    Endpoint to retrieve all receivers for a given client ID.
+    Endpoint to retrieve the receivers for a given client ID.
 
     Args:
         client_id (UUID): The unique identifier of the client.
+        cursor (Optional[str]): Cursor of the page to fetch; the first page when omitted.
+        limit (int): Maximum number of receivers per page.
+        stream (bool): Whether to stream every receiver as NDJSON.
         admin_user (str): The authenticated superuser.
         receiver_dao (ReceiverDAO): Data access object for receiver operations.
 
     Returns:
-        ReceiverDetailsListResponse: A response containing a list of receiver details.
+        ReceiverDetailsListResponse: A response containing a page of receiver details.
     """
-    receivers: List[Receiver] = await receiver_dao.get_receivers_by_client_id(client_id=client_id)
-    if not receivers:
+    if stream:
+        async def rows():
+            # The streaming body outlives the request-scoped session, so it owns its own.
+            async with async_session() as session:
+                async for receiver in ReceiverDAO(session).stream_receivers_by_client_id(
+                    client_id=client_id, batch_size=STREAM_BATCH_SIZE
+                ):
+                    yield receiver
+
+        return ndjson_response(rows(), ReceiverMapper.model_to_receiver_response)
+
+    receivers: List[Receiver] = await receiver_dao.get_receivers_by_client_id(
+        client_id=client_id, after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    if not receivers and cursor is None:
         raise AppException(
             error_code=ErrorCodes.Receiver.NOT_FOUND,
             error_message=ErrorMessages.Receiver.NOT_FOUND_FOR_CLIENT_ID,
             status_code=status.HTTP_404_NOT_FOUND,
             error=f"No receivers found for client id '{client_id}'.",
         )
-    
+    receivers, next_cursor = split_page(receivers, limit)
+
     # Transform each Receiver model to its Response DTO
     receiver_list: List[ReceiverDetails] = [ReceiverMapper.model_to_receiver_response(receiver=r) for r in receivers]
     
     return ReceiverDetailsListResponse(
         data=receiver_list,
+        next_cursor=next_cursor,
         message="Receivers retrieved successfully",
         status_code=status.HTTP_200_OK,
-    )
\ No newline at end of file
+    )
@@ -1,12 +1,13 @@
 import logging
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query
 
 from constants.endpoints import Endpoints
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
+from db.session import async_session
 from dependencies.authentication import get_superuser
 from dependencies.dao import get_template_dao
 from exception.app_exception import AppException
@@ -20,6 +21,8 @@ from schema.template import (
     TemplateDetailsListResponse,
     TemplateUpdate
 )
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, STREAM_BATCH_SIZE, decode_cursor, split_page
+from utils.streaming import ndjson_response
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -113,23 +116,43 @@ async def update_template(
     response_model=TemplateDetailsListResponse,
     status_code=status.HTTP_200_OK,
     summary="Get all templates",
-    description="Retrieves all templates.",
+    description=(
+        "Retrieves templates one keyset page at a time. Pass the returned `next_cursor` as `cursor` "
+        "to fetch the next page, or set `stream=true` to receive every template as newline-delimited JSON."
+    ),
     responses={
         200: {"description": "Templates retrieved successfully", "model": TemplateDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
         500: {"description": "Internal server error", "model": ErrorResponse},
     },
 )
 async def get_all_templates(
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of templates per page"),
+    stream: bool = Query(False, description="Stream all templates as NDJSON instead of returning a page"),
     admin_user: str = Depends(get_superuser),
     template_dao: TemplateDAO = Depends(get_template_dao),
 ) -> TemplateDetailsListResponse:
     """
     Retrieve all templates.
     """
-    templates: List[Template] = await template_dao.get_all_templates()
+    if stream:
+        async def rows():
+            # The streaming body outlives the request-scoped session, so it owns its own.
+            async with async_session() as session:
+                async for template in TemplateDAO(session).stream_all_templates(batch_size=STREAM_BATCH_SIZE):
+                    yield template
+
+        return ndjson_response(rows(), TemplateMapper.model_to_template_response)
+
+    templates: List[Template] = await template_dao.get_all_templates(
+        after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    templates, next_cursor = split_page(templates, limit)
     template_list = [TemplateMapper.model_to_template_response(template=t) for t in templates]
     return TemplateDetailsListResponse(
         data=template_list,
+        next_cursor=next_cursor,
         message="Templates retrieved successfully",
         status_code=status.HTTP_200_OK,
     )
@@ -140,32 +163,53 @@ async def get_all_templates(
     response_model=TemplateDetailsListResponse,
     status_code=status.HTTP_200_OK,
     summary="Get templates for a channel",
-    description="Retrieves all templates associated with the given channel ID.",
+    description=(
+        "Retrieves the templates associated with the given channel ID, one keyset page at a time, "
+        "or every template as newline-delimited JSON when `stream=true`."
+    ),
     responses={
         200: {"description": "Templates retrieved successfully", "model": TemplateDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
         404: {"description": "Templates not found for the channel", "model": ErrorResponse},
         500: {"description": "Internal server error", "model": ErrorResponse},
     },
 )
 async def get_templates_by_channel(
     channel_id: UUID,
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of templates per page"),
+    stream: bool = Query(False, description="Stream all templates as NDJSON instead of returning a page"),
     admin_user: str = Depends(get_superuser),
     template_dao: TemplateDAO = Depends(get_template_dao),
 ) -> TemplateDetailsListResponse:
     """
     Retrieve templates for a specific channel.
     """
-    templates: List[Template] = await template_dao.get_templates_by_channel_id(channel_id=channel_id)
-    if not templates:
+    if stream:
+        async def rows():
+            async with async_session() as session:
+                async for template in TemplateDAO(session).stream_templates_by_channel_id(
+                    channel_id=channel_id, batch_size=STREAM_BATCH_SIZE
+                ):
+                    yield template
+
+        return ndjson_response(rows(), TemplateMapper.model_to_template_response)
+
+    templates: List[Template] = await template_dao.get_templates_by_channel_id(
+        channel_id=channel_id, after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    if not templates and cursor is None:
         raise AppException(
             error_code=ErrorCodes.Template.NOT_FOUND,
             error_message=ErrorMessages.Template.NOT_FOUND,
             status_code=status.HTTP_404_NOT_FOUND,
             error=f"No templates found for channel id '{channel_id}'.",
         )
+    templates, next_cursor = split_page(templates, limit)
     template_list = [TemplateMapper.model_to_template_response(template=t) for t in templates]
     return TemplateDetailsListResponse(
         data=template_list,
+        next_cursor=next_cursor,
         message="Templates retrieved successfully",
         status_code=status.HTTP_200_OK,
     )
@@ -176,32 +220,53 @@ async def get_templates_by_channel(
     response_model=TemplateDetailsListResponse,
     status_code=status.HTTP_200_OK,
     summary="Get templates for a provider",
-    description="Retrieves all templates associated with the given provider ID.",
+    description=(
+        "Retrieves the templates associated with the given provider ID, one keyset page at a time, "
+        "or every template as newline-delimited JSON when `stream=true`."
+    ),
     responses={
         200: {"description": "Templates retrieved successfully", "model": TemplateDetailsListResponse},
+        400: {"description": "Invalid cursor", "model": ErrorResponse},
         404: {"description": "Templates not found for the provider", "model": ErrorResponse},
         500: {"description": "Internal server error", "model": ErrorResponse},
     },
 )
 async def get_templates_by_provider(
     provider_id: UUID,
+    cursor: Optional[str] = Query(None, description="Cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of templates per page"),
+    stream: bool = Query(False, description="Stream all templates as NDJSON instead of returning a page"),
     admin_user: str = Depends(get_superuser),
     template_dao: TemplateDAO = Depends(get_template_dao),
 ) -> TemplateDetailsListResponse:
     """
     Retrieve templates for a specific provider.
     """
-    templates: List[Template] = await template_dao.get_templates_by_provider_id(provider_id=provider_id)
-    if not templates:
+    if stream:
+        async def rows():
+            async with async_session() as session:
+                async for template in TemplateDAO(session).stream_templates_by_provider_id(
+                    provider_id=provider_id, batch_size=STREAM_BATCH_SIZE
+                ):
+                    yield template
+
+        return ndjson_response(rows(), TemplateMapper.model_to_template_response)
+
+    templates: List[Template] = await template_dao.get_templates_by_provider_id(
+        provider_id=provider_id, after_id=decode_cursor(cursor), limit=limit + 1
+    )
+    if not templates and cursor is None:
         raise AppException(
             error_code=ErrorCodes.Template.NOT_FOUND,
             error_message=ErrorMessages.Template.NOT_FOUND,
             status_code=status.HTTP_404_NOT_FOUND,
             error=f"No templates found for provider id '{provider_id}'.",
         )
+    templates, next_cursor = split_page(templates, limit)
     template_list = [TemplateMapper.model_to_template_response(template=t) for t in templates]
     return TemplateDetailsListResponse(
         data=template_list,
+        next_cursor=next_cursor,
         message="Templates retrieved successfully",
         status_code=status.HTTP_200_OK,
     )
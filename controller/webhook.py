@@ -0,0 +1,124 @@
+import json
+import logging
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request, status
+
+from config.client import ConfigClient
+from constants.endpoints import Endpoints
+from constants.error_codes import ErrorCodes
+from constants.error_messages import ErrorMessages
+from dependencies.dao import get_provider_dao
+from exception.app_exception import AppException
+from repository.provider import ProviderDAO
+from schema.base import ErrorResponse, Response
+from webhooks import get_parser
+from webhooks.providers import get_webhook_provider
+from webhooks.queue import enqueue_status_updates
+
+MAX_BODY_BYTES: int = int(ConfigClient.get_property("MAX_BODY_BYTES", section="WEBHOOKS"))
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api",
+    tags=["Webhook"],
+)
+
+
+def _payload_too_large() -> AppException:
+    return AppException(
+        error_code=ErrorCodes.Webhook.PAYLOAD_TOO_LARGE,
+        error_message=ErrorMessages.Webhook.PAYLOAD_TOO_LARGE,
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        error=f"At most {MAX_BODY_BYTES} bytes",
+    )
+
+
+async def _read_body(request: Request) -> bytes:
+    """
+    Read the request body, rejecting it as soon as it is known to exceed
+    `MAX_BODY_BYTES`: from its Content-Length, or while it is streamed in.
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        raise _payload_too_large()
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > MAX_BODY_BYTES:
+            raise _payload_too_large()
+    return bytes(body)
+
+
+@router.post(
+    path=Endpoints.Webhook.INGEST,
+    response_model=Response,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Ingest provider status callbacks",
+    description=(
+        "Receives delivery status callbacks from a provider. The callback is verified and parsed "
+        "inline, queued, and applied to the matching requests asynchronously in batches."
+    ),
+    responses={
+        202: {"description": "Callback queued", "model": Response},
+        400: {"description": "Malformed payload", "model": ErrorResponse},
+        401: {"description": "Invalid signature", "model": ErrorResponse},
+        404: {"description": "Provider not found", "model": ErrorResponse},
+        413: {"description": "Payload too large", "model": ErrorResponse},
+    },
+)
+async def ingest_webhook(
+    provider_id: UUID,
+    request: Request,
+    provider_dao: ProviderDAO = Depends(get_provider_dao),
+) -> Response:
+    """
+    Verify, parse and enqueue a provider callback. No database write happens here;
+    the webhook ingestion worker coalesces queued updates into batched status updates.
+    """
+    provider = await get_webhook_provider(provider_id, provider_dao)
+    if provider is None:
+        raise AppException(
+            error_code=ErrorCodes.Webhook.PROVIDER_NOT_FOUND,
+            error_message=ErrorMessages.Webhook.PROVIDER_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
+            error={"provider_id": str(provider_id)},
+        )
+
+    body = await _read_body(request)
+    parser = get_parser(provider.name)
+    if not parser.verify(provider.config or {}, request.headers, body, str(request.url)):
+        logger.warning("Rejected webhook with invalid signature for provider %s", provider_id)
+        raise AppException(
+            error_code=ErrorCodes.Webhook.INVALID_SIGNATURE,
+            error_message=ErrorMessages.Webhook.INVALID_SIGNATURE,
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    try:
+        updates = parser.parse(request.headers, body, request.query_params)
+    except (ValueError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise AppException(
+            error_code=ErrorCodes.Webhook.INVALID_PAYLOAD,
+            error_message=ErrorMessages.Webhook.INVALID_PAYLOAD,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error=str(e),
+        )
+
+    try:
+        await enqueue_status_updates(provider.id, updates)
+    except Exception as e:
+        logger.error("Failed to enqueue %d webhook updates for provider %s: %s", len(updates), provider_id, e)
+        raise AppException(
+            error_code=ErrorCodes.Webhook.ENQUEUE_FAILED,
+            error_message=ErrorMessages.Webhook.ENQUEUE_FAILED,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error=str(e),
+        )
+
+    return Response(
+        data={"queued": len(updates)},
+        message="Webhook accepted",
+        status_code=status.HTTP_202_ACCEPTED,
+    )
@@ -1,20 +1,34 @@
 import asyncio
 import logging
+import re
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Depends
 
 from constants.endpoints import Endpoints
+from enums.delivery_mode import DeliveryMode
+from schema.websocket import STREAM_ID_PATTERN
+from websocket_manager.backlog import summarize_backlog
+from websocket_manager import admission, heartbeat, topics
 from websocket_manager.connection_manager import manager
+from websocket_manager.inbound import handle_inbound_message
+from websocket_manager.shards import ASSIGNED_SHARDS, shard_for
 from websocket_manager.streams import (
-    publish_message,
+    SHARDED,
     create_consumer_group,
-    get_pending_notifications,
+    get_server_cursor,
     listen_for_notifications,
+    listen_from_cursor,
+    replay_notifications,
 )
+from websocket_manager.unread import get_unread_counts
 from dependencies.dao import get_client_dao
 from repository.client import ClientDAO
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+STREAM_ID_RE = re.compile(STREAM_ID_PATTERN)
+
 router: APIRouter = APIRouter(
     prefix="/api",
     tags=["api"],
@@ -29,20 +43,59 @@ async def websocket_endpoint(
     websocket: WebSocket,
     client_name: str,
     user_id: str,
+    last_message_id: Optional[str] = None,
+    device_id: Optional[str] = None,
     client_dao: ClientDAO = Depends(get_client_dao)
 ):
     """
     Handles the WebSocket connection for notifications.
     
     Workflow:
+      0. Admission control (see `websocket_manager.admission`): connections over
+         the handshake, per-client or rate limits, or arriving while the event
+         loop lags, are closed with 1013 and a jittered `retry_after` hint.
       1. Validates that the client exists.
       2. Connects the client's WebSocket.
       3. Creates a consumer group for the user's notification stream.
-      4. Fetches and sends any pending notifications.
-      5. Starts a background task to listen and deliver real-time notifications.
-      6. Processes incoming client messages (echo implementation).
-      7. On disconnect, logs and does necessary cleanup.
+      4. Sends the current unread count, then replays, in chunks, every notification
+         missed since `last_message_id` (all unacknowledged ones when it is omitted).
+         Past BACKLOG.SUMMARY_THRESHOLD missed notifications, a single summary frame
+         is sent instead; the rest can be paged through the inbox endpoint.
+      5. Starts the user's listener on this node, unless another of their sockets
+         already did; it reads each entry once and sends it to all their sockets.
+         Clients in cursor delivery mode skip step 3 and the replay: delivery resumes after
+         `last_message_id`, else after the server-side cursor, else from the start,
+         with a reader per socket since each may be at a different position.
+         In the sharded stream layout there is no per-user group or listener: the
+         backlog comes from the user's index and new entries from the shard consumer.
+      6. Processes incoming client messages: acks, `fetch_more`, pings and topic
+         (un)subscriptions. With DEVICES.TRACK_ACKS, acks are also recorded per
+         `device_id`. Topic entries reach the socket through the topic consumer.
+      7. Pings the socket when it goes quiet and reaps it when it stays silent
+         (see `websocket_manager.heartbeat`).
+      8. On disconnect, logs and does necessary cleanup.
     """
+    # Admission control runs first, before any database or Redis work.
+    ticket, rejection = admission.admit(client_name.lower())
+    if ticket is None:
+        logger.warning("Rejected connection of client '%s' for user %s: %s", client_name, user_id, rejection)
+        await admission.reject(websocket, rejection)
+        return
+    try:
+        await _serve(websocket, ticket, client_name, user_id, last_message_id, device_id, client_dao)
+    finally:
+        ticket.release()
+
+
+async def _serve(
+    websocket: WebSocket,
+    ticket: admission.Ticket,
+    client_name: str,
+    user_id: str,
+    last_message_id: Optional[str],
+    device_id: Optional[str],
+    client_dao: ClientDAO,
+) -> None:
     # Validate client existence.
     client = await client_dao.get_client_by_name(client_name.lower())
     if not client:
@@ -52,45 +105,121 @@ async def websocket_endpoint(
 
     logger.info("Client: %s", client)
 
+    if last_message_id is not None and not STREAM_ID_RE.match(last_message_id):
+        logger.error("Invalid last_message_id '%s' for user %s.", last_message_id, user_id)
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    cursor_mode = client.delivery_mode == DeliveryMode.CURSOR
+    if SHARDED and shard_for(user_id) not in ASSIGNED_SHARDS:
+        # Only nodes serving the user's shard see its new entries; the load balancer
+        # should route users by shard.
+        logger.error("User %s belongs to shard %d, which this node does not serve.", user_id, shard_for(user_id))
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
     # Connect the WebSocket using our connection manager.
-    await manager.connect(websocket, user_id)
+    await manager.connect(websocket, user_id, str(client.id))
 
     logger.info("WebSocket connected for user %s", user_id)
 
-    # Create the consumer group (if it doesn't exist) for the user's stream.
+    # Everything after connecting runs under the cleanup below, so a socket that
+    # fails during setup or replay still leaves the connection registry.
     try:
-        await create_consumer_group(user_id)
-        logger.info("Consumer group created for user %s", user_id)
+        try:
+            if not await _start_delivery(websocket, str(client.id), user_id, cursor_mode, last_message_id):
+                return
+        except Exception as e:
+            logger.error("Error starting delivery for user %s: %s", user_id, e)
+            try:
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            except Exception:
+                pass
+            return
+
+        # The connection is set up; let the next handshake in.
+        ticket.finish_handshake()
+
+        # The receive loop runs as a task of the socket, so the heartbeat sweeper can
+        # cancel it when the connection goes silent without a close frame.
+        receiver = asyncio.create_task(_receive_messages(websocket, str(client.id), user_id, cursor_mode, device_id))
+        manager.track_task(websocket, receiver)
+        heartbeat.register(websocket, user_id)
+        await asyncio.wait({receiver})
+        if receiver.cancelled():
+            logger.info("WebSocket of user %s reaped by the heartbeat sweeper", user_id)
+    finally:
+        heartbeat.unregister(websocket)
+        topics.unsubscribe_all(websocket)
+        cancelled = await manager.disconnect(websocket, user_id)
+        await asyncio.gather(*cancelled, return_exceptions=True)
+
+
+async def _start_delivery(
+    websocket: WebSocket, client_id: str, user_id: str, cursor_mode: bool, last_message_id: Optional[str]
+) -> bool:
+    """
+    Send a newly connected socket its unread count and backlog, and start the
+    reader that delivers new entries to it.
+
+    Returns:
+        bool: False if the socket was closed because delivery cannot start.
+    """
+    # Make sure the user's stream has its consumer group; a no-op once this node has seen it.
+    if not cursor_mode:
+        try:
+            await create_consumer_group(user_id)
+        except Exception as e:
+            logger.error("Failed to create consumer group for user %s: %s", user_id, e)
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            return False
+
+    # Send the badge count first; later changes arrive as unread events via the relay.
+    try:
+        counts = await get_unread_counts(client_id, [user_id])
+        await websocket.send_json({
+            "type": "unread", "client_id": client_id, "user_id": user_id, "count": counts[user_id]
+        })
     except Exception as e:
-        logger.error("Failed to create consumer group for user %s: %s", user_id, e)
-        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
-        return
+        logger.error("Error sending unread count for user %s: %s", user_id, e)
 
-    # Fetch and deliver any pending notifications.
+    # Heavily lagged users get one summary frame instead of their whole backlog.
+    resume_id = last_message_id or (await get_server_cursor(client_id, user_id) if cursor_mode else None)
+    summarized_id = None
     try:
-        pending = await get_pending_notifications(user_id)
-        if pending:
-            for msg_id, data in pending:
-                message = data.get("message")
-                if message:
-                    # Send a JSON payload with the message and its unique message_id.
-                    await websocket.send_json({"message_id": msg_id, "message": message})
-        # Do not automatically acknowledge notifications here.
+        summarized_id = await summarize_backlog(user_id, websocket, client_id, resume_id, cursor_mode)
     except Exception as e:
-        logger.error("Error processing pending notifications for user %s: %s", user_id, e)
+        logger.error("Error summarizing the backlog of user %s: %s", user_id, e)
+
+    if SHARDED:
+        # New entries reach this node's sockets through the shard consumer;
+        # only the user's unacknowledged backlog is replayed here.
+        if summarized_id is None:
+            await replay_notifications(user_id, websocket, client_id, resume_id)
+    elif cursor_mode:
+        # The backlog after the cursor is replayed by the listener before it blocks.
+        last_id = summarized_id or resume_id or "0"
+        manager.track_task(websocket, asyncio.create_task(listen_from_cursor(user_id, websocket, client_id, last_id)))
+    else:
+        # Replay everything missed since `last_message_id` (or all unacknowledged entries).
+        # Undelivered entries are left to the user's listener if one already runs here.
+        if summarized_id is None:
+            await replay_notifications(
+                user_id, websocket, client_id, resume_id, include_new=not manager.has_listener(user_id)
+            )
+        # One listener per user and node delivers real-time notifications to all their sockets.
+        await manager.ensure_listener(user_id, lambda: listen_for_notifications(user_id, client_id))
+    return True
 
-    # Start a background task for listening to real-time notifications.
-    listener_task = asyncio.create_task(listen_for_notifications(user_id, websocket))
 
+async def _receive_messages(
+    websocket: WebSocket, client_id: str, user_id: str, cursor_mode: bool, device_id: Optional[str]
+) -> None:
     try:
         while True:
             data = await websocket.receive_text()
-            # Echo back or handle client messages.
-            await publish_message(user_id, f"[Echo] {data}")
+            heartbeat.touch(websocket)
+            await handle_inbound_message(data, websocket, client_id, user_id, cursor_mode, device_id)
     except WebSocketDisconnect as e:
         logger.info("WebSocket disconnected: %s", e)
     except Exception as e:
         logger.error("Unexpected error on WebSocket connection: %s", e)
-    finally:
-        await manager.disconnect(websocket, user_id)
-        listener_task.cancel()
\ No newline at end of file
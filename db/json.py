@@ -0,0 +1,15 @@
+import json
+from typing import Any
+
+
+class RawJSON(str):
+    """
+    JSON text that is already serialized. Assigned to a JSON column it is written
+    as is, so a document encoded once for Redis is not encoded again for Postgres.
+    """
+
+
+def json_serializer(value: Any) -> str:
+    if isinstance(value, RawJSON):
+        return value
+    return json.dumps(value)
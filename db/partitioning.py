@@ -0,0 +1,202 @@
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from config.client import ConfigClient
+
+PARTITION_INTERVAL: str = ConfigClient.get_property("INTERVAL", section="PARTITIONING").lower()
+PREMAKE_PARTITIONS: int = int(ConfigClient.get_property("PREMAKE", section="PARTITIONING"))
+DEFAULT_RETENTION_DAYS: int = int(ConfigClient.get_property("DEFAULT_RETENTION_DAYS", section="PARTITIONING"))
+EXPIRE_ACTION: str = ConfigClient.get_property("EXPIRE_ACTION", section="PARTITIONING").lower()
+
+PARENT_TABLE = "requests"
+
+MONTHLY = "monthly"
+DAILY = "daily"
+
+# Matches the upper bound in pg_get_expr(relpartbound), e.g. "... TO ('2025-05-01 00:00:00')".
+_UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+logger = logging.getLogger(__name__)
+
+
+def interval_start(ts: datetime, interval: str = PARTITION_INTERVAL) -> datetime:
+    """
+    Return the start of the partition interval that contains `ts`.
+    """
+    if interval == DAILY:
+        return datetime(ts.year, ts.month, ts.day)
+    if interval == MONTHLY:
+        return datetime(ts.year, ts.month, 1)
+    raise ValueError(f"Unsupported partition interval '{interval}', expected '{MONTHLY}' or '{DAILY}'")
+
+
+def next_interval_start(start: datetime, interval: str = PARTITION_INTERVAL) -> datetime:
+    """
+    Return the start of the partition interval following the one starting at `start`.
+    """
+    if interval == DAILY:
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return datetime(start.year + 1, 1, 1)
+    return datetime(start.year, start.month + 1, 1)
+
+
+def partition_name(start: datetime, interval: str = PARTITION_INTERVAL) -> str:
+    """
+    Name of the partition covering the interval starting at `start`,
+    e.g. `requests_p202504` (monthly) or `requests_p20250424` (daily).
+    """
+    suffix = start.strftime("%Y%m%d") if interval == DAILY else start.strftime("%Y%m")
+    return f"{PARENT_TABLE}_p{suffix}"
+
+
+def create_partition_sql(start: datetime, interval: str = PARTITION_INTERVAL) -> str:
+    """
+    DDL creating the partition for the interval starting at `start` if it does not exist yet.
+    """
+    end = next_interval_start(start, interval)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start, interval)} "
+        f"PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat(sep=' ')}') TO ('{end.isoformat(sep=' ')}')"
+    )
+
+
+_PARTITIONS_SQL = text(
+    "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+    "FROM pg_inherits i "
+    "JOIN pg_class c ON c.oid = i.inhrelid "
+    "JOIN pg_class p ON p.oid = i.inhparent "
+    "WHERE p.relname = :parent"
+)
+
+
+def create_partitioned_index_concurrently(
+    conn: Connection,
+    name: str,
+    columns: str,
+    include: Optional[str] = None,
+    where: Optional[str] = None,
+) -> None:
+    """
+    Build an index on the partitioned requests table without blocking writes.
+
+    Postgres cannot run CREATE INDEX CONCURRENTLY on a partitioned table, so the
+    index is created invalid ON ONLY the parent, built CONCURRENTLY on every
+    partition and attached; the parent index turns valid once all partitions
+    are attached. Partitions created later inherit the index automatically.
+
+    Args:
+        conn (Connection): A synchronous connection in AUTOCOMMIT mode
+            (e.g. inside an Alembic `autocommit_block()`).
+        name (str): Name of the parent index; partition indexes are `<partition>_<name>`.
+        columns (str): Indexed column list, e.g. "receiver_id, id".
+        include (Optional[str]): Non-key columns stored in the index for index-only scans.
+        where (Optional[str]): Predicate for a partial index.
+    """
+    suffix = ""
+    if include:
+        suffix += f" INCLUDE ({include})"
+    if where:
+        suffix += f" WHERE {where}"
+
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {PARENT_TABLE} ({columns}){suffix}"))
+    for partition, _bound in conn.execute(_PARTITIONS_SQL, {"parent": PARENT_TABLE}).all():
+        partition_index = f"{partition}_{name}"[:63]
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} ({columns}){suffix}"))
+        attached = conn.execute(
+            text("SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE c.relname = :index"),
+            {"index": partition_index},
+        ).first()
+        if not attached:
+            conn.execute(text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+async def list_partitions(conn: AsyncConnection) -> List[Tuple[str, Optional[datetime]]]:
+    """
+    List the partitions attached to the requests table.
+
+    Returns:
+        List[Tuple[str, Optional[datetime]]]: (partition name, exclusive upper bound) pairs.
+    """
+    result = await conn.execute(_PARTITIONS_SQL, {"parent": PARENT_TABLE})
+    partitions: List[Tuple[str, Optional[datetime]]] = []
+    for name, bound in result.all():
+        match = _UPPER_BOUND_RE.search(bound or "")
+        partitions.append((name, datetime.fromisoformat(match.group(1)) if match else None))
+    return partitions
+
+
+async def get_retention_days(conn: AsyncConnection) -> int:
+    """
+    Longest retention, in days, required by any client.
+
+    Partitions hold rows from every client, so one can only be expired once it is
+    older than the retention of the client that keeps data the longest. Clients
+    without an explicit `retention_days` use the configured default.
+    """
+    result = await conn.execute(
+        text("SELECT MAX(COALESCE(retention_days, :default_days)) FROM clients"),
+        {"default_days": DEFAULT_RETENTION_DAYS},
+    )
+    return result.scalar() or DEFAULT_RETENTION_DAYS
+
+
+async def ensure_future_partitions(conn: AsyncConnection, now: datetime) -> List[str]:
+    """
+    Create the partition for the current interval and the next `PREMAKE_PARTITIONS` ones.
+
+    Returns:
+        List[str]: Names of the partitions that are now guaranteed to exist.
+    """
+    start = interval_start(now)
+    ensured: List[str] = []
+    for _ in range(PREMAKE_PARTITIONS + 1):
+        await conn.execute(text(create_partition_sql(start)))
+        ensured.append(partition_name(start))
+        start = next_interval_start(start)
+    return ensured
+
+
+async def expire_partitions(conn: AsyncConnection, now: datetime, retention_days: int) -> List[str]:
+    """
+    Detach, and drop when `EXPIRE_ACTION` is `drop`, every partition whose rows are all
+    older than the retention window.
+
+    Detaching runs CONCURRENTLY, so `conn` must be in AUTOCOMMIT mode.
+
+    Returns:
+        List[str]: Names of the expired partitions.
+    """
+    cutoff = now - timedelta(days=retention_days)
+    expired: List[str] = []
+    for name, upper_bound in await list_partitions(conn):
+        if upper_bound is None or upper_bound > cutoff:
+            continue
+        await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} CONCURRENTLY"))
+        if EXPIRE_ACTION == "drop":
+            await conn.execute(text(f"DROP TABLE {name}"))
+        logger.info("Expired partition %s (upper bound %s, action=%s)", name, upper_bound, EXPIRE_ACTION)
+        expired.append(name)
+    return expired
+
+
+async def maintain_partitions(conn: AsyncConnection, now: Optional[datetime] = None) -> None:
+    """
+    Run one maintenance pass: pre-create upcoming partitions and expire old ones.
+
+    There is deliberately no DEFAULT partition, since one would rule out detaching
+    CONCURRENTLY; pre-creating `PREMAKE_PARTITIONS` intervals ahead covers inserts instead.
+
+    Args:
+        conn (AsyncConnection): A connection in AUTOCOMMIT mode.
+        now (Optional[datetime]): Reference time in UTC; defaults to the current time.
+    """
+    now = now or datetime.utcnow()
+    await ensure_future_partitions(conn, now)
+    await expire_partitions(conn, now, await get_retention_days(conn))
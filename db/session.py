@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from db.json import json_serializer
 from db.setting import get_db_settings
 
 settings = get_db_settings()
@@ -11,6 +12,7 @@ engine = create_async_engine(
     max_overflow=settings.DB_MAX_OVERFLOW,
     echo=False,
     future=True,
+    json_serializer=json_serializer,
 )
 
 async_session = async_sessionmaker(
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db.session import get_db
 from repository.client import ClientDAO
 from repository.channel import ChannelDAO
+from repository.payload import PayloadDAO
 from repository.provider import ProviderDAO
 from repository.receiver import ReceiverDAO
 from repository.request import RequestDAO
@@ -36,4 +37,9 @@ async def get_request_dao(
 async def get_template_dao(
     db: AsyncSession = Depends(get_db)
 ) -> TemplateDAO:
-    return TemplateDAO(db)
\ No newline at end of file
+    return TemplateDAO(db)
+
+async def get_payload_dao(
+    db: AsyncSession = Depends(get_db)
+) -> PayloadDAO:
+    return PayloadDAO(db)
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class DeliveryMode(str, Enum):
+    GROUP = "group"  # consumer group per user stream; entries stay pending until acknowledged
+    CURSOR = "cursor"  # plain XREAD from the last delivered ID; no pending entries list
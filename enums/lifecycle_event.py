@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class LifecycleEvent(str, Enum):
+    # Single-letter values keep entries in the lifecycle event stream small.
+    PUBLISHED = "p"
+    DELIVERED = "d"
+    READ = "r"
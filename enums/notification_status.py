@@ -5,4 +5,18 @@ class NotificationStatus(str, Enum):
     PENDING = "PENDING"
     ACCEPTED = "ACCEPTED"
     REJECTED = "REJECTED"
-    
\ No newline at end of file
+    DELIVERED = "DELIVERED"  # sent over a WebSocket
+    READ = "READ"  # acknowledged by the user
+    
+
+# How far along its lifecycle each status is. Provider callbacks can arrive out of
+# order, so a status only ever replaces one with a lower rank; DELIVERED and
+# REJECTED are both outcomes of a send and never replace each other. (The pending
+# reclaimer does move DELIVERED to REJECTED, explicitly, when it gives up on an entry.)
+STATUS_RANK = {
+    NotificationStatus.PENDING: 0,
+    NotificationStatus.ACCEPTED: 1,
+    NotificationStatus.DELIVERED: 2,
+    NotificationStatus.REJECTED: 2,
+    NotificationStatus.READ: 3,
+}
@@ -1,3 +1,4 @@
+from enums.delivery_mode import DeliveryMode
 from models.client import Client
 from schema.client import ClientCreate, ClientDetails
 from utils.security import generate_api_key
@@ -8,6 +9,7 @@ class ClientMapper:
     def client_create_to_model(
         client_name: str,
         hashed_api_key: str,
+        delivery_mode: DeliveryMode = DeliveryMode.GROUP,
     ) -> Client:
         """
         Converts a ClientCreate object to a Client model.
@@ -17,7 +19,8 @@ class ClientMapper:
         return Client(
             client_name=client_name,
             api_key=hashed_api_key,
-            is_active=True
+            is_active=True,
+            delivery_mode=delivery_mode
         )
 
     @staticmethod
@@ -27,5 +30,6 @@ class ClientMapper:
         """
         return ClientDetails(
             id=client.id,
-            client_name=client.client_name
+            client_name=client.client_name,
+            delivery_mode=client.delivery_mode
         )
\ No newline at end of file
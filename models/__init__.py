@@ -1,5 +1,6 @@
 from models.channel import Channel
 from models.client import Client
+from models.payload import Payload
 from models.provider import Provider
 from models.receiver import Receiver
 from models.request import Request
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, Enum
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
 from db.base import BaseModel
+from enums.delivery_mode import DeliveryMode
 
 class Client(BaseModel):
     __tablename__ = "clients"
@@ -11,3 +12,7 @@ class Client(BaseModel):
     client_name = Column(String, unique=True, index=True)
     api_key = Column(String, unique=True, nullable=False)
     is_active = Column(Boolean, default=True)
+    retention_days = Column(Integer, nullable=True)  # days to keep requests; NULL uses the configured default
+    delivery_mode = Column(
+        Enum(DeliveryMode), default=DeliveryMode.GROUP, server_default=DeliveryMode.GROUP.name, nullable=False
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Index, String, Text
+
+from db.base import BaseModel
+
+
+class Payload(BaseModel):
+    """
+    Notification body stored once and referenced by hash from requests and stream entries.
+    """
+    __tablename__ = "payloads"
+    __table_args__ = (
+        Index("ix_payloads_created_at", "created_at"),
+    )
+
+    hash = Column(String(64), primary_key=True)  # hex SHA-256 of `body`
+    body = Column(Text, nullable=False)  # canonical JSON, without per-user variables
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey
+from sqlalchemy import Column, String, Boolean, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
@@ -13,3 +13,8 @@ class Provider(BaseModel):
     channel_id = Column(UUID(as_uuid=True), ForeignKey("channels.id", ondelete="CASCADE"), nullable=False)
     config = Column(JSONB, nullable=False)  # provider-specific config like API keys, usernames, etc.
     is_active = Column(Boolean, default=True)
+
+    __table_args__ = (
+        Index('ix_providers_channel_id_id', 'channel_id', 'id'),
+        Index('ix_providers_lower_name', func.lower(name)),
+    )
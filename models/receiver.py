@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
@@ -22,4 +22,5 @@ class Receiver(BaseModel):
 
     __table_args__ = (
         UniqueConstraint('client_id', 'user_id', name='uq_receiver_clients_user'),
+        Index('ix_receivers_client_id_id', 'client_id', 'id'),
     )
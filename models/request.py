@@ -1,15 +1,31 @@
-from sqlalchemy import Column, String, ForeignKey, JSON, Enum
+from sqlalchemy import Column, DateTime, String, ForeignKey, Index, JSON, Enum, text
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
 
 from db.base import BaseModel
 from enums.notification_status import NotificationStatus
+from utils.helpers import generate_uuid7
 
 
 class Request(BaseModel):
     __tablename__ = "requests"
+    # Range-partitioned on created_at (see db/partitioning.py), so the partition
+    # key has to be part of the primary key.
+    __table_args__ = (
+        Index("ix_requests_receiver_id_id", "receiver_id", "id", postgresql_include=["status"]),
+        Index("ix_requests_client_id_created_at", "client_id", "created_at"),
+        Index("ix_requests_channel_id", "channel_id"),
+        Index("ix_requests_provider_id", "provider_id", postgresql_where=text("provider_id IS NOT NULL")),
+        Index("ix_requests_template_id", "template_id", postgresql_where=text("template_id IS NOT NULL")),
+        Index("ix_requests_pending_created_at", "created_at", postgresql_where=text("status = 'PENDING'")),
+        Index("ix_requests_message_id", "message_id", postgresql_where=text("message_id IS NOT NULL")),
+        Index("ix_requests_payload_hash", "payload_hash", postgresql_where=text("payload_hash IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Time-ordered ids: created_at is derived from the id, which lets lookups by id
+    # prune down to a single partition.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid7)
+    created_at = Column(DateTime, primary_key=True, nullable=False)
     
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
     channel_id = Column(UUID(as_uuid=True), ForeignKey("channels.id", ondelete="CASCADE"), nullable=False)
@@ -17,9 +33,13 @@ class Request(BaseModel):
     receiver_id = Column(UUID(as_uuid=True), ForeignKey("receivers.id", ondelete="CASCADE"), nullable=False)
     template_id = Column(UUID(as_uuid=True), ForeignKey("templates.id", ondelete="SET NULL"), nullable=True)
 
+    # With `payload_hash` set, `payload` only holds the per-user variables and the
+    # shared body lives in `payloads`; otherwise `payload` is the whole notification.
     payload = Column(JSON, nullable=False)
+    payload_hash = Column(String(64), ForeignKey("payloads.hash"), nullable=True)
 
     status = Column(Enum(NotificationStatus), default=NotificationStatus.PENDING, nullable=False)
     error_message = Column(String, nullable=True)
 
     request_source = Column(String, nullable=True) # e.g., source_type + source_name
+    message_id = Column(String, nullable=True)  # Redis stream entry ID the notification was published as
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Text
+from sqlalchemy import Column, String, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
@@ -21,3 +21,8 @@ class Template(BaseModel):
 
     # 🔐 This is the new field: JSON Schema for variable validation
     schema = Column(JSONB, nullable=True)  # JSON Schema for required variables
+
+    __table_args__ = (
+        Index('ix_templates_channel_id_id', 'channel_id', 'id'),
+        Index('ix_templates_provider_id_id', 'provider_id', 'id'),
+    )
@@ -9,6 +9,15 @@ redis_client: aioredis.Redis = aioredis.from_url(
     decode_responses=True,
 )
 
+# Returns raw bytes, for notification stream entries written by a binary codec.
+binary_redis_client: aioredis.Redis = aioredis.from_url(
+    redis_settings.get_redis_url(),
+    decode_responses=False,
+)
+
 # dependencies.py
 def get_redis_client() -> aioredis.Redis:
     return redis_client
+
+def get_binary_redis_client() -> aioredis.Redis:
+    return binary_redis_client
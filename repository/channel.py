@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 from fastapi import status
 
@@ -9,6 +9,7 @@ from models import Channel
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
 from exception.db_exception import DBException
+from utils.pagination import apply_keyset
 
 
 class ChannelDAO:
@@ -120,15 +121,23 @@ class ChannelDAO:
                 error=str(e)
             )
 
-    async def get_all_channels(self) -> List[Channel]:
+    async def get_all_channels(
+        self, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Channel]:
         """
-        Retrieve all channels from the database.
+        Retrieve all channels, one keyset page at a time.
+
+        Args:
+            after_id (Optional[UUID]): Only return channels whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of channels to return; all remaining when None.
 
         Returns:
-            List[Channel]: A list of Channel objects.
+            List[Channel]: A list of Channel objects ordered by ID.
         """
         try:
-            result = await self.session.execute(select(Channel))
+            result = await self.session.execute(
+                apply_keyset(select(Channel), Channel.id, after_id, limit)
+            )
             return result.scalars().all()
         except SQLAlchemyError as e:
             await self.session.rollback()
@@ -138,6 +147,30 @@ class ChannelDAO:
                 error=str(e)
             )
 
+    async def stream_all_channels(self, batch_size: int) -> AsyncIterator[Channel]:
+        """
+        Stream all channels from a server-side cursor, ordered by ID.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Channel: Each Channel object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Channel).order_by(Channel.id).execution_options(yield_per=batch_size)
+            )
+            async for channel in result:
+                yield channel
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Channel.GET_ALL_FAILED,
+                error_message=ErrorMessages.Channel.GET_ALL_FAILED,
+                error=str(e)
+            )
+
     async def delete_channel_by_id(self, channel_id: UUID) -> bool:
         """
         Delete a channel by its ID.
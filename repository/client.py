@@ -1,14 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 from fastapi import status
 
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
+from enums.delivery_mode import DeliveryMode
 from models import Client
 from exception.db_exception import DBException
+from utils.pagination import apply_keyset
 
 
 class ClientDAO:
@@ -144,15 +146,23 @@ class ClientDAO:
                 error=str(e)
             )
 
-    async def get_all_clients(self) -> List[Client]:
+    async def get_all_clients(
+        self, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Client]:
         """
-        Retrieve all clients from the database.
+        Retrieve all clients, one keyset page at a time.
+
+        Args:
+            after_id (Optional[UUID]): Only return clients whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of clients to return; all remaining when None.
 
         Returns:
-            List[Client]: A list of Client objects.
+            List[Client]: A list of Client objects ordered by ID.
         """
         try:
-            result = await self.session.execute(select(Client))
+            result = await self.session.execute(
+                apply_keyset(select(Client), Client.id, after_id, limit)
+            )
             return result.scalars().all()
         except SQLAlchemyError as e:
             await self.session.rollback()
@@ -162,6 +172,53 @@ class ClientDAO:
                 error=str(e)
             )
 
+    async def get_client_ids_by_delivery_mode(self, delivery_mode: DeliveryMode) -> List[UUID]:
+        """
+        Retrieve the IDs of all clients using a delivery mode.
+
+        Args:
+            delivery_mode (DeliveryMode): The delivery mode to match.
+
+        Returns:
+            List[UUID]: The matching client IDs.
+        """
+        try:
+            result = await self.session.execute(
+                select(Client.id).where(Client.delivery_mode == delivery_mode)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Client.GET_ALL_FAILED,
+                error_message=ErrorMessages.Client.GET_ALL_FAILED,
+                error=str(e)
+            )
+
+    async def stream_all_clients(self, batch_size: int) -> AsyncIterator[Client]:
+        """
+        Stream all clients from a server-side cursor, ordered by ID.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Client: Each Client object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Client).order_by(Client.id).execution_options(yield_per=batch_size)
+            )
+            async for client in result:
+                yield client
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Client.GET_ALL_FAILED,
+                error_message=ErrorMessages.Client.GET_ALL_FAILED,
+                error=str(e)
+            )
+
     async def update_client(self, client: Client) -> Client:
         """
         Update and save the details of an existing client.
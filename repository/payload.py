@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models import Payload, Request
+from constants.error_codes import ErrorCodes
+from constants.error_messages import ErrorMessages
+from exception.db_exception import DBException
+
+
+class PayloadDAO:
+    """
+    Data Access Object for the content-addressed notification bodies.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def store_payloads(self, bodies: Dict[str, str], refresh_before: Optional[datetime] = None) -> None:
+        """
+        Store bodies keyed by their hash. A body is immutable once stored, so
+        hashes that already exist keep their body. With `refresh_before`, an
+        existing body created before then has its `created_at` moved to now, so
+        that unreferenced-payload GC does not delete a body about to be reused.
+
+        Args:
+            bodies (Dict[str, str]): Canonical JSON bodies keyed by hash.
+            refresh_before (Optional[datetime]): Refresh existing bodies older than this.
+        """
+        if not bodies:
+            return
+        statement = insert(Payload).values([{"hash": payload_hash, "body": body} for payload_hash, body in bodies.items()])
+        if refresh_before is None:
+            statement = statement.on_conflict_do_nothing(index_elements=[Payload.hash])
+        else:
+            # Only stale rows are updated, so a hot body is not rewritten on every send.
+            statement = statement.on_conflict_do_update(
+                index_elements=[Payload.hash],
+                set_={"created_at": func.now(), "updated_at": func.now()},
+                where=Payload.created_at < refresh_before,
+            )
+        try:
+            await self.session.execute(statement)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Payload.STORE_FAILED,
+                error_message=ErrorMessages.Payload.STORE_FAILED,
+                error=str(e)
+            )
+
+    async def get_payloads(self, hashes: List[str]) -> Dict[str, str]:
+        """
+        Retrieve stored bodies by hash.
+
+        Args:
+            hashes (List[str]): Hashes to look up.
+
+        Returns:
+            Dict[str, str]: Bodies keyed by hash; unknown hashes are missing.
+        """
+        if not hashes:
+            return {}
+        try:
+            result = await self.session.execute(
+                select(Payload.hash, Payload.body).filter(Payload.hash.in_(hashes))
+            )
+            return {payload_hash: body for payload_hash, body in result.all()}
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Payload.GET_FAILED,
+                error_message=ErrorMessages.Payload.GET_FAILED,
+                error=str(e)
+            )
+
+    async def delete_unreferenced(self, created_before: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` bodies created before `created_before` that no request
+        references any more, e.g. after their partitions were archived or dropped.
+        The age cutoff protects bodies stored (or reused, see `store_payloads`)
+        just ahead of their request.
+
+        Args:
+            created_before (datetime): Only bodies stored before this time are considered.
+            limit (int): Maximum number of bodies to delete in one call.
+
+        Returns:
+            int: Number of bodies deleted.
+        """
+        try:
+            orphans = (
+                select(Payload.hash)
+                .filter(
+                    Payload.created_at < created_before,
+                    ~exists().where(Request.payload_hash == Payload.hash),
+                )
+                .order_by(Payload.created_at)
+                .limit(limit)
+            )
+            result = await self.session.execute(
+                delete(Payload)
+                .where(Payload.hash.in_(orphans.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Payload.DELETE_FAILED,
+                error_message=ErrorMessages.Payload.DELETE_FAILED,
+                error=str(e)
+            )
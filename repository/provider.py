@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 from fastapi import status
 
@@ -9,6 +9,7 @@ from models import Provider, Channel
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
 from exception.db_exception import DBException
+from utils.pagination import apply_keyset
 
 
 class ProviderDAO:
@@ -103,19 +104,23 @@ class ProviderDAO:
                 error=str(e)
             )
 
-    async def get_providers_by_channel_id(self, channel_id: UUID) -> List[Provider]:
+    async def get_providers_by_channel_id(
+        self, channel_id: UUID, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Provider]:
         """
-        Retrieve all providers for a specific channel.
+        Retrieve all providers for a specific channel, one keyset page at a time.
 
         Args:
             channel_id (UUID): The ID of the channel.
+            after_id (Optional[UUID]): Only return providers whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of providers to return; all remaining when None.
 
         Returns:
-            List[Provider]: A list of Provider objects.
+            List[Provider]: A list of Provider objects ordered by ID.
         """
         try:
             result = await self.session.execute(
-                select(Provider).filter(Provider.channel_id == channel_id)
+                apply_keyset(select(Provider).filter(Provider.channel_id == channel_id), Provider.id, after_id, limit)
             )
             return result.scalars().all()
         except SQLAlchemyError as e:
@@ -125,16 +130,49 @@ class ProviderDAO:
                 error_message=ErrorMessages.Provider.GET_BY_CHANNEL_ID_FAILED,
                 error=str(e)
             )
-    
-    async def get_all_providers(self) -> List[Provider]:
+
+    async def stream_providers_by_channel_id(self, channel_id: UUID, batch_size: int) -> AsyncIterator[Provider]:
         """
-        Retrieve all providers from the database.
+        Stream all providers for a specific channel from a server-side cursor, ordered by ID.
+
+        Args:
+            channel_id (UUID): The ID of the channel.
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Provider: Each Provider object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Provider).filter(Provider.channel_id == channel_id).order_by(Provider.id).execution_options(yield_per=batch_size)
+            )
+            async for provider in result:
+                yield provider
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Provider.GET_BY_CHANNEL_ID_FAILED,
+                error_message=ErrorMessages.Provider.GET_BY_CHANNEL_ID_FAILED,
+                error=str(e)
+            )
+
+    async def get_all_providers(
+        self, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Provider]:
+        """
+        Retrieve all providers, one keyset page at a time.
+
+        Args:
+            after_id (Optional[UUID]): Only return providers whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of providers to return; all remaining when None.
 
         Returns:
-            List[Provider]: A list of Provider objects.
+            List[Provider]: A list of Provider objects ordered by ID.
         """
         try:
-            result = await self.session.execute(select(Provider))
+            result = await self.session.execute(
+                apply_keyset(select(Provider), Provider.id, after_id, limit)
+            )
             return result.scalars().all()
         except SQLAlchemyError as e:
             await self.session.rollback()
@@ -144,6 +182,30 @@ class ProviderDAO:
                 error=str(e)
             )
 
+    async def stream_all_providers(self, batch_size: int) -> AsyncIterator[Provider]:
+        """
+        Stream all providers from a server-side cursor, ordered by ID.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Provider: Each Provider object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Provider).order_by(Provider.id).execution_options(yield_per=batch_size)
+            )
+            async for provider in result:
+                yield provider
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Provider.GET_ALL_FAILED,
+                error_message=ErrorMessages.Provider.GET_ALL_FAILED,
+                error=str(e)
+            )
+
     async def update_provider_status(
         self, provider_id: UUID, is_active: bool
     ) -> Optional[Provider]:
@@ -2,7 +2,7 @@ from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 from fastapi import status
 
@@ -10,6 +10,7 @@ from models import Receiver
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
 from exception.db_exception import DBException
+from utils.pagination import apply_keyset
 from models.client import Client
 
 
@@ -81,19 +82,23 @@ class ReceiverDAO:
                 error=str(e)
             )
 
-    async def get_receivers_by_client_id(self, client_id: UUID) -> List[Receiver]:
+    async def get_receivers_by_client_id(
+        self, client_id: UUID, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Receiver]:
         """
-        Retrieve all receivers for a specific client.
+        Retrieve all receivers for a specific client, one keyset page at a time.
 
         Args:
             client_id (UUID): The ID of the client.
+            after_id (Optional[UUID]): Only return receivers whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of receivers to return; all remaining when None.
 
         Returns:
-            List[Receiver]: A list of Receiver objects.
+            List[Receiver]: A list of Receiver objects ordered by ID.
         """
         try:
             result = await self.session.execute(
-                select(Receiver).filter(Receiver.client_id == client_id)
+                apply_keyset(select(Receiver).filter(Receiver.client_id == client_id), Receiver.id, after_id, limit)
             )
             return result.scalars().all()
         except SQLAlchemyError as e:
@@ -104,6 +109,62 @@ class ReceiverDAO:
                 error=str(e)
             )
 
+    async def stream_receivers_by_client_id(self, client_id: UUID, batch_size: int) -> AsyncIterator[Receiver]:
+        """
+        Stream all receivers for a specific client from a server-side cursor, ordered by ID.
+
+        Args:
+            client_id (UUID): The ID of the client.
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Receiver: Each Receiver object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Receiver).filter(Receiver.client_id == client_id).order_by(Receiver.id).execution_options(yield_per=batch_size)
+            )
+            async for receiver in result:
+                yield receiver
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Receiver.GET_BY_CLIENT_ID_FAILED,
+                error_message=ErrorMessages.Receiver.GET_BY_CLIENT_ID_FAILED,
+                error=str(e)
+            )
+
+    async def get_user_ids_in_segment(self, client_id: UUID, user_ids: List[str], segment: Dict[str, Any]) -> List[str]:
+        """
+        Narrow a client's users to those whose `meta_data` contains `segment`
+        (JSONB `@>`), e.g. `{"plan": "pro"}`. Looked up by the unique
+        (client_id, user_id) index, so only the given users are examined.
+
+        Args:
+            client_id (UUID): The client's ID.
+            user_ids (List[str]): User IDs to check.
+            segment (Dict[str, Any]): JSON object the receivers' meta_data must contain.
+
+        Returns:
+            List[str]: The user IDs in the segment.
+        """
+        try:
+            result = await self.session.execute(
+                select(Receiver.user_id).filter(
+                    Receiver.client_id == client_id,
+                    Receiver.user_id.in_(user_ids),
+                    Receiver.meta_data.contains(segment)
+                )
+            )
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Receiver.GET_BY_CLIENT_ID_FAILED,
+                error_message=ErrorMessages.Receiver.GET_BY_CLIENT_ID_FAILED,
+                error=str(e)
+            )
+
     async def get_receiver_by_client_id_and_identifier(self, client_id: UUID, identifier: str) -> Optional[Receiver]:
         """
         Retrieve a receiver by client_id and identifier. The identifier can match user_id, email, or phone_number.
@@ -1,14 +1,18 @@
+from collections import Counter
 from string import Template
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import update
-from typing import List, Optional
+from sqlalchemy import DateTime, String, and_, case, cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 from fastapi import status
 
+from config.client import ConfigClient
 from models import Request
-from enums.notification_status import NotificationStatus
+from enums.notification_status import STATUS_RANK, NotificationStatus
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
 from exception.db_exception import DBException
@@ -16,6 +20,28 @@ from models.channel import Channel
 from models.client import Client
 from models.provider import Provider
 from models.receiver import Receiver
+from utils.helpers import generate_uuid7, stream_id_datetime, uuid7_datetime
+from utils.pagination import apply_keyset
+
+STATUS_BATCH_SIZE: int = int(ConfigClient.get_property("STATUS_BATCH_SIZE", section="REQUESTS"))
+
+# A request row is written right after its stream entry, but by a different clock
+# (the API server's, not Redis'); rows are matched from a little before the entry's
+# timestamp onwards. Bounds joined from a VALUES list cannot prune partitions, so
+# batched updates also bound `created_at` by a constant: the batch's earliest one.
+STREAM_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def request_id_filter(request_id: UUID):
+    """
+    Filter matching a request by ID.
+
+    Requests created since partitioning carry time-ordered (v7) IDs, so the
+    partition key can be derived from the ID and the lookup pruned to one partition.
+    """
+    if request_id.version == 7:
+        return and_(Request.id == request_id, Request.created_at == uuid7_datetime(request_id))
+    return Request.id == request_id
 
 
 class RequestDAO:
@@ -33,7 +59,9 @@ class RequestDAO:
         payload: dict,
         provider_id: Optional[UUID] = None,
         template_id: Optional[UUID] = None,
-        request_source: Optional[str] = None
+        request_source: Optional[str] = None,
+        message_id: Optional[str] = None,
+        payload_hash: Optional[str] = None
     ) -> Optional[Request]:
         """
         Create a new request in the database after verifying related entities exist.
@@ -42,10 +70,12 @@ class RequestDAO:
             client_id (UUID): The ID of the client.
             channel_id (UUID): The ID of the channel.
             receiver_id (UUID): The ID of the receiver.
-            payload (dict): The payload for the request.
+            payload (dict): The payload for the request, or only its per-user variables when `payload_hash` is set.
             provider_id (Optional[UUID]): The ID of the provider (optional).
             template_id (Optional[UUID]): The ID of the template (optional).
             request_source (Optional[str]): The source of the request (optional).
+            message_id (Optional[str]): The Redis stream entry ID of the published notification (optional).
+            payload_hash (Optional[str]): Hash of the shared body in the payload store (optional).
 
         Returns:
             Optional[Request]: The created Request object.
@@ -118,15 +148,21 @@ class RequestDAO:
                         status_code=status.HTTP_404_NOT_FOUND
                     )
 
-            # Create the request if all checks pass
+            # Create the request if all checks pass; created_at is taken from the
+            # time-ordered ID so that later lookups by ID can prune partitions.
+            request_id = generate_uuid7()
             request = Request(
+                id=request_id,
+                created_at=uuid7_datetime(request_id),
                 client_id=client_id,
                 channel_id=channel_id,
                 provider_id=provider_id,
                 receiver_id=receiver_id,
                 template_id=template_id,
                 payload=payload,
-                request_source=request_source
+                request_source=request_source,
+                message_id=message_id,
+                payload_hash=payload_hash
             )
             self.session.add(request)
             await self.session.commit()
@@ -153,7 +189,7 @@ class RequestDAO:
         """
         try:
             result = await self.session.execute(
-                select(Request).filter(Request.id == request_id)
+                select(Request).filter(request_id_filter(request_id))
             )
             return result.scalars().first()
         except SQLAlchemyError as e:
@@ -163,19 +199,29 @@ class RequestDAO:
                 error=str(e)
             )
 
-    async def get_requests_by_receiver_id(self, receiver_id: UUID) -> List[Request]:
+    async def get_requests_by_receiver_id(
+        self,
+        receiver_id: UUID,
+        after_id: Optional[UUID] = None,
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Request]:
         """
-        Retrieve all requests for a specific receiver.
+        Retrieve all requests for a specific receiver, one keyset page at a time.
 
         Args:
             receiver_id (UUID): The ID of the receiver.
+            after_id (Optional[UUID]): Only return requests whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of requests to return; all remaining when None.
+            since (Optional[datetime]): Only return requests created at or after this time (UTC),
+                which skips the partitions before it.
 
         Returns:
-            List[Request]: A list of Request objects.
+            List[Request]: A list of Request objects ordered by ID.
         """
         try:
             result = await self.session.execute(
-                select(Request).filter(Request.receiver_id == receiver_id)
+                apply_keyset(self._receiver_filter(receiver_id, since), Request.id, after_id, limit)
             )
             return result.scalars().all()
         except SQLAlchemyError as e:
@@ -185,6 +231,41 @@ class RequestDAO:
                 error=str(e)
             )
 
+    async def stream_requests_by_receiver_id(
+        self, receiver_id: UUID, batch_size: int, since: Optional[datetime] = None
+    ) -> AsyncIterator[Request]:
+        """
+        Stream all requests for a specific receiver from a server-side cursor, ordered by ID.
+
+        Args:
+            receiver_id (UUID): The ID of the receiver.
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+            since (Optional[datetime]): Only stream requests created at or after this time (UTC).
+
+        Yields:
+            Request: Each Request object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                self._receiver_filter(receiver_id, since).order_by(Request.id).execution_options(yield_per=batch_size)
+            )
+            async for request in result:
+                yield request
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Request.GET_BY_RECEIVER_FAILED,
+                error_message=ErrorMessages.Request.GET_BY_RECEIVER_FAILED,
+                error=str(e)
+            )
+
+    @staticmethod
+    def _receiver_filter(receiver_id: UUID, since: Optional[datetime]):
+        stmt = select(Request).filter(Request.receiver_id == receiver_id)
+        if since is not None:
+            stmt = stmt.filter(Request.created_at >= since)
+        return stmt
+
     async def update_status(
         self, request_id: UUID, status: NotificationStatus, error_message: Optional[str] = None
     ) -> None:
@@ -202,7 +283,7 @@ class RequestDAO:
         try:
             stmt = (
                 update(Request)
-                .where(Request.id == request_id)
+                .where(request_id_filter(request_id))
                 .values(status=status, error_message=error_message)
             )
             await self.session.execute(stmt)
@@ -214,3 +295,207 @@ class RequestDAO:
                 error_message=ErrorMessages.Request.STATUS_UPDATE_FAILED,
                 error=str(e)
             )
+
+    async def bulk_update_status(
+        self, updates: Sequence[Tuple[UUID, UUID, NotificationStatus, Optional[str]]], forward_only: bool = False
+    ) -> int:
+        """
+        Apply many status transitions at once, one `UPDATE ... FROM (VALUES ...)`
+        statement per `STATUS_BATCH_SIZE` rows, committed together. A request is
+        only updated for the provider it was sent through.
+
+        Args:
+            updates (Sequence[Tuple[UUID, UUID, NotificationStatus, Optional[str]]]):
+                (request ID, provider ID, new status, error message) tuples.
+            forward_only (bool): Skip rows whose current status already ranks at or
+                above the new one (see `STATUS_RANK`), for out-of-order sources.
+
+        Returns:
+            int: Number of requests updated.
+        """
+        try:
+            updated = 0
+            for batch in _batches(updates, STATUS_BATCH_SIZE):
+                rows = values(
+                    column("id", PG_UUID(as_uuid=True)),
+                    column("created_at", DateTime),
+                    column("provider_id", PG_UUID(as_uuid=True)),
+                    column("status", Request.status.type),
+                    column("error_message", String),
+                    name="transitions",
+                ).data([
+                    # The partition key is known for v7 IDs; older IDs match on id alone.
+                    (
+                        request_id,
+                        uuid7_datetime(request_id) if request_id.version == 7 else None,
+                        provider_id,
+                        status,
+                        error_message,
+                    )
+                    for request_id, provider_id, status, error_message in batch
+                ])
+                stmt = (
+                    update(Request)
+                    .where(
+                        Request.id == rows.c.id,
+                        # Cast, as a VALUES column of only NULLs has no type.
+                        Request.created_at == func.coalesce(cast(rows.c.created_at, DateTime), Request.created_at),
+                        Request.provider_id == rows.c.provider_id,
+                    )
+                    .values(status=rows.c.status, error_message=rows.c.error_message)
+                    .execution_options(synchronize_session=False)
+                )
+                created = [uuid7_datetime(request_id) for request_id, *_rest in batch if request_id.version == 7]
+                if len(created) == len(batch):
+                    # Constant bounds, which Postgres can prune partitions on.
+                    stmt = stmt.where(Request.created_at.between(min(created), max(created)))
+                if forward_only:
+                    stmt = stmt.where(_status_rank(Request.status) < _status_rank(rows.c.status))
+                updated += (await self.session.execute(stmt)).rowcount
+            await self.session.commit()
+            return updated
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Request.STATUS_UPDATE_FAILED,
+                error_message=ErrorMessages.Request.STATUS_UPDATE_FAILED,
+                error=str(e)
+            )
+
+    async def mark_delivered(self, client_id: UUID, deliveries: Sequence[Tuple[str, str]]) -> int:
+        """
+        Move still-pending requests whose stream entries reached a WebSocket to DELIVERED.
+
+        Args:
+            client_id (UUID): The client the users belong to.
+            deliveries (Sequence[Tuple[str, str]]): (user ID, stream message ID) pairs.
+
+        Returns:
+            int: Number of requests updated.
+        """
+        return await self._transition_by_message_ids(
+            client_id, deliveries, NotificationStatus.DELIVERED, (NotificationStatus.PENDING,)
+        )
+
+    async def mark_acknowledged(self, client_id: UUID, acks: Sequence[Tuple[str, str]]) -> int:
+        """
+        Move the requests behind acknowledged stream entries to READ, whether or not
+        their delivery has been recorded yet.
+
+        Args:
+            client_id (UUID): The client the users belong to.
+            acks (Sequence[Tuple[str, str]]): (user ID, stream message ID) pairs.
+
+        Returns:
+            int: Number of requests updated.
+        """
+        return await self._transition_by_message_ids(
+            client_id,
+            acks,
+            NotificationStatus.READ,
+            (NotificationStatus.PENDING, NotificationStatus.ACCEPTED, NotificationStatus.DELIVERED),
+        )
+
+    async def mark_acknowledged_by_user(self, client_id: UUID, acks: Sequence[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Like `mark_acknowledged`, but count the updated requests per user. Requests
+        already READ are not counted, so acknowledging an entry twice counts it once.
+
+        Returns:
+            Dict[str, int]: Number of requests updated per user ID, for users with any.
+        """
+        return await self._transition_by_message_ids(
+            client_id,
+            acks,
+            NotificationStatus.READ,
+            (NotificationStatus.PENDING, NotificationStatus.ACCEPTED, NotificationStatus.DELIVERED),
+            per_user=True,
+        )
+
+    async def mark_dead_lettered(self, client_id: UUID, entries: Sequence[Tuple[str, str]]) -> int:
+        """
+        Move the requests behind stream entries given up on after too many
+        deliveries to REJECTED, unless they were read in the meantime.
+
+        Args:
+            client_id (UUID): The client the users belong to.
+            entries (Sequence[Tuple[str, str]]): (user ID, stream message ID) pairs.
+
+        Returns:
+            int: Number of requests updated.
+        """
+        return await self._transition_by_message_ids(
+            client_id,
+            entries,
+            NotificationStatus.REJECTED,
+            (NotificationStatus.PENDING, NotificationStatus.ACCEPTED, NotificationStatus.DELIVERED),
+        )
+
+    async def _transition_by_message_ids(
+        self,
+        client_id: UUID,
+        entries: Sequence[Tuple[str, str]],
+        status: NotificationStatus,
+        from_statuses: Sequence[NotificationStatus],
+        per_user: bool = False,
+    ) -> Union[int, Dict[str, int]]:
+        """
+        Move the requests behind stream entries from any of `from_statuses` to `status`,
+        one `UPDATE ... FROM (VALUES ...)` statement per `STATUS_BATCH_SIZE` entries.
+
+        Stream entry IDs are only unique within one user's stream, so each entry is
+        matched through the client's receiver for that user. Guarding on the current
+        status makes transitions idempotent and order-independent.
+
+        Returns the number of updated requests, or with `per_user` that number per user ID.
+        """
+        try:
+            updated = 0
+            updated_by_user: Counter = Counter()
+            for batch in _batches(entries, STATUS_BATCH_SIZE):
+                data = [
+                    (user_id, message_id, stream_id_datetime(message_id) - STREAM_CLOCK_SKEW)
+                    for user_id, message_id in batch
+                ]
+                rows = values(
+                    column("user_id", String),
+                    column("message_id", String),
+                    column("created_after", DateTime),
+                    name="entries",
+                ).data(data)
+                stmt = (
+                    update(Request)
+                    .where(
+                        Receiver.client_id == client_id,
+                        Receiver.user_id == rows.c.user_id,
+                        Request.receiver_id == Receiver.id,
+                        Request.message_id == rows.c.message_id,
+                        Request.created_at >= rows.c.created_after,
+                        Request.created_at >= min(created_after for _user_id, _message_id, created_after in data),
+                        Request.status.in_(from_statuses),
+                    )
+                    .values(status=status)
+                    .execution_options(synchronize_session=False)
+                )
+                if per_user:
+                    updated_by_user.update((await self.session.execute(stmt.returning(Receiver.user_id))).scalars())
+                else:
+                    updated += (await self.session.execute(stmt)).rowcount
+            await self.session.commit()
+            return dict(updated_by_user) if per_user else updated
+        except (SQLAlchemyError, ValueError) as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Request.STATUS_UPDATE_FAILED,
+                error_message=ErrorMessages.Request.STATUS_UPDATE_FAILED,
+                error=str(e)
+            )
+
+
+def _status_rank(status_column):
+    return case({status: rank for status, rank in STATUS_RANK.items()}, value=status_column)
+
+
+def _batches(items: Sequence, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 from fastapi import status
 
@@ -11,6 +11,7 @@ from models.provider import Provider
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
 from exception.db_exception import DBException
+from utils.pagination import apply_keyset
 
 
 class TemplateDAO:
@@ -93,15 +94,23 @@ class TemplateDAO:
                 error=str(e)
             )
 
-    async def get_all_templates(self) -> List[Template]:
+    async def get_all_templates(
+        self, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Template]:
         """
-        Retrieve all templates from the database.
+        Retrieve all templates, one keyset page at a time.
+
+        Args:
+            after_id (Optional[UUID]): Only return templates whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of templates to return; all remaining when None.
 
         Returns:
-            List[Template]: A list of Template objects.
+            List[Template]: A list of Template objects ordered by ID.
         """
         try:
-            result = await self.session.execute(select(Template))
+            result = await self.session.execute(
+                apply_keyset(select(Template), Template.id, after_id, limit)
+            )
             return result.scalars().all()
         except SQLAlchemyError as e:
             await self.session.rollback()
@@ -111,19 +120,47 @@ class TemplateDAO:
                 error=str(e)
             )
 
-    async def get_templates_by_channel_id(self, channel_id: UUID) -> List[Template]:
+    async def stream_all_templates(self, batch_size: int) -> AsyncIterator[Template]:
+        """
+        Stream all templates from a server-side cursor, ordered by ID.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Template: Each Template object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Template).order_by(Template.id).execution_options(yield_per=batch_size)
+            )
+            async for template in result:
+                yield template
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Template.GET_ALL_FAILED,
+                error_message=ErrorMessages.Template.GET_ALL_FAILED,
+                error=str(e)
+            )
+
+    async def get_templates_by_channel_id(
+        self, channel_id: UUID, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Template]:
         """
-        Retrieve all templates associated with a specific channel.
+        Retrieve all templates associated with a specific channel, one keyset page at a time.
 
         Args:
             channel_id (UUID): The ID of the channel.
+            after_id (Optional[UUID]): Only return templates whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of templates to return; all remaining when None.
 
         Returns:
-            List[Template]: A list of Template objects.
+            List[Template]: A list of Template objects ordered by ID.
         """
         try:
             result = await self.session.execute(
-                select(Template).filter(Template.channel_id == channel_id)
+                apply_keyset(select(Template).filter(Template.channel_id == channel_id), Template.id, after_id, limit)
             )
             return result.scalars().all()
         except SQLAlchemyError as e:
@@ -134,19 +171,48 @@ class TemplateDAO:
                 error=str(e)
             )
 
-    async def get_templates_by_provider_id(self, provider_id: UUID) -> List[Template]:
+    async def stream_templates_by_channel_id(self, channel_id: UUID, batch_size: int) -> AsyncIterator[Template]:
         """
-        Retrieve all templates associated with a specific provider.
+        Stream all templates associated with a specific channel from a server-side cursor, ordered by ID.
+
+        Args:
+            channel_id (UUID): The ID of the channel.
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Template: Each Template object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Template).filter(Template.channel_id == channel_id).order_by(Template.id).execution_options(yield_per=batch_size)
+            )
+            async for template in result:
+                yield template
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Template.GET_BY_CHANNEL_ID_FAILED,
+                error_message=ErrorMessages.Template.GET_BY_CHANNEL_ID_FAILED,
+                error=str(e)
+            )
+
+    async def get_templates_by_provider_id(
+        self, provider_id: UUID, after_id: Optional[UUID] = None, limit: Optional[int] = None
+    ) -> List[Template]:
+        """
+        Retrieve all templates associated with a specific provider, one keyset page at a time.
 
         Args:
             provider_id (UUID): The ID of the provider.
+            after_id (Optional[UUID]): Only return templates whose ID sorts after this one (the page cursor).
+            limit (Optional[int]): Maximum number of templates to return; all remaining when None.
 
         Returns:
-            List[Template]: A list of Template objects.
+            List[Template]: A list of Template objects ordered by ID.
         """
         try:
             result = await self.session.execute(
-                select(Template).filter(Template.provider_id == provider_id)
+                apply_keyset(select(Template).filter(Template.provider_id == provider_id), Template.id, after_id, limit)
             )
             return result.scalars().all()
         except SQLAlchemyError as e:
@@ -157,6 +223,31 @@ class TemplateDAO:
                 error=str(e)
             )
 
+    async def stream_templates_by_provider_id(self, provider_id: UUID, batch_size: int) -> AsyncIterator[Template]:
+        """
+        Stream all templates associated with a specific provider from a server-side cursor, ordered by ID.
+
+        Args:
+            provider_id (UUID): The ID of the provider.
+            batch_size (int): Number of rows fetched from the cursor per round trip.
+
+        Yields:
+            Template: Each Template object as it comes off the cursor.
+        """
+        try:
+            result = await self.session.stream_scalars(
+                select(Template).filter(Template.provider_id == provider_id).order_by(Template.id).execution_options(yield_per=batch_size)
+            )
+            async for template in result:
+                yield template
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DBException(
+                error_code=ErrorCodes.Template.GET_BY_PROVIDER_ID_FAILED,
+                error_message=ErrorMessages.Template.GET_BY_PROVIDER_ID_FAILED,
+                error=str(e)
+            )
+
     async def update_template(self, template: Template) -> Optional[Template]:
         """
         Update and save the details of an existing template in the database.
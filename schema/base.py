@@ -1,4 +1,4 @@
-from typing import Any, Union
+from typing import Any, Optional, Union
 from pydantic import BaseModel, Field
 
 
@@ -24,6 +24,16 @@ class Response(BaseResponse):
     data: Union[None, Any] = Field(None, description="Payload data of the response, if any.")
 
 
+class PaginatedResponse(Response):
+    """
+    Success response wrapper for one page of a keyset-paginated list.
+
+    Attributes:
+        next_cursor (str, optional): Opaque cursor for the next page, or None on the last page.
+    """
+    next_cursor: Optional[str] = Field(None, description="Cursor to pass as `cursor` to fetch the next page; null on the last page.")
+
+
 class ErrorResponse(BaseResponse):
     """
     Generic error response wrapper.
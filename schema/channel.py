@@ -1,8 +1,8 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
-from schema.base import Response
+from schema.base import PaginatedResponse, Response
 
 class ChannelCreate(BaseModel):
     name: str = Field(..., description="Name of the channel")
@@ -14,4 +14,7 @@ class ChannelDetails(BaseModel):
     description: Optional[str] = Field(None, description="Description of the channel")
 
 class ChannelDetailsResponse(Response):
-    data: ChannelDetails = Field(..., description="Channel details")
\ No newline at end of file
+    data: ChannelDetails = Field(..., description="Channel details")
+
+class ChannelDetailsListResponse(PaginatedResponse):
+    data: List[ChannelDetails] = Field(..., description="List of channel details")
\ No newline at end of file
@@ -1,9 +1,18 @@
+from typing import List
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+from enums.delivery_mode import DeliveryMode
+from schema.base import PaginatedResponse
+
 class ClientCreate(BaseModel):
     client_name: str = Field(..., description="Name of the client")
+    delivery_mode: DeliveryMode = Field(DeliveryMode.GROUP, description="How notifications are read from user streams")
 
 class ClientDetails(BaseModel):
     id: UUID = Field(..., description="Client's unique identifier")
     client_name: str = Field(..., description="Name of the client")
+    delivery_mode: DeliveryMode = Field(..., description="How notifications are read from user streams")
+
+class ClientDetailsListResponse(PaginatedResponse):
+    data: List[ClientDetails] = Field(..., description="List of client details")
@@ -1,10 +1,12 @@
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
+from uuid import UUID
 from pydantic import BaseModel, Field
 
 from enums.action_type import ActionType
 from enums.notification_type import NotificationType
 from enums.redirection_type import RedirectionType
 from schema.base import Response
+from schema.websocket import Topic
 
 
 class NotificationRedirection(BaseModel):
@@ -25,8 +27,7 @@ class NotificationAction(BaseModel):
     data: Optional[NotificationActionData] = Field(None, description="Additional data, required if action is 'copy_to_clipboard'")
 
 
-class NotificationRequestData(BaseModel):
-    user_id: str = Field(..., description="Identifier of the user the notification is for")
+class NotificationContent(BaseModel):
     type: NotificationType = Field(..., description="Type of the notification (e.g., success, error, warning, info)")
     color_code: str = Field(..., pattern=r"^#(?:[0-9a-fA-F]{3}){1,2}$", description="Hex code for the notification's theme color")
     title: str = Field(..., description="Title or heading of the notification")
@@ -39,15 +40,47 @@ class NotificationRequestData(BaseModel):
     metadata: Optional[Dict[str, str]] = Field(None, description="Optional key-value metadata for additional context")
 
 
+class NotificationRequestData(NotificationContent):
+    user_id: str = Field(..., description="Identifier of the user the notification is for")
+
+
+class BroadcastRequestData(NotificationContent):
+    client_id: Optional[UUID] = Field(None, description="Only sockets of this client; all sockets when omitted")
+    segment: Optional[Dict[str, Any]] = Field(
+        None, description="Only users whose receiver meta_data contains this JSON object, e.g. {\"plan\": \"pro\"}; needs client_id"
+    )
+
+
+class TopicNotificationRequestData(NotificationContent):
+    topic: Topic = Field(..., description="Topic to publish to, such as `org:123`; every socket subscribed to a matching filter receives it")
+
+
 class NotificationData(BaseModel):
     user_id: str
-    message_id: str
+    message_id: Optional[str] = Field(None, description="Stream entry ID; null if the notification could not be queued")
 
 
 class NotificationResponse(Response):
     data: NotificationData
 
 
+class BroadcastData(BaseModel):
+    message_id: str = Field(..., description="Entry ID in the broadcast stream")
+
+
+class BroadcastResponse(Response):
+    data: BroadcastData
+
+
+class TopicNotificationData(BaseModel):
+    topic: str
+    message_id: str = Field(..., description="Entry ID in the topics stream")
+
+
+class TopicNotificationResponse(Response):
+    data: TopicNotificationData
+
+
 class AcknowledgeRequest(BaseModel):
     user_id: str
     message_ids: List[str]
@@ -56,4 +89,38 @@ class AcknowledgeResponse(Response):
     data: bool = Field(
         ...,
         description="Indicates whether the acknowledgment was successful or not"
-    )
\ No newline at end of file
+    )
+
+
+class BulkAcknowledgeRequest(BaseModel):
+    acknowledgements: List[AcknowledgeRequest] = Field(..., min_length=1, description="Message IDs to acknowledge, grouped by user")
+
+
+class BulkAcknowledgeData(BaseModel):
+    acknowledged: Dict[str, int] = Field(..., description="Newly acknowledged messages per user ID")
+    updated_requests: int = Field(..., description="Number of request records moved to READ")
+
+
+class BulkAcknowledgeResponse(Response):
+    data: BulkAcknowledgeData
+
+
+class UnreadCountResponse(Response):
+    data: Dict[str, int] = Field(
+        ...,
+        description="Unread notification count per requested user ID"
+    )
+
+
+class InboxItem(BaseModel):
+    message_id: str = Field(..., description="Stream entry ID of the notification")
+    message: str = Field(..., description="The notification JSON, as delivered over the WebSocket")
+
+
+class InboxData(BaseModel):
+    items: List[InboxItem] = Field(..., description="Notifications, newest first")
+    next_cursor: Optional[str] = Field(None, description="Pass as `before` for the next page; null on the last page")
+
+
+class InboxResponse(Response):
+    data: InboxData
@@ -2,7 +2,7 @@ from typing import Any
 from uuid import UUID
 from pydantic import BaseModel, Field
 
-from schema.base import Response
+from schema.base import PaginatedResponse, Response
 
 class ProviderCreate(BaseModel):
     name: str = Field(..., description="Name of the provider")
@@ -19,5 +19,5 @@ class ProviderDetails(BaseModel):
 class ProviderDetailsResponse(Response):
     data: ProviderDetails = Field(..., description="Provider details")
 
-class ProviderDetailsListResponse(Response):
+class ProviderDetailsListResponse(PaginatedResponse):
     data: list[ProviderDetails] = Field(..., description="List of provider details")
\ No newline at end of file
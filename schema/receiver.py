@@ -2,7 +2,7 @@ from typing import Optional, Any, Dict, List
 from uuid import UUID
 from pydantic import BaseModel, Field
 
-from schema.base import Response
+from schema.base import PaginatedResponse, Response
 
 class ReceiverCreate(BaseModel):
     client_id: UUID = Field(..., description="ID of the client associated with the receiver")
@@ -22,5 +22,5 @@ class ReceiverDetails(BaseModel):
 class ReceiverDetailsResponse(Response):
     data: ReceiverDetails = Field(..., description="Receiver details")
 
-class ReceiverDetailsListResponse(Response):
+class ReceiverDetailsListResponse(PaginatedResponse):
     data: List[ReceiverDetails] = Field(..., description="List of receiver details")
\ No newline at end of file
@@ -2,7 +2,7 @@ from typing import Optional, Any, Dict, List
 from uuid import UUID
 from pydantic import BaseModel, Field
 
-from schema.base import Response
+from schema.base import PaginatedResponse, Response
 
 class TemplateCreate(BaseModel):
     channel_id: UUID = Field(..., description="ID of the channel associated with the template")
@@ -33,5 +33,5 @@ class TemplateDetails(BaseModel):
 class TemplateDetailsResponse(Response):
     data: TemplateDetails = Field(..., description="Template details")
 
-class TemplateDetailsListResponse(Response):
+class TemplateDetailsListResponse(PaginatedResponse):
     data: List[TemplateDetails] = Field(..., description="List of template details")
\ No newline at end of file
@@ -0,0 +1,60 @@
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, StringConstraints, TypeAdapter
+
+from config.client import ConfigClient
+
+MAX_ACK_IDS: int = int(ConfigClient.get_property("MAX_ACK_IDS", section="INBOUND"))
+INBOX_MAX_PAGE_SIZE: int = int(ConfigClient.get_property("INBOX_MAX_PAGE_SIZE", section="BACKLOG"))
+MAX_SUBSCRIPTIONS: int = int(ConfigClient.get_property("MAX_SUBSCRIPTIONS", section="TOPICS"))
+MAX_TOPIC_LENGTH: int = int(ConfigClient.get_property("MAX_TOPIC_LENGTH", section="TOPICS"))
+
+# Redis stream entry IDs, `<ms>-<seq>` or just `<ms>`.
+STREAM_ID_PATTERN = r"^\d+(-\d+)?$"
+StreamId = Annotated[str, StringConstraints(pattern=STREAM_ID_PATTERN)]
+
+# Topics are `:`-separated segments, such as `org:123`. Subscriptions may use `*`
+# for any one segment, such as `incident:*`.
+_TOPIC_SEGMENT = r"[A-Za-z0-9_.\-]+"
+TOPIC_PATTERN = rf"^{_TOPIC_SEGMENT}(:{_TOPIC_SEGMENT})*$"
+TOPIC_FILTER_PATTERN = rf"^({_TOPIC_SEGMENT}|\*)(:({_TOPIC_SEGMENT}|\*))*$"
+Topic = Annotated[str, StringConstraints(pattern=TOPIC_PATTERN, max_length=MAX_TOPIC_LENGTH)]
+TopicFilter = Annotated[str, StringConstraints(pattern=TOPIC_FILTER_PATTERN, max_length=MAX_TOPIC_LENGTH)]
+
+
+class AckMessage(BaseModel):
+    type: Literal["ack"]
+    message_ids: List[StreamId] = Field(..., min_length=1, max_length=MAX_ACK_IDS, description="Message IDs the user has read")
+
+
+class FetchMoreMessage(BaseModel):
+    type: Literal["fetch_more"]
+    before: Optional[StreamId] = Field(None, description="Only notifications older than this message ID")
+    limit: Optional[int] = Field(None, ge=1, le=INBOX_MAX_PAGE_SIZE, description="Page size")
+
+
+class PingMessage(BaseModel):
+    type: Literal["ping"]
+
+
+class PongMessage(BaseModel):
+    type: Literal["pong"]
+
+
+class SubscribeMessage(BaseModel):
+    type: Literal["subscribe"]
+    topics: List[TopicFilter] = Field(..., min_length=1, max_length=MAX_SUBSCRIPTIONS, description="Topics or topic filters to follow")
+
+
+class UnsubscribeMessage(BaseModel):
+    type: Literal["unsubscribe"]
+    topics: List[TopicFilter] = Field(..., min_length=1, max_length=MAX_SUBSCRIPTIONS, description="Topics or topic filters to stop following")
+
+
+# Text frames a client may send over the notification WebSocket, told apart by `type`.
+InboundMessage = Annotated[
+    Union[AckMessage, FetchMoreMessage, PingMessage, PongMessage, SubscribeMessage, UnsubscribeMessage],
+    Field(discriminator="type"),
+]
+
+inbound_message_adapter: TypeAdapter[InboundMessage] = TypeAdapter(InboundMessage)
@@ -1,6 +1,13 @@
 import os
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta
+
 from config.client import ConfigClient
 
+_EPOCH = datetime(1970, 1, 1)
+
 
 def get_stream_key(user_id: str) -> str:
     env = os.getenv("APP_ENV", "local")
@@ -12,4 +19,135 @@ def get_group_name() -> str:
     env = os.getenv("APP_ENV", "local")
     app = ConfigClient.get_property("APP_NAME").lower()
     group_prefix = ConfigClient.get_property("GROUP_NAME", section="WEBSOCKET")
-    return f"{env}:{app}:{group_prefix}"
\ No newline at end of file
+    return f"{env}:{app}:{group_prefix}"
+
+def get_unread_key(client_id: str, user_id: str) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    unread_prefix = ConfigClient.get_property("KEY_PREFIX", section="UNREAD")
+    return f"{env}:{app}:{unread_prefix}:{client_id}:{user_id}"
+
+def get_unread_channel() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    channel = ConfigClient.get_property("EVENTS_CHANNEL", section="UNREAD")
+    return f"{env}:{app}:{channel}"
+
+def get_lifecycle_stream_key() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    stream = ConfigClient.get_property("EVENTS_STREAM", section="LIFECYCLE")
+    return f"{env}:{app}:{stream}"
+
+def get_lifecycle_group_name() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    group = ConfigClient.get_property("GROUP_NAME", section="LIFECYCLE")
+    return f"{env}:{app}:{group}"
+
+def get_latency_key(client_id: str, stage: str, window_start: int) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    histogram_prefix = ConfigClient.get_property("HISTOGRAM_PREFIX", section="LIFECYCLE")
+    return f"{env}:{app}:{histogram_prefix}:{client_id}:{stage}:{window_start}"
+
+def get_latency_index_key() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    index = ConfigClient.get_property("CLIENT_INDEX", section="LIFECYCLE")
+    return f"{env}:{app}:{index}"
+
+def get_webhook_stream_key() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    stream = ConfigClient.get_property("STREAM", section="WEBHOOKS")
+    return f"{env}:{app}:{stream}"
+
+def get_webhook_group_name() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    group = ConfigClient.get_property("GROUP_NAME", section="WEBHOOKS")
+    return f"{env}:{app}:{group}"
+
+def get_payload_key(payload_hash: str) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    payload_prefix = ConfigClient.get_property("KEY_PREFIX", section="PAYLOADS")
+    return f"{env}:{app}:{payload_prefix}:{payload_hash}"
+
+def get_shard_stream_key(shard: int) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    shard_prefix = ConfigClient.get_property("STREAM_PREFIX", section="SHARDS")
+    # The hash tag keeps a shard's stream and its users' indexes in one cluster slot.
+    return f"{env}:{app}:{shard_prefix}:{{{shard}}}"
+
+def get_shard_index_key(shard: int, user_id: str) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    index_prefix = ConfigClient.get_property("INDEX_PREFIX", section="SHARDS")
+    return f"{env}:{app}:{index_prefix}:{{{shard}}}:{user_id}"
+
+def get_shard_group_name(node_id: str) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    group = ConfigClient.get_property("GROUP_NAME", section="SHARDS")
+    return f"{env}:{app}:{group}:{node_id}"
+
+def get_cursor_key(client_id: str) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    cursor_prefix = ConfigClient.get_property("KEY_PREFIX", section="CURSORS")
+    return f"{env}:{app}:{cursor_prefix}:{client_id}"
+
+def get_dead_letter_stream_key() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    stream = ConfigClient.get_property("DEAD_LETTER_STREAM", section="RECLAIM")
+    return f"{env}:{app}:{stream}"
+
+def get_device_acks_key(user_id: str) -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    device_prefix = ConfigClient.get_property("KEY_PREFIX", section="DEVICES")
+    return f"{env}:{app}:{device_prefix}:{user_id}"
+
+def get_topic_stream_key() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    stream = ConfigClient.get_property("STREAM", section="TOPICS")
+    return f"{env}:{app}:{stream}"
+
+def get_broadcast_stream_key() -> str:
+    env = os.getenv("APP_ENV", "local")
+    app = ConfigClient.get_property("APP_NAME").lower()
+    stream = ConfigClient.get_property("STREAM", section="BROADCAST")
+    return f"{env}:{app}:{stream}"
+
+
+def generate_uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits hold the Unix time in milliseconds, so ids sort by creation
+    time and the creation time can be recovered with `uuid7_datetime`.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | secrets.randbits(80)
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def uuid7_datetime(value: uuid.UUID) -> datetime:
+    """
+    Return the naive UTC creation time embedded in a version 7 UUID, truncated to milliseconds.
+    """
+    return _EPOCH + timedelta(milliseconds=value.int >> 80)
+
+
+def stream_id_datetime(message_id: str) -> datetime:
+    """
+    Return the naive UTC time, per the Redis server clock, at which a stream entry was added.
+    Stream entry IDs have the form `<unix time in ms>-<sequence>`.
+    """
+    return _EPOCH + timedelta(milliseconds=int(message_id.split("-", 1)[0]))
@@ -0,0 +1,78 @@
+import math
+from typing import Dict, Iterable, Mapping, Optional
+
+# Bucket boundaries grow geometrically, 2 ** (1 / BUCKETS_PER_DOUBLING) apart, so any
+# recorded value is reported within ~9% of its true value regardless of magnitude.
+BUCKETS_PER_DOUBLING = 8
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def bucket_index(value: float) -> int:
+    """
+    Index of the bucket holding `value`; values up to 1 share bucket 0.
+    """
+    if value <= 1:
+        return 0
+    return math.ceil(math.log2(value) * BUCKETS_PER_DOUBLING)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """
+    Largest value that falls into bucket `index`.
+    """
+    return 2 ** (index / BUCKETS_PER_DOUBLING)
+
+
+class LogHistogram:
+    """
+    Histogram with logarithmically sized buckets.
+
+    Recording is O(1) and only touches one counter, and two histograms merge by
+    adding counts per bucket, so per-window or per-node histograms can be stored
+    as plain hashes (bucket index -> count) and combined when read.
+    """
+
+    def __init__(self, counts: Optional[Mapping[int, int]] = None):
+        self.counts: Dict[int, int] = {}
+        if counts:
+            for index, count in counts.items():
+                self.counts[int(index)] = self.counts.get(int(index), 0) + int(count)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, value: float, count: int = 1) -> None:
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+
+    def merge(self, other: "LogHistogram") -> "LogHistogram":
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        return self
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """
+        Upper bound of the bucket containing the `quantile` (0..1) rank, or None when empty.
+        """
+        total = self.total
+        if not total:
+            return None
+        rank = max(1, math.ceil(quantile * total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return bucket_upper_bound(index)
+        return bucket_upper_bound(max(self.counts))
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Optional[float]]:
+        """
+        Count plus the requested percentiles, keyed `p50`, `p95`, ...
+        """
+        summary: Dict[str, Optional[float]] = {"count": self.total}
+        for quantile in quantiles:
+            value = self.percentile(quantile)
+            summary[f"p{quantile * 100:g}"] = round(value, 1) if value is not None else None
+        return summary
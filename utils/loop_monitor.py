@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from utils.histogram import LogHistogram
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _task_name(task: asyncio.Task) -> str:
+    # Coroutine names group tasks by what they run; task names may carry per-user IDs.
+    return getattr(task.get_coro(), "__qualname__", None) or task.get_name()
+
+
+def task_census() -> Dict[str, int]:
+    """
+    Number of live asyncio tasks per coroutine, most common first.
+    """
+    return dict(Counter(_task_name(task) for task in asyncio.all_tasks()).most_common())
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how much later than asked a short sleep wakes up.
+    A loop busy with callbacks that do not yield wakes sleepers late, so lag is
+    the delay every coroutine on this node is seeing right now. Every sample is
+    also recorded in a histogram of lag in milliseconds since startup.
+    """
+
+    def __init__(self):
+        self.lag_ms: float = 0.0
+        self.histogram = LogHistogram()
+
+    async def sample(self, interval_sec: float) -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.sleep(interval_sec)
+        self.lag_ms = max(loop.time() - started - interval_sec, 0.0) * 1000
+        self.histogram.record(self.lag_ms)
+        metrics.set_gauge("event_loop_lag_ms", round(self.lag_ms, 3))
+        return self.lag_ms
+
+    async def stats(self) -> Dict[str, Any]:
+        census = task_census()
+        return {
+            "lag_ms": round(self.lag_ms, 3),
+            "lag_histogram_ms": self.histogram.summary(),
+            "tasks": sum(census.values()),
+            "tasks_by_coroutine": census,
+        }
+
+
+class SlowCallbackWatchdog:
+    """
+    Detects callbacks that hold the event loop for longer than `threshold_ms`,
+    without asyncio debug mode. A helper thread posts a no-op callback to the
+    loop every half threshold; when one has not run within the threshold, the
+    loop is blocked, and the thread logs the running task and the loop thread's
+    stack (innermost `stack_depth` frames), which point at the blocking call.
+    Each stall is logged once and counted as `event_loop_slow_callbacks`.
+
+    Must be started from the event loop's thread.
+    """
+
+    def __init__(self, threshold_ms: float, stack_depth: int):
+        self.threshold_sec = threshold_ms / 1000
+        self.stack_depth = stack_depth
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # When the beat still waiting to run on the loop was posted, or None.
+        self._posted_at: Optional[float] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._posted_at = None
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _beat(self) -> None:
+        self._posted_at = None
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stopped.wait(self.threshold_sec / 2):
+            posted_at = self._posted_at
+            if posted_at is None:
+                reported = False
+                self._posted_at = time.monotonic()
+                try:
+                    self._loop.call_soon_threadsafe(self._beat)
+                except RuntimeError:
+                    # The loop is closed.
+                    return
+            elif not reported and time.monotonic() - posted_at >= self.threshold_sec:
+                reported = True
+                self._report(time.monotonic() - posted_at)
+
+    def _report(self, blocked_sec: float) -> None:
+        metrics.inc("event_loop_slow_callbacks")
+        task = asyncio.current_task(self._loop)
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=self.stack_depth)) if frame else ""
+        logger.warning(
+            "Event loop blocked for %.0fms so far, running %s:\n%s",
+            blocked_sec * 1000,
+            _task_name(task) if task else "a callback outside any task",
+            stack,
+        )
+
+
+# Singleton monitor instance
+loop_monitor = LoopLagMonitor()
+
+metrics.register_collector("event_loop", loop_monitor.stats)
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Sized, TypeVar
+
+V = TypeVar("V", bound=Sized)
+
+
+class LRUCache(Generic[V]):
+    """
+    In-process least-recently-used cache bounded by the total length of its values,
+    so a few large entries cannot crowd out memory the way a count bound would allow.
+
+    Not thread-safe; meant for use from the event loop.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[V]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        if len(value) > self.max_size:
+            return  # would evict everything else and still not fit
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_size:
+            _key, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
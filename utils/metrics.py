@@ -0,0 +1,47 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+Collector = Callable[[], Awaitable[Any]]
+
+
+class MetricsRegistry:
+    """
+    In-process registry of counters and gauges, plus named collectors that
+    compute values on demand (e.g. cluster-wide figures read from Redis).
+
+    Counters and gauges are local to this node; collectors decide their own scope.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.collectors: Dict[str, Collector] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def register_collector(self, name: str, collector: Collector) -> None:
+        self.collectors[name] = collector
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """
+        Current value of every metric. A failing collector is reported as None
+        rather than failing the whole snapshot.
+        """
+        snapshot: Dict[str, Any] = {"counters": dict(self.counters), "gauges": dict(self.gauges)}
+        for name, collector in self.collectors.items():
+            try:
+                snapshot[name] = await collector()
+            except Exception as exc:
+                logger.error("Metrics collector %s failed: %s", name, exc)
+                snapshot[name] = None
+        return snapshot
+
+
+# Singleton registry instance
+metrics = MetricsRegistry()
@@ -0,0 +1,75 @@
+import base64
+import binascii
+from typing import List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from fastapi import status
+from sqlalchemy import Select
+
+from config.client import ConfigClient
+from constants.error_codes import ErrorCodes
+from constants.error_messages import ErrorMessages
+from exception.app_exception import AppException
+
+DEFAULT_PAGE_SIZE: int = int(ConfigClient.get_property("DEFAULT_PAGE_SIZE", section="PAGINATION"))
+MAX_PAGE_SIZE: int = int(ConfigClient.get_property("MAX_PAGE_SIZE", section="PAGINATION"))
+STREAM_BATCH_SIZE: int = int(ConfigClient.get_property("STREAM_BATCH_SIZE", section="PAGINATION"))
+
+T = TypeVar("T")
+
+
+def encode_cursor(last_id: UUID) -> str:
+    """
+    Encode the id of the last row of a page into an opaque, URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(last_id.bytes).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[UUID]:
+    """
+    Decode a cursor produced by `encode_cursor` back into the id to resume after.
+
+    Raises:
+        AppException: If the cursor is malformed (HTTP 400).
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return UUID(bytes=base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError) as e:
+        raise AppException(
+            error_code=ErrorCodes.Pagination.INVALID_CURSOR,
+            error_message=ErrorMessages.Pagination.INVALID_CURSOR,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error=str(e),
+        )
+
+
+def apply_keyset(stmt: Select, id_column, after_id: Optional[UUID], limit: Optional[int]) -> Select:
+    """
+    Apply keyset pagination on the primary key to a select statement.
+
+    Rows are ordered by `id_column` and only rows strictly after `after_id` are
+    returned, so each page is an index range scan regardless of how deep it is.
+    """
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    stmt = stmt.order_by(id_column)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def split_page(items: Sequence[T], limit: int) -> Tuple[List[T], Optional[str]]:
+    """
+    Split a result fetched with `limit + 1` rows into the page and the next cursor.
+
+    Returns:
+        Tuple[List[T], Optional[str]]: The page items and the cursor of the next page,
+        or None when this is the last page.
+    """
+    page = list(items[:limit])
+    if len(items) > limit and page:
+        return page, encode_cursor(page[-1].id)
+    return page, None
@@ -0,0 +1,29 @@
+from typing import AsyncIterator, Callable, TypeVar
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+T = TypeVar("T")
+
+
+def ndjson_response(rows: AsyncIterator[T], mapper: Callable[[T], BaseModel]) -> StreamingResponse:
+    """
+    Build a streaming response that writes one JSON document per line.
+
+    Each row is mapped to its response DTO and serialized as soon as it comes off
+    the database cursor, so memory stays flat no matter how many rows are returned.
+
+    Args:
+        rows (AsyncIterator[T]): Rows yielded by a DAO `stream_*` method.
+        mapper (Callable[[T], BaseModel]): Converts a row into its response DTO.
+
+    Returns:
+        StreamingResponse: An `application/x-ndjson` response.
+    """
+    async def body() -> AsyncIterator[str]:
+        async for row in rows:
+            yield mapper(row).model_dump_json() + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
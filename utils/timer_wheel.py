@@ -0,0 +1,54 @@
+import math
+from typing import Dict, Generic, Hashable, List, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """
+    Hashed timer wheel: `slots` buckets of `tick_sec` each, holding keys by the
+    tick they are due at. Scheduling and cancelling are O(1) and advancing costs
+    only the keys that fall due, so one sweeper can track any number of deadlines
+    without a timer each. Delays are rounded up to whole ticks and capped at one
+    turn of the wheel.
+
+    Not thread-safe; meant for use from the event loop.
+    """
+
+    def __init__(self, tick_sec: float, slots: int):
+        self.tick_sec = tick_sec
+        self._slots: List[Set[K]] = [set() for _ in range(slots)]
+        self._slot_of: Dict[K, int] = {}
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def schedule(self, key: K, delay_sec: float) -> None:
+        """
+        Make `key` due after `delay_sec`, replacing any earlier schedule of it.
+        """
+        self.cancel(key)
+        ticks = min(max(math.ceil(delay_sec / self.tick_sec), 1), len(self._slots) - 1)
+        slot = (self._position + ticks) % len(self._slots)
+        self._slots[slot].add(key)
+        self._slot_of[key] = slot
+
+    def cancel(self, key: K) -> None:
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            self._slots[slot].discard(key)
+
+    def advance(self, ticks: int = 1) -> List[K]:
+        """
+        Move the wheel `ticks` ticks forward and return the keys that fell due.
+        """
+        due: List[K] = []
+        for _ in range(min(ticks, len(self._slots))):
+            self._position = (self._position + 1) % len(self._slots)
+            expired = self._slots[self._position]
+            self._slots[self._position] = set()
+            for key in expired:
+                del self._slot_of[key]
+            due.extend(expired)
+        return due
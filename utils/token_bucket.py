@@ -0,0 +1,36 @@
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `burst` tokens, for
+    rate limits that allow short bursts. Refilled lazily on each call, so an idle
+    bucket costs nothing.
+
+    Not thread-safe; meant for use from the event loop.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        self._refill()
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """
+        Seconds until `tokens` tokens will be available.
+        """
+        self._refill()
+        return max(tokens - self.tokens, 0) / self.rate if self.rate else float("inf")
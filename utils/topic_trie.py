@@ -0,0 +1,91 @@
+from typing import Dict, Generic, Hashable, List, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+SEPARATOR = ":"
+# Matches exactly one segment of a topic, e.g. `incident:*` matches `incident:42`.
+WILDCARD = "*"
+
+
+class _Node(Generic[K]):
+    __slots__ = ("children", "subscribers")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node[K]"] = {}
+        self.subscribers: Set[K] = set()
+
+
+class TopicTrie(Generic[K]):
+    """
+    Subscriptions to topic filters such as `org:123` or `incident:*`, kept in a
+    trie of `:`-separated segments. Matching a topic walks one path per wildcard
+    branch, so its cost depends on the topic's depth and the wildcards on its
+    way, not on how many filters or subscribers there are.
+
+    Not thread-safe; meant for use from the event loop.
+    """
+
+    def __init__(self):
+        self._root: _Node[K] = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, topic_filter: str, subscriber: K) -> bool:
+        """
+        Subscribe `subscriber` to `topic_filter`. Returns whether it was not already subscribed.
+        """
+        node = self._root
+        for segment in topic_filter.split(SEPARATOR):
+            node = node.children.setdefault(segment, _Node())
+        if subscriber in node.subscribers:
+            return False
+        node.subscribers.add(subscriber)
+        self._size += 1
+        return True
+
+    def remove(self, topic_filter: str, subscriber: K) -> bool:
+        """
+        Unsubscribe `subscriber` from `topic_filter`, pruning branches left empty.
+        Returns whether it was subscribed.
+        """
+        path: List[_Node[K]] = [self._root]
+        segments = topic_filter.split(SEPARATOR)
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return False
+            path.append(node)
+        if subscriber not in path[-1].subscribers:
+            return False
+        path[-1].subscribers.discard(subscriber)
+        self._size -= 1
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.subscribers or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+        return True
+
+    def match(self, topic: str) -> Set[K]:
+        """
+        Every subscriber of a filter matching `topic`.
+        """
+        nodes: List[_Node[K]] = [self._root]
+        for segment in topic.split(SEPARATOR):
+            next_nodes: List[_Node[K]] = []
+            for node in nodes:
+                child = node.children.get(segment)
+                if child is not None:
+                    next_nodes.append(child)
+                wildcard = node.children.get(WILDCARD)
+                if wildcard is not None:
+                    next_nodes.append(wildcard)
+            if not next_nodes:
+                return set()
+            nodes = next_nodes
+        matched: Set[K] = set()
+        for node in nodes:
+            matched.update(node.subscribers)
+        return matched
@@ -0,0 +1,19 @@
+from webhooks.base import ProviderStatusUpdate, WebhookParser
+from webhooks.generic import GenericWebhookParser
+from webhooks.sendgrid import SendGridWebhookParser
+from webhooks.twilio import TwilioWebhookParser
+
+# Parsers by provider name (providers are stored lowercased).
+PARSERS = {
+    "sendgrid": SendGridWebhookParser(),
+    "twilio": TwilioWebhookParser(),
+}
+
+DEFAULT_PARSER = GenericWebhookParser()
+
+
+def get_parser(provider_name: str) -> WebhookParser:
+    """
+    Parser for a provider's callbacks, falling back to the generic JSON format.
+    """
+    return PARSERS.get(provider_name.lower(), DEFAULT_PARSER)
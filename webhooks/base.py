@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+from uuid import UUID
+
+from enums.notification_status import NotificationStatus
+
+
+@dataclass(frozen=True)
+class ProviderStatusUpdate:
+    """
+    One status change reported by a provider for one of our requests.
+    """
+    request_id: UUID
+    status: NotificationStatus
+    error_message: Optional[str] = None
+
+
+class WebhookParser:
+    """
+    Verifies and parses the status callbacks of one kind of provider.
+
+    Implementations work on the raw request body so that signatures can be checked
+    over the exact bytes that were signed, and must be cheap: they run inline on
+    every callback, before anything is enqueued.
+    """
+
+    # Provider status -> our status; statuses not listed are ignored.
+    STATUS_MAP: Dict[str, NotificationStatus] = {}
+
+    def verify(self, config: Dict[str, Any], headers: Mapping[str, str], body: bytes, url: str) -> bool:
+        raise NotImplementedError
+
+    def parse(self, headers: Mapping[str, str], body: bytes, query: Mapping[str, str]) -> List[ProviderStatusUpdate]:
+        """
+        Raises:
+            ValueError: If the body is malformed.
+        """
+        raise NotImplementedError
+
+    def to_update(self, request_id: Any, provider_status: Any, error_message: Any = None) -> Optional[ProviderStatusUpdate]:
+        """
+        Build an update from raw callback fields, or None when the callback does not
+        reference one of our requests or reports a status we do not track.
+        """
+        status = self.STATUS_MAP.get(str(provider_status).lower())
+        if status is None or not request_id:
+            return None
+        try:
+            parsed_id = UUID(str(request_id))
+        except ValueError:
+            return None
+        return ProviderStatusUpdate(parsed_id, status, str(error_message) if error_message else None)
+
+
+def hmac_sha256_matches(secret: Optional[str], body: bytes, signature: Optional[str]) -> bool:
+    """
+    Constant-time check of a hex HMAC-SHA256 signature over `body`.
+    """
+    if not secret or not signature:
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
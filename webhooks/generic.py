@@ -0,0 +1,38 @@
+import json
+from typing import Any, Dict, List, Mapping
+
+from enums.notification_status import NotificationStatus
+from webhooks.base import ProviderStatusUpdate, WebhookParser, hmac_sha256_matches
+
+SIGNATURE_HEADER = "x-webhook-signature"
+
+
+class GenericWebhookParser(WebhookParser):
+    """
+    Default format for providers without a dedicated parser: a JSON object, or a
+    list of them, with `request_id`, `status` and an optional `error`, signed with
+    a hex HMAC-SHA256 of the body using the provider's `webhook_secret`.
+    """
+
+    STATUS_MAP = {
+        "accepted": NotificationStatus.ACCEPTED,
+        "delivered": NotificationStatus.DELIVERED,
+        "read": NotificationStatus.READ,
+        "rejected": NotificationStatus.REJECTED,
+        "failed": NotificationStatus.REJECTED,
+    }
+
+    def verify(self, config: Dict[str, Any], headers: Mapping[str, str], body: bytes, url: str) -> bool:
+        return hmac_sha256_matches(config.get("webhook_secret"), body, headers.get(SIGNATURE_HEADER))
+
+    def parse(self, headers: Mapping[str, str], body: bytes, query: Mapping[str, str]) -> List[ProviderStatusUpdate]:
+        events = json.loads(body)
+        if isinstance(events, dict):
+            events = [events]
+        if not isinstance(events, list):
+            raise ValueError("Expected a JSON object or array")
+        updates = (
+            self.to_update(event.get("request_id"), event.get("status"), event.get("error"))
+            for event in events if isinstance(event, dict)
+        )
+        return [update for update in updates if update]
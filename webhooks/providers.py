@@ -0,0 +1,40 @@
+import time
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from config.client import ConfigClient
+from models.provider import Provider
+from repository.provider import ProviderDAO
+
+PROVIDER_CACHE_TTL_SEC: float = float(ConfigClient.get_property("PROVIDER_CACHE_TTL_SEC", section="WEBHOOKS"))
+PROVIDER_MISS_CACHE_TTL_SEC: float = float(
+    ConfigClient.get_property("PROVIDER_MISS_CACHE_TTL_SEC", section="WEBHOOKS")
+)
+
+# Bounds memory if callbacks arrive for many made-up IDs; the cache just starts over.
+_MAX_CACHED = 10_000
+
+# provider ID -> (expiry on the monotonic clock, provider or None if unknown)
+_cache: Dict[UUID, Tuple[float, Optional[Provider]]] = {}
+
+
+async def get_webhook_provider(provider_id: UUID, provider_dao: ProviderDAO) -> Optional[Provider]:
+    """
+    Active provider for a webhook callback, cached per process for
+    `PROVIDER_CACHE_TTL_SEC` so bursts of callbacks do not each hit the database.
+    Unknown and inactive IDs are cached only for `PROVIDER_MISS_CACHE_TTL_SEC`:
+    long enough that a misconfigured sender cannot force a lookup per callback,
+    short enough that a newly created or reactivated provider is soon accepted.
+    """
+    now = time.monotonic()
+    cached = _cache.get(provider_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    provider = await provider_dao.get_provider_by_id(provider_id)
+    if provider is not None and not provider.is_active:
+        provider = None
+    if len(_cache) >= _MAX_CACHED:
+        _cache.clear()
+    ttl = PROVIDER_CACHE_TTL_SEC if provider is not None else PROVIDER_MISS_CACHE_TTL_SEC
+    _cache[provider_id] = (now + ttl, provider)
+    return provider
@@ -0,0 +1,83 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from config.client import ConfigClient
+from enums.notification_status import STATUS_RANK, NotificationStatus
+from redis_client.client import get_redis_client
+from utils.helpers import get_webhook_group_name, get_webhook_stream_key
+from webhooks.base import ProviderStatusUpdate
+
+WEBHOOK_STREAM: str = get_webhook_stream_key()
+WEBHOOK_GROUP: str = get_webhook_group_name()
+MAX_STREAM_LENGTH: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", section="WEBHOOKS"))
+READ_COUNT: int = int(ConfigClient.get_property("READ_COUNT", section="WEBHOOKS"))
+BLOCK_MS: int = int(ConfigClient.get_property("BLOCK_MS", section="WEBHOOKS"))
+
+logger = logging.getLogger(__name__)
+redis_client = get_redis_client()
+
+Entry = Tuple[str, Dict[str, str]]
+
+
+async def enqueue_status_updates(provider_id: UUID, updates: List[ProviderStatusUpdate]) -> None:
+    """
+    Append parsed callback updates to the ingestion stream in one pipelined round trip.
+    """
+    if not updates:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for update in updates:
+            fields = {"r": str(update.request_id), "s": update.status.value, "p": str(provider_id)}
+            if update.error_message:
+                fields["e"] = update.error_message
+            pipe.xadd(WEBHOOK_STREAM, fields, maxlen=MAX_STREAM_LENGTH, approximate=True)
+        await pipe.execute()
+
+
+async def ensure_webhook_group() -> None:
+    try:
+        await redis_client.xgroup_create(WEBHOOK_STREAM, WEBHOOK_GROUP, id="0", mkstream=True)
+    except Exception as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def read_status_updates(consumer: str, start_id: str = ">") -> List[Entry]:
+    """
+    Read the next batch of queued updates for `consumer`; pass `start_id="0"` to
+    re-read the ones it was given but never acknowledged.
+    """
+    response = await redis_client.xreadgroup(
+        WEBHOOK_GROUP, consumer, {WEBHOOK_STREAM: start_id}, count=READ_COUNT, block=BLOCK_MS
+    )
+    return [entry for _stream, entries in response or [] for entry in entries]
+
+
+async def acknowledge_status_updates(entry_ids: List[str]) -> None:
+    if entry_ids:
+        await redis_client.xack(WEBHOOK_STREAM, WEBHOOK_GROUP, *entry_ids)
+
+
+def coalesce_status_updates(entries: List[Entry]) -> List[Tuple[UUID, UUID, NotificationStatus, Optional[str]]]:
+    """
+    Collapse a batch to one update per request and provider: the furthest status
+    along the lifecycle wins, and among equals the one that arrived last. The
+    provider is kept so that a provider can only update its own requests.
+
+    Returns:
+        List[Tuple[UUID, UUID, NotificationStatus, Optional[str]]]:
+            (request ID, provider ID, status, error message) tuples.
+    """
+    latest: Dict[Tuple[UUID, UUID], Tuple[NotificationStatus, Optional[str]]] = {}
+    for _entry_id, fields in entries:
+        try:
+            key = (UUID(fields["r"]), UUID(fields["p"]))
+            status = NotificationStatus(fields["s"])
+        except (KeyError, ValueError) as exc:
+            logger.warning("Skipping malformed webhook update %s: %s", fields, exc)
+            continue
+        current = latest.get(key)
+        if current is None or STATUS_RANK[status] >= STATUS_RANK[current[0]]:
+            latest[key] = (status, fields.get("e"))
+    return [(request_id, provider_id, status, error) for (request_id, provider_id), (status, error) in latest.items()]
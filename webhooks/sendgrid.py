@@ -0,0 +1,37 @@
+import json
+from typing import List, Mapping
+
+from enums.notification_status import NotificationStatus
+from webhooks.base import ProviderStatusUpdate
+from webhooks.generic import GenericWebhookParser
+
+# Custom argument attached to every message we send, echoed back on each event.
+REQUEST_ID_ARG = "notiq_request_id"
+
+
+class SendGridWebhookParser(GenericWebhookParser):
+    """
+    SendGrid Event Webhook: a JSON array of events, each carrying our request ID
+    as a custom argument. Verified like the generic format, with the provider's
+    `webhook_secret`.
+    """
+
+    STATUS_MAP = {
+        "processed": NotificationStatus.ACCEPTED,
+        "deferred": NotificationStatus.ACCEPTED,
+        "delivered": NotificationStatus.DELIVERED,
+        "open": NotificationStatus.READ,
+        "click": NotificationStatus.READ,
+        "bounce": NotificationStatus.REJECTED,
+        "dropped": NotificationStatus.REJECTED,
+    }
+
+    def parse(self, headers: Mapping[str, str], body: bytes, query: Mapping[str, str]) -> List[ProviderStatusUpdate]:
+        events = json.loads(body)
+        if not isinstance(events, list):
+            raise ValueError("Expected a JSON array of events")
+        updates = (
+            self.to_update(event.get(REQUEST_ID_ARG), event.get("event"), event.get("reason"))
+            for event in events if isinstance(event, dict)
+        )
+        return [update for update in updates if update]
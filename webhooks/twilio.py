@@ -0,0 +1,47 @@
+import base64
+import hashlib
+import hmac
+from typing import Any, Dict, List, Mapping
+from urllib.parse import parse_qsl
+
+from enums.notification_status import NotificationStatus
+from webhooks.base import ProviderStatusUpdate, WebhookParser
+
+SIGNATURE_HEADER = "x-twilio-signature"
+
+
+class TwilioWebhookParser(WebhookParser):
+    """
+    Twilio status callbacks: a form-encoded body per message, posted to the
+    StatusCallback URL we set, which carries our request ID as `?request_id=`.
+    Signed with base64 HMAC-SHA1 of the URL plus the sorted form parameters,
+    keyed by the account's `auth_token`.
+    """
+
+    STATUS_MAP = {
+        "queued": NotificationStatus.ACCEPTED,
+        "sent": NotificationStatus.ACCEPTED,
+        "delivered": NotificationStatus.DELIVERED,
+        "read": NotificationStatus.READ,
+        "undelivered": NotificationStatus.REJECTED,
+        "failed": NotificationStatus.REJECTED,
+    }
+
+    def verify(self, config: Dict[str, Any], headers: Mapping[str, str], body: bytes, url: str) -> bool:
+        token, signature = config.get("auth_token"), headers.get(SIGNATURE_HEADER)
+        if not token or not signature:
+            return False
+        params = sorted(parse_qsl(body.decode("utf-8"), keep_blank_values=True))
+        signed = url + "".join(key + value for key, value in params)
+        expected = base64.b64encode(hmac.new(token.encode("utf-8"), signed.encode("utf-8"), hashlib.sha1).digest())
+        return hmac.compare_digest(expected.decode("ascii"), signature)
+
+    def parse(self, headers: Mapping[str, str], body: bytes, query: Mapping[str, str]) -> List[ProviderStatusUpdate]:
+        form = dict(parse_qsl(body.decode("utf-8"), keep_blank_values=True))
+        error = form.get("ErrorCode")
+        update = self.to_update(
+            query.get("request_id"),
+            form.get("MessageStatus") or form.get("SmsStatus"),
+            f"Twilio error {error}" if error else None,
+        )
+        return [update] if update else []
@@ -0,0 +1,124 @@
+import json
+import logging
+import random
+from collections import Counter
+from typing import Optional, Tuple
+
+from fastapi import WebSocket, status
+
+from config.client import ConfigClient
+from utils.loop_monitor import loop_monitor
+from utils.metrics import metrics
+from utils.token_bucket import TokenBucket
+
+MAX_HANDSHAKES: int = int(ConfigClient.get_property("MAX_CONCURRENT_HANDSHAKES", section="ADMISSION"))
+# 0 leaves the number of connections per client uncapped.
+MAX_CONNECTIONS_PER_CLIENT: int = int(ConfigClient.get_property("MAX_CONNECTIONS_PER_CLIENT", section="ADMISSION"))
+ACCEPT_RATE_PER_SEC: float = float(ConfigClient.get_property("ACCEPT_RATE_PER_SEC", section="ADMISSION"))
+ACCEPT_BURST: float = float(ConfigClient.get_property("ACCEPT_BURST", section="ADMISSION"))
+MAX_LOOP_LAG_MS: float = float(ConfigClient.get_property("MAX_LOOP_LAG_MS", section="ADMISSION"))
+RETRY_AFTER_SEC: float = float(ConfigClient.get_property("RETRY_AFTER_SEC", section="ADMISSION"))
+
+# Rejection reasons, as sent to the client and used in metric names.
+TOO_MANY_HANDSHAKES = "too_many_handshakes"
+CLIENT_CONNECTION_CAP = "client_connection_cap"
+RATE_LIMITED = "rate_limited"
+OVERLOADED = "overloaded"
+
+logger = logging.getLogger(__name__)
+
+_accept_bucket = TokenBucket(ACCEPT_RATE_PER_SEC, ACCEPT_BURST)
+_handshakes = 0
+_client_connections: Counter = Counter()
+
+
+class Ticket:
+    """
+    An admitted connection. Holds a handshake slot until `finish_handshake` and
+    a slot under the client's connection cap until `release`; both are idempotent.
+    """
+
+    def __init__(self, client_key: str):
+        self.client_key = client_key
+        self._handshaking = True
+        self._released = False
+
+    def finish_handshake(self) -> None:
+        global _handshakes
+        if self._handshaking:
+            self._handshaking = False
+            _handshakes -= 1
+            metrics.set_gauge("admission_handshakes_in_progress", _handshakes)
+
+    def release(self) -> None:
+        self.finish_handshake()
+        if not self._released:
+            self._released = True
+            _client_connections[self.client_key] -= 1
+            if _client_connections[self.client_key] <= 0:
+                del _client_connections[self.client_key]
+
+
+def _rejection(client_key: str) -> Optional[str]:
+    # Cheapest and most global checks first; the token is taken last, so a
+    # connection turned away for another reason does not use up the rate.
+    if MAX_LOOP_LAG_MS and loop_monitor.lag_ms > MAX_LOOP_LAG_MS:
+        return OVERLOADED
+    if _handshakes >= MAX_HANDSHAKES:
+        return TOO_MANY_HANDSHAKES
+    if MAX_CONNECTIONS_PER_CLIENT and _client_connections[client_key] >= MAX_CONNECTIONS_PER_CLIENT:
+        return CLIENT_CONNECTION_CAP
+    if not _accept_bucket.try_acquire():
+        return RATE_LIMITED
+    return None
+
+
+def admit(client_key: str) -> Tuple[Optional[Ticket], Optional[str]]:
+    """
+    Decide, before any database or Redis work, whether a new connection of
+    `client_key` may proceed. Connections are turned away while the event loop
+    lags more than MAX_LOOP_LAG_MS, while MAX_CONCURRENT_HANDSHAKES handshakes
+    are in progress, once the client has MAX_CONNECTIONS_PER_CLIENT open
+    connections on this node, or beyond ACCEPT_RATE_PER_SEC (bursts up to
+    ACCEPT_BURST).
+
+    Returns:
+        Tuple[Optional[Ticket], Optional[str]]: The ticket of an admitted
+        connection, or None and the reason it was rejected.
+    """
+    global _handshakes
+    reason = _rejection(client_key)
+    if reason is not None:
+        metrics.inc("admission_rejected")
+        metrics.inc(f"admission_rejected_{reason}")
+        return None, reason
+    _handshakes += 1
+    _client_connections[client_key] += 1
+    metrics.set_gauge("admission_handshakes_in_progress", _handshakes)
+    metrics.inc("admission_accepted")
+    return Ticket(client_key), None
+
+
+def retry_after(reason: str) -> int:
+    """
+    Seconds a rejected client should wait before reconnecting: RETRY_AFTER_SEC,
+    or longer if the accept rate needs it, doubled at most by random jitter so
+    that clients turned away together do not come back together.
+    """
+    base = RETRY_AFTER_SEC
+    if reason == RATE_LIMITED:
+        base = max(base, _accept_bucket.wait_time())
+    return max(round(base * (1 + random.random())), 1)
+
+
+async def reject(websocket: WebSocket, reason: str) -> None:
+    """
+    Turn a connection away with close code 1013 (try again later) and a JSON
+    reason such as `{"reason":"rate_limited","retry_after":7}`. The socket is
+    accepted first, since a close before the handshake carries no reason.
+    """
+    await websocket.accept()
+    await websocket.close(
+        code=status.WS_1013_TRY_AGAIN_LATER,
+        reason=json.dumps({"reason": reason, "retry_after": retry_after(reason)}, separators=(",", ":")),
+    )
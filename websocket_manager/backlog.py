@@ -0,0 +1,179 @@
+import logging
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from config.client import ConfigClient
+from db.session import async_session
+from redis_client.client import get_binary_redis_client, get_redis_client
+from repository.request import RequestDAO
+from utils.helpers import get_group_name, get_stream_key
+from utils.metrics import metrics
+from websocket_manager import shards
+from websocket_manager.entry_codec import decode_entry
+from websocket_manager.frames import build_summary_frame
+from websocket_manager.lifecycle import record_delivered, record_read
+from websocket_manager.payloads import resolve_frames
+from websocket_manager.streams import (
+    SHARDED,
+    acknowledge_notifications_bulk,
+    missed_chunks,
+    save_server_cursor,
+)
+from websocket_manager.unread import adjust_unread
+
+GROUP_NAME: str = get_group_name()
+# Reconnects with more missed notifications than this get a summary instead of a
+# replay; 0 always replays.
+SUMMARY_THRESHOLD: int = int(ConfigClient.get_property("SUMMARY_THRESHOLD", section="BACKLOG"))
+LATEST_ITEMS: int = int(ConfigClient.get_property("LATEST_ITEMS", section="BACKLOG"))
+BULK_ACK: bool = ConfigClient.get_property("BULK_ACK", section="BACKLOG").lower() == "true"
+
+logger = logging.getLogger(__name__)
+redis_client = get_redis_client()
+binary_redis_client = get_binary_redis_client()
+
+Entry = Tuple[str, Dict[str, Any]]
+
+
+async def _count_after(stream_key: str, start_id: str, limit: int) -> int:
+    """
+    Number of entries after `start_id`, counting no further than `limit`.
+    """
+    return len(await binary_redis_client.xrange(stream_key, min=f"({start_id}", count=limit))
+
+
+async def backlog_size(user_id: str, after_id: Optional[str], cursor_mode: bool) -> int:
+    """
+    How many notifications a reconnecting user missed, from counters Redis keeps
+    rather than by reading the entries. Where only a scan can tell (entries after
+    a cursor, or a group without a lag), the count stops past SUMMARY_THRESHOLD.
+    In group mode, pending entries up to `after_id` are counted too.
+    """
+    if SHARDED:
+        return await shards.count_indexed(user_id, after_id)
+    stream_key = get_stream_key(user_id)
+    if cursor_mode:
+        if after_id is None:
+            return await redis_client.xlen(stream_key)
+        return await _count_after(stream_key, after_id, SUMMARY_THRESHOLD + 1)
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.xpending(stream_key, GROUP_NAME)
+        pipe.xinfo_groups(stream_key)
+        pending, groups = await pipe.execute(raise_on_error=False)
+    if isinstance(pending, Exception) or isinstance(groups, Exception):
+        return 0  # no stream or group yet, so nothing was missed
+    size = next((int(c["pending"]) for c in pending["consumers"] if c["name"] == user_id), 0)
+    group = next((g for g in groups if g["name"] == GROUP_NAME), None)
+    if group is not None:
+        # `lag` is unknown before Redis 7 and after some deletions.
+        if group.get("lag") is not None:
+            size += int(group["lag"])
+        else:
+            size += await _count_after(stream_key, group["last-delivered-id"], SUMMARY_THRESHOLD + 1)
+    return size
+
+
+async def summarize_backlog(
+    user_id: str, websocket, client_id: str, after_id: Optional[str], cursor_mode: bool
+) -> Optional[str]:
+    """
+    Send a user whose backlog exceeds SUMMARY_THRESHOLD one summary frame instead
+    of replaying it: the number missed per notification type, the latest
+    LATEST_ITEMS as delivery frames, and an inbox cursor to page back from.
+
+    The missed entries are read in chunks to count them, but only the latest are
+    resolved and sent, so the cost on the socket is one frame however long the
+    backlog; reading it is bounded by the stream length cap. Older entries stay
+    pending for the inbox, or, with BULK_ACK, are acknowledged like acks from
+    the client: their requests move to READ, and the unread counter and read
+    events follow. Cursor-mode clients resume after the newest entry.
+
+    Returns:
+        Optional[str]: ID of the newest entry summarized, or None if the backlog
+        is small enough to replay and nothing was sent.
+    """
+    if not SUMMARY_THRESHOLD or await backlog_size(user_id, after_id, cursor_mode) <= SUMMARY_THRESHOLD:
+        return None
+
+    counts: Counter = Counter()
+    latest: Deque[Entry] = deque(maxlen=LATEST_ITEMS)
+    older: List[str] = []
+    async for chunk in missed_chunks(user_id, after_id, cursor_mode):
+        for entry in chunk:
+            counts[entry[1].get("t", "unknown")] += 1
+            if len(latest) == latest.maxlen:
+                older.append(latest[0][0])
+            latest.append(entry)
+    if not latest:
+        return None
+
+    frames = await resolve_frames(list(latest))
+    latest_ids = [msg_id for msg_id, _frame in frames]
+    inbox_cursor = latest_ids[0] if latest_ids else None
+    await websocket.send_text(
+        build_summary_frame(sum(counts.values()), dict(counts), inbox_cursor, [frame for _id, frame in reversed(frames)])
+    )
+    await record_delivered(client_id, user_id, latest_ids)
+    metrics.inc("backlog_summaries_sent")
+    metrics.inc("backlog_notifications_summarized", len(older))
+
+    newest_id = latest[-1][0]
+    if cursor_mode:
+        await save_server_cursor(client_id, user_id, newest_id)
+    elif BULK_ACK and older:
+        await _bulk_acknowledge(client_id, user_id, older)
+    return newest_id
+
+
+async def _bulk_acknowledge(client_id: str, user_id: str, message_ids: List[str]) -> None:
+    """
+    Acknowledge summarized entries the way the ack flush does: XACK them and move
+    their requests to READ, then lower the unread counter and record read events.
+    Errors are logged; entries left pending stay in the inbox and can be acked later.
+    """
+    try:
+        acknowledged = (await acknowledge_notifications_bulk({user_id: message_ids})).get(user_id, 0)
+        async with async_session() as session:
+            await RequestDAO(session).mark_acknowledged(UUID(client_id), [(user_id, message_id) for message_id in message_ids])
+    except Exception as exc:
+        logger.error("Error bulk acknowledging %d summarized entries of %s: %s", len(message_ids), user_id, exc)
+        return
+    metrics.inc("backlog_notifications_bulk_acknowledged", acknowledged)
+    if not acknowledged:
+        return
+    try:
+        await adjust_unread(client_id, user_id, -acknowledged)
+        await record_read(client_id, {user_id: message_ids})
+    except Exception as exc:
+        logger.error("Error updating unread counter after bulk acknowledging entries of %s: %s", user_id, exc)
+
+
+async def get_inbox_page(user_id: str, limit: int, before_id: Optional[str] = None) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    One page of a user's notifications, newest first, before `before_id` if given.
+    Per-user streams list every entry they still hold, acknowledged or not; the
+    sharded layout lists the unacknowledged entries in the user's index.
+
+    Returns:
+        Tuple[List[Tuple[str, str]], Optional[str]]: (message ID, delivery frame)
+        pairs, and the cursor for the next page, or None on the last page.
+    """
+    if SHARDED:
+        entries = await shards.get_indexed_entries_before(user_id, limit, before_id)
+        next_cursor = entries[-1][0] if len(entries) == limit else None
+        return await resolve_frames(entries), next_cursor
+
+    messages = await binary_redis_client.xrevrange(
+        get_stream_key(user_id), max=f"({before_id}" if before_id else "+", count=limit
+    )
+    entries: List[Entry] = []
+    for msg_id, raw in messages:
+        try:
+            entries.append((msg_id.decode(), decode_entry(raw)))
+        except ValueError as exc:
+            logger.error("Skipping undecodable stream entry %s: %s", msg_id, exc)
+    # Page on what was read, so undecodable entries do not end the listing early.
+    next_cursor = messages[-1][0].decode() if len(messages) == limit else None
+    return await resolve_frames(entries), next_cursor
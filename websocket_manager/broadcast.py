@@ -0,0 +1,137 @@
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import WebSocket
+
+from config.client import ConfigClient
+from db.session import async_session
+from redis_client.client import get_binary_redis_client
+from repository.receiver import ReceiverDAO
+from utils.helpers import get_broadcast_stream_key
+from utils.metrics import metrics
+from websocket_manager import heartbeat
+from websocket_manager.connection_manager import manager
+from websocket_manager.entry_codec import decode_entry, encode_entry
+from websocket_manager.frames import build_broadcast_frame, escape_json_string
+
+MAX_STREAM_LENGTH: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", section="BROADCAST"))
+READ_COUNT: int = int(ConfigClient.get_property("READ_COUNT", section="BROADCAST"))
+BLOCK_MS: int = int(ConfigClient.get_property("BLOCK_MS", section="BROADCAST"))
+FANOUT_BATCH_SIZE: int = int(ConfigClient.get_property("FANOUT_BATCH_SIZE", section="BROADCAST"))
+SEND_TIMEOUT_SEC: float = float(ConfigClient.get_property("SEND_TIMEOUT_SEC", section="BROADCAST"))
+SEGMENT_QUERY_BATCH_SIZE: int = int(ConfigClient.get_property("SEGMENT_QUERY_BATCH_SIZE", section="BROADCAST"))
+
+logger = logging.getLogger(__name__)
+binary_redis_client = get_binary_redis_client()
+
+
+async def publish_broadcast(
+    message: str,
+    client_id: Optional[str] = None,
+    segment: Optional[Dict[str, Any]] = None,
+    notification_type: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Broadcast a notification to the sockets on every node by writing one entry
+    to the shared broadcast stream: to all sockets, to those of `client_id`, or
+    to those of its users whose receiver `meta_data` contains `segment`. The
+    message is stored already escaped for the delivery frame.
+    Returns the stream entry ID, or None if the entry could not be added.
+    """
+    fields: Dict[str, Any] = {"f": escape_json_string(message), "timestamp": time.time()}
+    if client_id:
+        fields["c"] = client_id
+    if segment:
+        fields["s"] = json.dumps(segment, separators=(",", ":"))
+    if notification_type:
+        fields["t"] = notification_type
+    stream_key = get_broadcast_stream_key()
+    try:
+        msg_id = await binary_redis_client.xadd(
+            stream_key, encode_entry(fields), maxlen=MAX_STREAM_LENGTH, approximate=True
+        )
+        logger.info("[Redis Publisher] Added broadcast for client %s, segment %s (id: %s)", client_id or "*", segment, msg_id)
+        return msg_id.decode()
+    except Exception as exc:
+        logger.error("Error adding broadcast to stream %s: %s", stream_key, exc)
+        return None
+
+
+async def _segment_user_ids(client_id: str, segment: Dict[str, Any]) -> List[str]:
+    """
+    The users of `client_id` connected to this node who are in `segment`,
+    checked SEGMENT_QUERY_BATCH_SIZE users per query.
+    """
+    user_ids = await manager.client_user_ids(client_id)
+    matched: List[str] = []
+    async with async_session() as session:
+        receiver_dao = ReceiverDAO(session)
+        for start in range(0, len(user_ids), SEGMENT_QUERY_BATCH_SIZE):
+            batch = user_ids[start:start + SEGMENT_QUERY_BATCH_SIZE]
+            matched.extend(await receiver_dao.get_user_ids_in_segment(UUID(client_id), batch, segment))
+    return matched
+
+
+async def deliver_broadcast(msg_id: str, data: Dict[str, Any]) -> int:
+    """
+    Write one broadcast entry to the matching sockets on this node. The frame is
+    encoded once and sent FANOUT_BATCH_SIZE sockets at a time in parallel.
+    Sockets that could not take it within SEND_TIMEOUT_SEC are reaped.
+
+    Returns:
+        int: Number of sockets the frame was written to.
+    """
+    client_id = data.get("c") or None
+    user_ids = None
+    if data.get("s"):
+        if not client_id:
+            logger.error("Skipping broadcast %s: a segment needs a client", msg_id)
+            return 0
+        user_ids = await _segment_user_ids(client_id, json.loads(data["s"]))
+        if not user_ids:
+            return 0
+    frame = build_broadcast_frame(msg_id, data["f"])
+    return await manager.broadcast(
+        frame, client_id, user_ids, FANOUT_BATCH_SIZE, SEND_TIMEOUT_SEC, on_timeout=_reap_unwritable
+    )
+
+
+async def _reap_unwritable(websocket: WebSocket) -> None:
+    await heartbeat.reap_websocket(websocket, "unwritable")
+
+
+async def consume_broadcasts() -> None:
+    """
+    Follow the broadcast stream from its current end and deliver each entry to
+    the matching sockets on this node. Every node reads every entry with plain
+    XREAD, so a broadcast costs one stream write however many nodes and sockets
+    receive it. Entries published while a node is not reading are not delivered
+    by it later. Returns only by raising, so the caller can retry.
+    """
+    stream_key = get_broadcast_stream_key()
+    latest = await binary_redis_client.xrevrange(stream_key, count=1)
+    last_id = latest[0][0].decode() if latest else "0-0"
+    while True:
+        response = await binary_redis_client.xread({stream_key: last_id}, count=READ_COUNT, block=BLOCK_MS)
+        if not response:
+            continue
+        messages = response[0][1]
+        last_id = messages[-1][0].decode()
+        for msg_id, raw in messages:
+            try:
+                data = decode_entry(raw)
+            except ValueError as exc:
+                logger.error("Skipping undecodable broadcast entry %s: %s", msg_id, exc)
+                continue
+            started = time.monotonic()
+            try:
+                sent = await deliver_broadcast(msg_id.decode(), data)
+            except Exception as exc:
+                logger.error("Error delivering broadcast %s: %s", msg_id, exc)
+                continue
+            metrics.inc("broadcasts_delivered")
+            metrics.inc("broadcast_frames_sent", sent)
+            logger.info("Broadcast %s sent to %d sockets in %.0fms", msg_id, sent, (time.monotonic() - started) * 1000)
@@ -1,35 +1,160 @@
-from typing import Dict, List
+from typing import Awaitable, Callable, Collection, Dict, List, Optional
 from fastapi import WebSocket
 from collections import defaultdict
 import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = defaultdict(list)
+        # One stream reader per user on this node, shared by all of the user's sockets.
+        self.listeners: Dict[str, asyncio.Task] = {}
+        # Tasks serving one socket (its receive loop, a cursor-mode reader), cancelled with it.
+        self.socket_tasks: Dict[WebSocket, List[asyncio.Task]] = {}
+        # The client each socket connected for, to narrow broadcasts by client.
+        self.socket_clients: Dict[WebSocket, str] = {}
+        # When each socket connected, as a Unix time, to tell which sockets were
+        # around for a given delivery.
+        self.socket_connected_at: Dict[WebSocket, float] = {}
         self.lock = asyncio.Lock()
 
-    async def connect(self, websocket: WebSocket, user_id: str):
+    async def connect(self, websocket: WebSocket, user_id: str, client_id: Optional[str] = None):
         await websocket.accept()
         async with self.lock:
             self.active_connections[user_id].append(websocket)
+            self.socket_connected_at[websocket] = time.time()
+            if client_id is not None:
+                self.socket_clients[websocket] = client_id
+
+    async def disconnect(self, websocket: WebSocket, user_id: str) -> List[asyncio.Task]:
+        """
+        Remove a socket and cancel its tasks, and the user's listener with the
+        user's last socket. Safe to call more than once.
 
-    async def disconnect(self, websocket: WebSocket, user_id: str):
+        Returns:
+            List[asyncio.Task]: The tasks cancelled, for the caller to await.
+        """
+        cancelled = []
         async with self.lock:
-            if websocket in self.active_connections[user_id]:
+            if websocket in self.active_connections.get(user_id, []):
                 self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
+            if user_id in self.active_connections and not self.active_connections[user_id]:
                 del self.active_connections[user_id]
+                listener = self.listeners.pop(user_id, None)
+                if listener is not None:
+                    cancelled.append(listener)
+            cancelled.extend(self.socket_tasks.pop(websocket, []))
+            self.socket_clients.pop(websocket, None)
+            self.socket_connected_at.pop(websocket, None)
+        current = asyncio.current_task()
+        cancelled = [task for task in cancelled if task is not current and not task.done()]
+        for task in cancelled:
+            task.cancel()
+        return cancelled
+
+    def track_task(self, websocket: WebSocket, task: asyncio.Task) -> None:
+        self.socket_tasks.setdefault(websocket, []).append(task)
 
-    async def send_personal_message(self, message: str, user_id: str):
+    def has_listener(self, user_id: str) -> bool:
+        return user_id in self.listeners
+
+    async def ensure_listener(self, user_id: str, listen: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Start `listen()` as the user's reader unless one is already running.
+        The reader is cancelled when the user's last socket disconnects.
+
+        Returns:
+            bool: Whether a new reader was started.
+        """
         async with self.lock:
-            for connection in self.active_connections.get(user_id, []):
-                await connection.send_text(message)
+            if user_id in self.listeners or user_id not in self.active_connections:
+                return False
+            self.listeners[user_id] = asyncio.create_task(listen(), name=f"listener:{user_id}")
+            return True
+
+    async def send_personal_message(self, message: str, user_id: str, client_id: Optional[str] = None) -> int:
+        """
+        Send a frame to every socket of a user at once, or only to those connected
+        for `client_id`; a socket that fails is logged and left to its own
+        connection handler to clean up.
+
+        Returns:
+            int: Number of sockets the frame was written to.
+        """
+        async with self.lock:
+            connections = [
+                connection
+                for connection in self.active_connections.get(user_id, [])
+                if client_id is None or self.socket_clients.get(connection) == client_id
+            ]
+        results = await asyncio.gather(*(c.send_text(message) for c in connections), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Error sending to a socket of user %s: %s", user_id, result)
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    async def client_user_ids(self, client_id: str) -> List[str]:
+        """
+        The users with a socket of `client_id` on this node.
+        """
+        async with self.lock:
+            return [
+                user_id
+                for user_id, connections in self.active_connections.items()
+                if any(self.socket_clients.get(connection) == client_id for connection in connections)
+            ]
+
+    async def broadcast(
+        self,
+        message: str,
+        client_id: Optional[str] = None,
+        user_ids: Optional[Collection[str]] = None,
+        batch_size: int = 1000,
+        send_timeout_sec: float = 5,
+        on_timeout: Optional[Callable[[WebSocket], Awaitable[None]]] = None,
+    ) -> int:
+        """
+        Send a frame to every socket on this node, or only to those of `client_id`
+        and/or `user_ids`. The sockets are listed under the lock, then written to
+        outside it, `batch_size` at a time in parallel. Writes still running
+        `send_timeout_sec` after their batch started are cancelled, so one slow
+        client cannot hold up the rest. A cancelled write may leave part of a frame
+        on its socket, so once every batch is sent, `on_timeout` is awaited for each
+        such socket to drop it.
 
-    async def broadcast(self, message: str):
+        Returns:
+            int: Number of sockets the frame was written to.
+        """
         async with self.lock:
-            for connections in self.active_connections.values():
-                for connection in connections:
-                    await connection.send_text(message)
+            users = self.active_connections if user_ids is None else {
+                user_id: self.active_connections[user_id] for user_id in user_ids if user_id in self.active_connections
+            }
+            connections = [
+                connection
+                for user_connections in users.values()
+                for connection in user_connections
+                if client_id is None or self.socket_clients.get(connection) == client_id
+            ]
+        sent = 0
+        timed_out: List[WebSocket] = []
+        for start in range(0, len(connections), batch_size):
+            batch = connections[start:start + batch_size]
+            # One timeout per batch rather than a timer per socket.
+            tasks = [asyncio.create_task(c.send_text(message)) for c in batch]
+            done, pending = await asyncio.wait(tasks, timeout=send_timeout_sec)
+            for task in pending:
+                task.cancel()
+            timed_out.extend(connection for connection, task in zip(batch, tasks) if task in pending)
+            written = sum(1 for task in done if task.exception() is None)
+            if written < len(tasks):
+                logger.debug("Broadcast frame not written to %d of %d sockets", len(tasks) - written, len(tasks))
+            sent += written
+        if timed_out and on_timeout is not None:
+            await asyncio.gather(*(on_timeout(connection) for connection in timed_out), return_exceptions=True)
+        return sent
 
 # Singleton manager instance
 manager = ConnectionManager()
@@ -0,0 +1,89 @@
+import logging
+from typing import Any, Dict, Mapping, Union
+
+from config.client import ConfigClient
+
+try:
+    import msgpack
+except ImportError:  # optional: entries are written as text fields without it
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional: msgpack entries are left uncompressed without it
+    zstandard = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+MSGPACK_ZSTD = "msgpack+zstd"
+
+CONFIGURED_CODEC: str = ConfigClient.get_property("CODEC", section="ENTRY_CODEC").lower()
+COMPRESS_MIN_BYTES: int = int(ConfigClient.get_property("COMPRESS_MIN_BYTES", section="ENTRY_CODEC"))
+ZSTD_LEVEL: int = int(ConfigClient.get_property("ZSTD_LEVEL", section="ENTRY_CODEC"))
+
+# Binary entries keep all their fields in one value under DATA_FIELD, whose first
+# byte is the format version. Entries without it are the original text layout
+# (version 0), so every entry still decodes whichever codec is configured now.
+DATA_FIELD = b"d"
+VERSION_MSGPACK = 1
+VERSION_MSGPACK_ZSTD = 2
+
+logger = logging.getLogger(__name__)
+
+_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL) if zstandard is not None else None
+_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+
+def resolve_codec(codec: str) -> str:
+    """
+    The codec actually usable for `codec`, stepping down when an optional
+    dependency is not installed.
+    """
+    if codec not in (JSON, MSGPACK, MSGPACK_ZSTD):
+        raise ValueError(f"Unsupported entry codec '{codec}', expected '{JSON}', '{MSGPACK}' or '{MSGPACK_ZSTD}'")
+    if codec != JSON and msgpack is None:
+        logger.warning("msgpack is not installed; writing stream entries as '%s'", JSON)
+        return JSON
+    if codec == MSGPACK_ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed; writing stream entries as '%s'", MSGPACK)
+        return MSGPACK
+    return codec
+
+
+ENTRY_CODEC: str = resolve_codec(CONFIGURED_CODEC)
+
+
+def encode_entry(fields: Dict[str, Any], codec: str = ENTRY_CODEC) -> Dict[str, Union[str, bytes]]:
+    """
+    Encode a stream entry's fields with `codec`. With `msgpack+zstd`, only entries
+    of at least `COMPRESS_MIN_BYTES` packed bytes are compressed.
+    """
+    if codec == JSON:
+        return {name: str(value) for name, value in fields.items()}
+    packed = msgpack.packb(fields, use_bin_type=True)
+    if codec == MSGPACK_ZSTD and len(packed) >= COMPRESS_MIN_BYTES:
+        return {DATA_FIELD.decode(): bytes([VERSION_MSGPACK_ZSTD]) + _compressor.compress(packed)}
+    return {DATA_FIELD.decode(): bytes([VERSION_MSGPACK]) + packed}
+
+
+def decode_entry(raw: Mapping[bytes, bytes]) -> Dict[str, Any]:
+    """
+    Decode the fields of an entry read with the binary Redis client, whatever
+    version it was written with.
+
+    Raises:
+        ValueError: If the entry has an unknown version, or needs a codec that is not installed.
+    """
+    data = raw.get(DATA_FIELD)
+    if data is None:
+        return {name.decode(): value.decode() for name, value in raw.items()}
+    version, body = data[0], data[1:]
+    if msgpack is None:
+        raise ValueError("msgpack is required to decode binary stream entries")
+    if version == VERSION_MSGPACK_ZSTD:
+        if _decompressor is None:
+            raise ValueError("zstandard is required to decode compressed stream entries")
+        body = _decompressor.decompress(body)
+    elif version != VERSION_MSGPACK:
+        raise ValueError(f"Unknown stream entry version {version}")
+    return msgpack.unpackb(body, raw=False)
@@ -0,0 +1,62 @@
+import json
+from typing import Dict, List, Optional
+
+# Delivery frames are built by concatenating pre-escaped text, so a notification
+# is JSON-encoded once, when it is published, rather than once per socket. The
+# output is byte-for-byte what `websocket.send_json` would produce:
+#     {"message_id":"<stream entry ID>","message":"<notification JSON, as a string>"}
+_FRAME_HEAD = '{"message_id":"'
+_FRAME_MIDDLE = '","message":"'
+_FRAME_END = '"}'
+
+
+def escape_json_string(text: str) -> str:
+    """
+    `text` escaped for use inside a JSON string literal, without the quotes.
+    Escaping is applied per character, so escaping parts and concatenating them
+    equals escaping the whole.
+    """
+    return json.dumps(text, ensure_ascii=False)[1:-1]
+
+
+def build_frame(message_id: str, escaped_message: str) -> str:
+    """
+    The delivery frame for a stream entry. Entry IDs (`<ms>-<seq>`) never need escaping.
+    """
+    return _FRAME_HEAD + message_id + _FRAME_MIDDLE + escaped_message + _FRAME_END
+
+
+def build_summary_frame(total: int, counts: Dict[str, int], inbox_cursor: Optional[str], frames: List[str]) -> str:
+    """
+    The backlog summary sent instead of replaying a long backlog. The latest
+    notifications are spliced in as their delivery frames, already encoded.
+    """
+    return (
+        '{"type":"backlog_summary","total":' + str(total)
+        + ',"counts":' + json.dumps(counts, separators=(",", ":"), ensure_ascii=False)
+        + ',"inbox_cursor":' + json.dumps(inbox_cursor)
+        + ',"latest":[' + ",".join(frames) + "]}"
+    )
+
+
+def build_inbox_frame(frames: List[str], next_cursor: Optional[str]) -> str:
+    """
+    One page of older notifications, sent in reply to a `fetch_more` message.
+    """
+    return '{"type":"inbox","items":[' + ",".join(frames) + '],"next_cursor":' + json.dumps(next_cursor) + "}"
+
+
+def build_topic_frame(topic: str, message_id: str, escaped_message: str) -> str:
+    """
+    The delivery frame for a topic entry: the usual delivery frame plus its type
+    and topic. Built once per entry and written to every subscribed socket.
+    """
+    return '{"type":"topic","topic":"' + escape_json_string(topic) + '",' + build_frame(message_id, escaped_message)[1:]
+
+
+def build_broadcast_frame(message_id: str, escaped_message: str) -> str:
+    """
+    The delivery frame for a broadcast entry: the usual delivery frame plus its
+    type. Built once per entry and node, whatever the number of sockets.
+    """
+    return '{"type":"broadcast",' + build_frame(message_id, escaped_message)[1:]
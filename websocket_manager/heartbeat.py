@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from fastapi import WebSocket, status
+
+from config.client import ConfigClient
+from utils.metrics import metrics
+from utils.timer_wheel import TimerWheel
+from websocket_manager.connection_manager import manager
+
+PING_INTERVAL_SEC: float = float(ConfigClient.get_property("PING_INTERVAL_SEC", section="HEARTBEAT"))
+IDLE_TIMEOUT_SEC: float = float(ConfigClient.get_property("IDLE_TIMEOUT_SEC", section="HEARTBEAT"))
+TICK_SEC: float = float(ConfigClient.get_property("TICK_SEC", section="HEARTBEAT"))
+SEND_TIMEOUT_SEC: float = float(ConfigClient.get_property("SEND_TIMEOUT_SEC", section="HEARTBEAT"))
+
+# Text frame the server sends to a quiet socket; clients answer {"type": "pong"}.
+PING_FRAME = '{"type":"ping"}'
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Socket:
+    websocket: WebSocket
+    user_id: str
+    last_seen: float
+    pinged: bool = False
+
+
+_sockets: Dict[WebSocket, _Socket] = {}
+# One slot per tick up to the longest delay ever scheduled, plus the current one.
+_wheel: TimerWheel[WebSocket] = TimerWheel(TICK_SEC, math.ceil(max(PING_INTERVAL_SEC, IDLE_TIMEOUT_SEC) / TICK_SEC) + 1)
+_last_tick = time.monotonic()
+
+
+def register(websocket: WebSocket, user_id: str) -> None:
+    _sockets[websocket] = _Socket(websocket, user_id, time.monotonic())
+    _wheel.schedule(websocket, PING_INTERVAL_SEC)
+
+
+def unregister(websocket: WebSocket) -> None:
+    _sockets.pop(websocket, None)
+    _wheel.cancel(websocket)
+
+
+def touch(websocket: WebSocket) -> None:
+    """
+    Note that a frame arrived on the socket. Only a timestamp is written; the
+    sweeper reads it when the socket's check falls due.
+    """
+    socket = _sockets.get(websocket)
+    if socket is not None:
+        socket.last_seen = time.monotonic()
+        socket.pinged = False
+
+
+async def reap(socket: _Socket, reason: str) -> None:
+    """
+    Drop a dead socket: remove it from the connection registry, cancel and await
+    its tasks (and the user's listener if it was their last socket), then try
+    to close it, giving up after SEND_TIMEOUT_SEC on a half-open connection.
+    """
+    unregister(socket.websocket)
+    cancelled = await manager.disconnect(socket.websocket, socket.user_id)
+    await asyncio.gather(*cancelled, return_exceptions=True)
+    try:
+        await asyncio.wait_for(socket.websocket.close(code=status.WS_1001_GOING_AWAY), SEND_TIMEOUT_SEC)
+    except Exception as exc:
+        logger.debug("Error closing reaped socket of user %s: %s", socket.user_id, exc)
+    metrics.inc("heartbeat_sockets_reaped")
+    metrics.inc(f"heartbeat_sockets_reaped_{reason}")
+    logger.info("Reaped %s socket of user %s", reason, socket.user_id)
+
+
+async def reap_websocket(websocket: WebSocket, reason: str) -> None:
+    """
+    Reap a socket found dead outside the sweeper, such as one whose write had to
+    be cancelled midway and so may have left a partial frame on the connection.
+    """
+    socket = _sockets.get(websocket)
+    if socket is not None:
+        await reap(socket, reason)
+
+
+async def _check(socket: _Socket, now: float) -> None:
+    idle = now - socket.last_seen
+    if idle >= IDLE_TIMEOUT_SEC:
+        await reap(socket, "idle")
+        return
+    if idle >= PING_INTERVAL_SEC and not socket.pinged:
+        try:
+            await asyncio.wait_for(socket.websocket.send_text(PING_FRAME), SEND_TIMEOUT_SEC)
+        except Exception as exc:
+            logger.debug("Error pinging socket of user %s: %s", socket.user_id, exc)
+            await reap(socket, "unwritable")
+            return
+        socket.pinged = True
+        metrics.inc("heartbeat_pings_sent")
+    # Next due when a ping is owed, or else when the idle timeout runs out.
+    next_check = IDLE_TIMEOUT_SEC if socket.pinged else PING_INTERVAL_SEC
+    _wheel.schedule(socket.websocket, next_check - idle)
+
+
+async def sweep() -> None:
+    """
+    Advance the timer wheel by the ticks elapsed since the last sweep and check
+    the sockets that fell due: ping those quiet for PING_INTERVAL_SEC, and reap
+    those silent for IDLE_TIMEOUT_SEC, which the client's pong would have
+    prevented. Sockets that were active meanwhile are simply rescheduled.
+    """
+    global _last_tick
+    now = time.monotonic()
+    ticks = int((now - _last_tick) / TICK_SEC)
+    if not ticks:
+        return
+    _last_tick += ticks * TICK_SEC
+    due = [_sockets[websocket] for websocket in _wheel.advance(ticks) if websocket in _sockets]
+    if due:
+        await asyncio.gather(*(_check(socket, now) for socket in due))
+    metrics.set_gauge("heartbeat_sockets", len(_sockets))
@@ -0,0 +1,157 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from config.client import ConfigClient
+from db.session import async_session
+from redis_client.client import get_redis_client
+from repository.request import RequestDAO
+from schema.websocket import (
+    AckMessage,
+    FetchMoreMessage,
+    PingMessage,
+    SubscribeMessage,
+    UnsubscribeMessage,
+    inbound_message_adapter,
+)
+from utils.helpers import get_device_acks_key
+from utils.metrics import metrics
+from websocket_manager import topics
+from websocket_manager.backlog import get_inbox_page
+from websocket_manager.frames import build_inbox_frame
+from websocket_manager.lifecycle import record_read
+from websocket_manager.streams import acknowledge_notifications_bulk
+from websocket_manager.unread import adjust_unread_many
+
+INBOX_PAGE_SIZE: int = int(ConfigClient.get_property("INBOX_PAGE_SIZE", section="BACKLOG"))
+TRACK_DEVICE_ACKS: bool = ConfigClient.get_property("TRACK_ACKS", section="DEVICES").lower() == "true"
+DEVICE_ACKS_TTL_SEC: int = int(ConfigClient.get_property("TTL_SEC", section="DEVICES"))
+
+logger = logging.getLogger(__name__)
+redis_client = get_redis_client()
+
+# Acks received over this node's sockets since the last flush, as message IDs per
+# user, keyed by (client ID, whether the client is in cursor delivery mode).
+_pending_acks: Dict[Tuple[str, bool], Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+# With TRACK_DEVICE_ACKS, the newest message ID each device acked since the last
+# flush, by user ID and then device ID.
+_device_acks: Dict[str, Dict[str, str]] = defaultdict(dict)
+
+
+def _id_key(message_id: str) -> Tuple[int, int]:
+    ms, _, seq = message_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+async def handle_inbound_message(
+    text: str, websocket, client_id: str, user_id: str, cursor_mode: bool, device_id: Optional[str] = None
+) -> None:
+    """
+    Act on one text frame from a client:
+      - `{"type": "ack", "message_ids": [...]}` queues the IDs for the next ack flush;
+      - `{"type": "fetch_more", "before": ..., "limit": ...}` replies with an inbox page;
+      - `{"type": "ping"}` replies with `{"type": "pong"}`;
+      - `{"type": "pong"}` answers a server ping and needs no reply;
+      - `{"type": "subscribe" | "unsubscribe", "topics": [...]}` changes the
+        socket's topic subscriptions and replies with the ones it now has.
+    Anything else gets an error frame; the connection stays open.
+    """
+    try:
+        message = inbound_message_adapter.validate_json(text)
+    except ValidationError as exc:
+        metrics.inc("inbound_messages_invalid")
+        await websocket.send_json({
+            "type": "error",
+            "error": "invalid_message",
+            "detail": exc.errors(include_url=False, include_input=False, include_context=False),
+        })
+        return
+
+    if isinstance(message, AckMessage):
+        _pending_acks[(client_id, cursor_mode)][user_id].extend(message.message_ids)
+        if TRACK_DEVICE_ACKS and device_id:
+            newest = max(message.message_ids, key=_id_key)
+            current = _device_acks[user_id].get(device_id)
+            if current is None or _id_key(newest) > _id_key(current):
+                _device_acks[user_id][device_id] = newest
+    elif isinstance(message, FetchMoreMessage):
+        frames, next_cursor = await get_inbox_page(user_id, message.limit or INBOX_PAGE_SIZE, message.before)
+        await websocket.send_text(build_inbox_frame([frame for _msg_id, frame in frames], next_cursor))
+    elif isinstance(message, PingMessage):
+        await websocket.send_json({"type": "pong"})
+    elif isinstance(message, SubscribeMessage):
+        subscribed = topics.subscribe(websocket, client_id, message.topics)
+        if subscribed is None:
+            await websocket.send_json({"type": "error", "error": "too_many_subscriptions", "limit": topics.MAX_SUBSCRIPTIONS})
+            return
+        await websocket.send_json({"type": "subscriptions", "topics": subscribed})
+    elif isinstance(message, UnsubscribeMessage):
+        await websocket.send_json({"type": "subscriptions", "topics": topics.unsubscribe(websocket, message.topics)})
+    metrics.inc(f"inbound_{message.type}_messages")
+
+
+async def flush_acks() -> None:
+    """
+    Apply the acks queued since the last flush: one pipelined XACK round trip per
+    client, then the request records, batched like the bulk acknowledge endpoint
+    does, then the unread counters and read events.
+
+    The XACK and the request records go together: if either fails, the client's
+    acks are queued again for the next flush, which is safe as both are
+    idempotent. Counters missed that way are corrected by the unread
+    reconciler. Counter and read event updates are best effort and never hold
+    back the request records.
+    """
+    if _device_acks:
+        await _store_device_acks()
+    if not _pending_acks:
+        return
+    batches = list(_pending_acks.items())
+    _pending_acks.clear()
+
+    async with async_session() as session:
+        request_dao = RequestDAO(session)
+        for (client_id, cursor_mode), by_user in batches:
+            acks = {user_id: list(dict.fromkeys(message_ids)) for user_id, message_ids in by_user.items()}
+            entries = [(user_id, message_id) for user_id, message_ids in acks.items() for message_id in message_ids]
+            try:
+                if cursor_mode:
+                    # No consumer groups: count what the request records say was newly read.
+                    acknowledged = await request_dao.mark_acknowledged_by_user(UUID(client_id), entries)
+                else:
+                    acknowledged = await acknowledge_notifications_bulk(acks)
+                    await request_dao.mark_acknowledged(UUID(client_id), entries)
+            except Exception as exc:
+                logger.error("Error flushing %d acks of client %s, retrying on the next flush: %s", len(entries), client_id, exc)
+                metrics.inc("inbound_ack_flush_failures")
+                for user_id, message_ids in acks.items():
+                    _pending_acks[(client_id, cursor_mode)][user_id].extend(message_ids)
+                continue
+            try:
+                await adjust_unread_many(client_id, {user_id: -count for user_id, count in acknowledged.items()})
+                await record_read(client_id, {user_id: acks[user_id] for user_id, count in acknowledged.items() if count})
+            except Exception as exc:
+                logger.error("Error updating unread counters after %d acks of client %s: %s", len(entries), client_id, exc)
+            metrics.inc("inbound_acks_flushed", len(entries))
+
+
+async def _store_device_acks() -> None:
+    """
+    Record the newest message ID each device acked since the last flush, in one
+    hash per user mapping device ID to message ID, with one pipelined round trip.
+    A user's hash expires DEVICE_ACKS_TTL_SEC after their last device ack.
+    """
+    positions = dict(_device_acks)
+    _device_acks.clear()
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_id, devices in positions.items():
+                key = get_device_acks_key(user_id)
+                pipe.hset(key, mapping=devices)
+                pipe.expire(key, DEVICE_ACKS_TTL_SEC)
+            await pipe.execute()
+    except Exception as exc:
+        logger.error("Error storing device ack positions of %d users: %s", len(positions), exc)
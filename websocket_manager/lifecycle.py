@@ -0,0 +1,220 @@
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from config.client import ConfigClient
+from enums.lifecycle_event import LifecycleEvent
+from redis_client.client import get_redis_client
+from utils.helpers import get_latency_index_key, get_latency_key, get_lifecycle_group_name, get_lifecycle_stream_key
+from utils.histogram import LogHistogram
+from utils.metrics import metrics
+
+EVENTS_STREAM: str = get_lifecycle_stream_key()
+LATENCY_INDEX: str = get_latency_index_key()
+LIFECYCLE_GROUP: str = get_lifecycle_group_name()
+MAX_EVENTS: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", section="LIFECYCLE"))
+READ_COUNT: int = int(ConfigClient.get_property("READ_COUNT", section="LIFECYCLE"))
+BLOCK_MS: int = int(ConfigClient.get_property("BLOCK_MS", section="LIFECYCLE"))
+WINDOW_SEC: int = int(ConfigClient.get_property("WINDOW_SEC", section="LIFECYCLE"))
+RETENTION_SEC: int = int(ConfigClient.get_property("RETENTION_SEC", section="LIFECYCLE"))
+LOOKBACK_SEC: int = int(ConfigClient.get_property("LOOKBACK_SEC", section="LIFECYCLE"))
+
+# Latency stages. `queue` runs from the API call to the stream entry; the others
+# are measured from the stream entry onwards.
+QUEUE_STAGE = "queue"
+DELIVER_STAGE = "deliver"  # until the WebSocket frame was sent
+READ_STAGE = "read"  # until the user acknowledged it
+STAGES = (QUEUE_STAGE, DELIVER_STAGE, READ_STAGE)
+
+logger = logging.getLogger(__name__)
+redis_client = get_redis_client()
+
+Entry = Tuple[str, Dict[str, str]]
+# (client ID, stage, window start) -> histogram of latencies in milliseconds
+Histograms = Dict[Tuple[str, str, int], LogHistogram]
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def stream_id_ms(message_id: str) -> int:
+    return int(message_id.split("-", 1)[0])
+
+
+def _event(kind: LifecycleEvent, client_id: str, user_id: str, message_id: str, at_ms: int) -> Dict[str, str]:
+    # Short field names: the log holds one entry per notification per lifecycle step.
+    return {"e": kind.value, "c": client_id, "u": user_id, "m": message_id, "t": str(at_ms)}
+
+
+async def append_events(events: List[Dict[str, str]]) -> None:
+    """
+    Append lifecycle events to the shared event log in one pipelined round trip.
+
+    This sits on the delivery and acknowledgement paths, so failures are logged
+    and swallowed: losing a lifecycle event must never fail a notification.
+    """
+    if not events:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.xadd(EVENTS_STREAM, event, maxlen=MAX_EVENTS, approximate=True)
+            await pipe.execute()
+    except Exception as exc:
+        logger.error("Error appending %d lifecycle events: %s", len(events), exc)
+
+
+async def record_published(client_id: str, user_id: str, message_id: str, called_at_ms: int) -> None:
+    """
+    Record that a notification accepted by the API at `called_at_ms` was added to the user's stream.
+    """
+    await append_events([_event(LifecycleEvent.PUBLISHED, client_id, user_id, message_id, called_at_ms)])
+
+
+async def record_delivered(client_id: str, user_id: str, message_ids: List[str]) -> None:
+    """
+    Record that notifications were just written to one of the user's WebSockets.
+    """
+    at_ms = now_ms()
+    await append_events([
+        _event(LifecycleEvent.DELIVERED, client_id, user_id, message_id, at_ms) for message_id in message_ids
+    ])
+
+
+async def record_read(client_id: str, acks: Dict[str, List[str]]) -> None:
+    """
+    Record that users acknowledged notifications, given as message IDs keyed by user ID.
+    """
+    at_ms = now_ms()
+    await append_events([
+        _event(LifecycleEvent.READ, client_id, user_id, message_id, at_ms)
+        for user_id, message_ids in acks.items()
+        for message_id in message_ids
+    ])
+
+
+async def ensure_lifecycle_group() -> None:
+    try:
+        await redis_client.xgroup_create(EVENTS_STREAM, LIFECYCLE_GROUP, id="0", mkstream=True)
+    except Exception as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def read_events(consumer: str, start_id: str = ">") -> List[Entry]:
+    """
+    Read the next batch of lifecycle events for `consumer`; pass `start_id="0"`
+    to re-read the events it was given but never acknowledged.
+    """
+    response = await redis_client.xreadgroup(
+        LIFECYCLE_GROUP, consumer, {EVENTS_STREAM: start_id}, count=READ_COUNT, block=BLOCK_MS
+    )
+    return [entry for _stream, entries in response or [] for entry in entries]
+
+
+async def acknowledge_events(entry_ids: List[str]) -> None:
+    if entry_ids:
+        await redis_client.xack(EVENTS_STREAM, LIFECYCLE_GROUP, *entry_ids)
+
+
+def aggregate_events(entries: List[Entry]) -> Tuple[Histograms, Dict[str, List[Tuple[str, str]]]]:
+    """
+    Fold a batch of events into latency histograms and the deliveries to persist.
+
+    The publish time is the millisecond part of the notification's stream entry ID,
+    so every event carries enough to compute its own latency without a lookup.
+
+    Returns:
+        Tuple[Histograms, Dict[str, List[Tuple[str, str]]]]: Latency histograms per
+        (client, stage, window), and delivered (user ID, message ID) pairs per client ID.
+    """
+    histograms: Histograms = defaultdict(LogHistogram)
+    delivered: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for _entry_id, event in entries:
+        try:
+            kind = LifecycleEvent(event["e"])
+            client_id = str(UUID(event["c"]))
+            user_id = event["u"]
+            at_ms = int(event["t"])
+            latency_ms = at_ms - stream_id_ms(event["m"])
+        except (KeyError, ValueError) as exc:
+            # Skipped events are acknowledged with their batch, so one cannot stall the log.
+            logger.warning("Skipping malformed lifecycle event %s: %s", event, exc)
+            continue
+        window = at_ms // 1000 // WINDOW_SEC * WINDOW_SEC
+        if kind == LifecycleEvent.PUBLISHED:
+            # Stamped at the API call, before the stream entry existed.
+            histograms[(client_id, QUEUE_STAGE, window)].record(max(-latency_ms, 0))
+        elif kind == LifecycleEvent.DELIVERED:
+            histograms[(client_id, DELIVER_STAGE, window)].record(max(latency_ms, 0))
+            delivered[client_id].append((user_id, event["m"]))
+        elif kind == LifecycleEvent.READ:
+            histograms[(client_id, READ_STAGE, window)].record(max(latency_ms, 0))
+    return histograms, delivered
+
+
+async def store_latencies(histograms: Histograms) -> None:
+    """
+    Add batch histograms to the per-window histograms kept in Redis, one hash per
+    (client, stage, window) mapping bucket index to count. Clients are indexed in
+    a sorted set scored by their latest window, so summaries can name every key
+    they need instead of scanning for them.
+    """
+    if not histograms:
+        return
+    latest: Dict[str, int] = {}
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for (client_id, stage, window), histogram in histograms.items():
+            key = get_latency_key(client_id, stage, window)
+            for index, count in histogram.counts.items():
+                pipe.hincrby(key, str(index), count)
+            pipe.expire(key, RETENTION_SEC)
+            latest[client_id] = max(latest.get(client_id, window), window)
+        pipe.zadd(LATENCY_INDEX, latest, gt=True)
+        pipe.zremrangebyscore(LATENCY_INDEX, "-inf", f"({int(time.time()) - RETENTION_SEC}")
+        pipe.expire(LATENCY_INDEX, RETENTION_SEC)
+        await pipe.execute()
+
+
+async def latency_summary(client_id: Optional[str] = None, lookback_sec: int = LOOKBACK_SEC) -> Dict[str, Dict[str, Dict]]:
+    """
+    Latency percentiles per client and stage over the last `lookback_sec` seconds,
+    merged from the per-window histograms. The keys are built from the clients
+    with a window in that range, the stages and the windows, and read in one
+    pipelined round trip.
+
+    Returns:
+        Dict[str, Dict[str, Dict]]: {client ID: {stage: {"count", "p50", "p95", "p99"}}}, in milliseconds.
+    """
+    now = int(time.time())
+    oldest_window = (now - lookback_sec) // WINDOW_SEC * WINDOW_SEC
+    if client_id is not None:
+        client_ids = [client_id]
+    else:
+        client_ids = await redis_client.zrangebyscore(LATENCY_INDEX, oldest_window, "+inf")
+    keys = [
+        (get_latency_key(key_client, stage, window), key_client, stage)
+        for key_client in client_ids
+        for stage in STAGES
+        for window in range(oldest_window, now + 1, WINDOW_SEC)
+    ]
+
+    merged: Dict[Tuple[str, str], LogHistogram] = defaultdict(LogHistogram)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, _client, _stage in keys:
+            pipe.hgetall(key)
+        counts = await pipe.execute()
+    for (_key, key_client, stage), bucket_counts in zip(keys, counts):
+        if bucket_counts:
+            merged[(key_client, stage)].merge(LogHistogram(bucket_counts))
+
+    summary: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+    for (key_client, stage), histogram in merged.items():
+        summary[key_client][stage] = histogram.summary()
+    return dict(summary)
+
+
+metrics.register_collector("latency_ms", latency_summary)
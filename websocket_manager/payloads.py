@@ -0,0 +1,205 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.client import ConfigClient
+from db.session import async_session
+from redis_client.client import get_redis_client
+from repository.payload import PayloadDAO
+from schema.notification import NotificationRequestData
+from utils.helpers import get_payload_key
+from utils.lru import LRUCache
+from utils.metrics import metrics
+from websocket_manager.frames import build_frame, escape_json_string
+
+INLINE_MAX_BYTES: int = int(ConfigClient.get_property("INLINE_MAX_BYTES", section="PAYLOADS"))
+REDIS_TTL_SEC: int = int(ConfigClient.get_property("REDIS_TTL_SEC", section="PAYLOADS"))
+LRU_MAX_BYTES: int = int(ConfigClient.get_property("LRU_MAX_BYTES", section="PAYLOADS"))
+GC_GRACE_SEC: int = int(ConfigClient.get_property("GC_GRACE_SEC", section="PAYLOADS"))
+
+# Fields that differ between the recipients of otherwise identical notifications.
+VARIABLE_FIELDS = ("user_id",)
+
+logger = logging.getLogger(__name__)
+redis_client = get_redis_client()
+
+
+
+class _CachedTail:
+    """
+    A body's escaped frame tail (see `frame_tail`), and when this process last
+    stored the body, on the monotonic clock, or None if it was only read.
+    """
+
+    __slots__ = ("tail", "stored_at")
+
+    def __init__(self, tail: str, stored_at: Optional[float] = None):
+        self.tail = tail
+        self.stored_at = stored_at
+
+    def __len__(self) -> int:
+        return len(self.tail)
+
+
+# Hot bodies by hash, so that every recipient of a body shares one encoding of
+# it. A hash always maps to the same body, so entries never go stale.
+_tails: LRUCache[_CachedTail] = LRUCache(LRU_MAX_BYTES)
+
+Entry = Tuple[str, Dict[str, str]]
+
+
+def split_notification(notification: NotificationRequestData) -> Tuple[str, Dict[str, Any]]:
+    """
+    Split a notification into its shared body, as canonical JSON, and its per-user variables.
+    """
+    data = notification.model_dump(mode="json", exclude_unset=True)
+    variables = {field: data.pop(field) for field in VARIABLE_FIELDS if field in data}
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False), variables
+
+
+def payload_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def is_out_of_line(body: str) -> bool:
+    """
+    Whether a body is large enough to be stored once and referenced by hash.
+    Below the threshold a 64-character hash saves too little to be worth a lookup.
+    """
+    return len(body.encode("utf-8")) > INLINE_MAX_BYTES
+
+
+def render_message(body: str, variables: Dict[str, Any]) -> str:
+    """
+    Rebuild the full notification JSON by splicing the variables into the body's
+    text, without parsing the body.
+    """
+    if not variables:
+        return body
+    head = json.dumps(variables, separators=(",", ":"), ensure_ascii=False)
+    if body == "{}":
+        return head
+    return head[:-1] + "," + body[1:]
+
+
+def frame_tail(body: str) -> str:
+    """
+    The part of a rendered message contributed by the shared body, escaped for the
+    delivery frame: everything after the body's opening brace.
+    """
+    return escape_json_string(body[1:]) if body != "{}" else ""
+
+
+def escaped_message(tail: str, variables: Dict[str, Any]) -> str:
+    """
+    Escaped form of `render_message(body, variables)`, from the body's cached tail;
+    only the small per-user head is escaped per delivery.
+    """
+    head = json.dumps(variables, separators=(",", ":"), ensure_ascii=False)
+    if not tail:
+        return escape_json_string(head)
+    if not variables:
+        return "{" + tail
+    return escape_json_string(head[:-1] + ",") + tail
+
+
+async def store_payload(body: str, payload_dao: PayloadDAO) -> str:
+    """
+    Store a body once, in Postgres and in Redis, and return its hash.
+
+    The archiver's GC deletes bodies older than GC_GRACE_SEC that no request
+    references, so a body this process has not stored in the last GC_GRACE_SEC/2
+    is stored again, its `created_at` refreshed if older than GC_GRACE_SEC/4.
+    Until then, sending the body again writes nothing: its row is at most
+    3/4 GC_GRACE_SEC old, and a Redis copy that expired is restored on delivery.
+    """
+    key = payload_hash(body)
+    now = time.monotonic()
+    cached = _tails.get(key)
+    if cached is not None and cached.stored_at is not None and now - cached.stored_at < GC_GRACE_SEC / 2:
+        metrics.inc("payload_store_skipped")
+        return key
+    refresh_before = datetime.utcnow() - timedelta(seconds=GC_GRACE_SEC / 4)
+    await payload_dao.store_payloads({key: body}, refresh_before=refresh_before)
+    try:
+        await redis_client.set(get_payload_key(key), body, ex=REDIS_TTL_SEC)
+    except Exception as exc:
+        # Delivery falls back to Postgres and repopulates Redis.
+        logger.error("Error caching payload %s in Redis: %s", key, exc)
+    if cached is not None:
+        cached.stored_at = now
+    else:
+        _tails.put(key, _CachedTail(frame_tail(body), now))
+    return key
+
+
+async def resolve_frame_tails(hashes: List[str]) -> Dict[str, str]:
+    """
+    Look bodies up by hash: first in the in-process LRU, then with one MGET in
+    Redis, and finally in Postgres, copying what was found back into Redis.
+
+    Returns:
+        Dict[str, str]: Frame tails keyed by hash; hashes found nowhere are missing.
+    """
+    found: Dict[str, str] = {}
+    missing: List[str] = []
+    for key in dict.fromkeys(hashes):
+        cached = _tails.get(key)
+        if cached is not None:
+            found[key] = cached.tail
+        else:
+            missing.append(key)
+    metrics.inc("payload_lru_hits", len(found))
+    if not missing:
+        return found
+
+    values = await redis_client.mget([get_payload_key(key) for key in missing])
+    not_cached = [key for key, value in zip(missing, values) if value is None]
+    for key, value in zip(missing, values):
+        if value is not None:
+            found[key] = frame_tail(value)
+            _tails.put(key, _CachedTail(found[key]))
+    metrics.inc("payload_redis_hits", len(missing) - len(not_cached))
+    if not not_cached:
+        return found
+
+    async with async_session() as session:
+        stored = await PayloadDAO(session).get_payloads(not_cached)
+    metrics.inc("payload_db_hits", len(stored))
+    if stored:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, body in stored.items():
+                pipe.set(get_payload_key(key), body, ex=REDIS_TTL_SEC)
+            await pipe.execute()
+        for key, body in stored.items():
+            found[key] = frame_tail(body)
+            _tails.put(key, _CachedTail(found[key]))
+    return found
+
+
+async def resolve_frames(entries: List[Entry]) -> List[Tuple[str, str]]:
+    """
+    Turn stream entries into (entry ID, delivery frame) pairs, resolving the bodies
+    of entries that reference one by hash in a single batch. Entries whose body can
+    no longer be found are logged and skipped.
+    """
+    tails = await resolve_frame_tails([data["h"] for _msg_id, data in entries if "h" in data])
+    frames: List[Tuple[str, str]] = []
+    for msg_id, data in entries:
+        if "f" in data:
+            escaped = data["f"]
+        elif "h" in data:
+            tail = tails.get(data["h"])
+            if tail is None:
+                logger.error("Payload %s of stream entry %s not found", data["h"], msg_id)
+                continue
+            escaped = escaped_message(tail, json.loads(data.get("v") or "{}"))
+        elif data.get("message"):
+            escaped = escape_json_string(data["message"])  # written before frames were pre-escaped
+        else:
+            continue
+        frames.append((msg_id, build_frame(msg_id, escaped)))
+    return frames
@@ -0,0 +1,202 @@
+import logging
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from config.client import ConfigClient
+from db.session import async_session
+from redis_client.client import get_binary_redis_client
+from repository.request import RequestDAO
+from utils.helpers import get_dead_letter_stream_key, get_group_name, get_stream_key
+from utils.metrics import metrics
+from websocket_manager.connection_manager import manager
+from websocket_manager.entry_codec import decode_entry
+from websocket_manager.payloads import resolve_frames
+from websocket_manager.unread import adjust_unread_many
+
+GROUP_NAME: str = get_group_name()
+DEAD_LETTER_STREAM: str = get_dead_letter_stream_key()
+MIN_IDLE_MS: int = int(ConfigClient.get_property("MIN_IDLE_MS", section="RECLAIM"))
+MAX_DELIVERIES: int = int(ConfigClient.get_property("MAX_DELIVERIES", section="RECLAIM"))
+USERS_PER_PASS: int = int(ConfigClient.get_property("USERS_PER_PASS", section="RECLAIM"))
+CLAIM_COUNT: int = int(ConfigClient.get_property("CLAIM_COUNT", section="RECLAIM"))
+DEAD_LETTER_MAX_LENGTH: int = int(ConfigClient.get_property("DEAD_LETTER_MAX_LENGTH", section="RECLAIM"))
+
+logger = logging.getLogger(__name__)
+binary_redis_client = get_binary_redis_client()
+
+# Position in this node's connected users where the next pass starts.
+_next_user = 0
+
+# A user of this pass: user ID, when their longest-connected socket on this node
+# connected (Unix time), and the client their sockets connected for.
+_User = Tuple[str, float, Optional[str]]
+# A pending entry: user ID, message ID, fields, and how often it was delivered.
+_Pending = Tuple[str, bytes, Dict[bytes, bytes], int]
+
+
+@dataclass
+class ReclaimStats:
+    users: int = 0
+    claimed: int = 0
+    redelivered: int = 0
+    dead_lettered: int = 0
+
+
+def _users_for_pass() -> List[_User]:
+    """
+    The next USERS_PER_PASS users connected to this node, continuing where the
+    previous pass stopped and wrapping around, so each pass costs the same however
+    many users are connected.
+    """
+    global _next_user
+    users = list(manager.active_connections.items())
+    if _next_user >= len(users):
+        _next_user = 0
+    batch = users[_next_user:_next_user + USERS_PER_PASS]
+    _next_user += len(batch)
+    return [
+        (
+            user_id,
+            min((manager.socket_connected_at.get(websocket, 0.0) for websocket in websockets), default=0.0),
+            next((manager.socket_clients[websocket] for websocket in websockets if websocket in manager.socket_clients), None),
+        )
+        for user_id, websockets in batch
+    ]
+
+
+async def _orphaned(users: List[_User]) -> Dict[str, Dict[bytes, int]]:
+    """
+    Up to CLAIM_COUNT entries per user idle for MIN_IDLE_MS and last delivered
+    before every socket the user now has here connected, with their delivery
+    counts. An entry delivered while one of those sockets was open reached it and
+    is merely unread; sending it again would only repeat it. Reading the pending
+    entries list changes nothing, so entries left alone keep their idle time and
+    delivery count. Streams without a group are skipped.
+    """
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for user_id, _connected_since, _client_id in users:
+            pipe.xpending_range(
+                get_stream_key(user_id), GROUP_NAME, min="-", max="+", count=CLAIM_COUNT,
+                consumername=user_id, idle=MIN_IDLE_MS,
+            )
+        results = await pipe.execute(raise_on_error=False)
+    now = time.time()
+    orphaned: Dict[str, Dict[bytes, int]] = {}
+    for (user_id, connected_since, _client_id), result in zip(users, results):
+        if isinstance(result, Exception):
+            continue
+        entries = {
+            pending["message_id"]: int(pending["times_delivered"])
+            for pending in result
+            if now - int(pending["time_since_delivered"]) / 1000 < connected_since
+        }
+        if entries:
+            orphaned[user_id] = entries
+    return orphaned
+
+
+async def _claim(orphaned: Dict[str, Dict[bytes, int]]) -> List[_Pending]:
+    """
+    XCLAIM the orphaned entries back to the user's own consumer, which resets their
+    idle time and counts one more delivery, and return them with their fields.
+    """
+    user_ids = list(orphaned)
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for user_id in user_ids:
+            pipe.xclaim(get_stream_key(user_id), GROUP_NAME, user_id, MIN_IDLE_MS, list(orphaned[user_id]))
+        results = await pipe.execute(raise_on_error=False)
+    claimed: List[_Pending] = []
+    for user_id, result in zip(user_ids, results):
+        if isinstance(result, Exception):
+            continue
+        # Entries deleted from the stream come back empty and can never be delivered.
+        claimed.extend((user_id, msg_id, raw, orphaned[user_id][msg_id]) for msg_id, raw in result if raw)
+    return claimed
+
+
+async def _dead_letter(dead: List[_Pending], clients: Dict[str, Optional[str]]) -> None:
+    """
+    Copy entries that kept failing to the dead-letter stream, with the user ID,
+    original message ID and delivery count alongside their fields, and
+    acknowledge them so they leave the user's pending entries list. As with any
+    acknowledgement, the unread counters go down; the requests move to REJECTED.
+    """
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for user_id, msg_id, raw, deliveries in dead:
+            fields: Dict[Any, Any] = {**raw, b"user_id": user_id, b"message_id": msg_id, b"deliveries": deliveries}
+            pipe.xadd(DEAD_LETTER_STREAM, fields, maxlen=DEAD_LETTER_MAX_LENGTH, approximate=True)
+        for user_id, msg_id, _raw, _deliveries in dead:
+            pipe.xack(get_stream_key(user_id), GROUP_NAME, msg_id)
+        results = await pipe.execute()
+
+    by_client: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    acked: Dict[str, Counter] = defaultdict(Counter)
+    for (user_id, msg_id, _raw, _deliveries), result in zip(dead, results[len(dead):]):
+        client_id = clients.get(user_id)
+        if client_id is None:
+            continue
+        by_client[client_id].append((user_id, msg_id.decode()))
+        acked[client_id][user_id] += int(result)
+    async with async_session() as session:
+        request_dao = RequestDAO(session)
+        for client_id, entries in by_client.items():
+            try:
+                await adjust_unread_many(client_id, {user_id: -count for user_id, count in acked[client_id].items()})
+                await request_dao.mark_dead_lettered(UUID(client_id), entries)
+            except Exception as exc:
+                logger.error("Error recording %d dead-lettered entries of client %s: %s", len(entries), client_id, exc)
+
+
+async def reclaim_pending_entries() -> ReclaimStats:
+    """
+    One reclaim pass over the next slice of this node's connected users.
+
+    Entries delivered to a socket that died before they were acknowledged sit in
+    the user's pending entries list until something re-reads it. This claims the
+    ones idle for MIN_IDLE_MS that none of the user's current sockets were
+    connected for, and sends them to those sockets; entries already delivered
+    MAX_DELIVERIES times go to the dead-letter stream instead. Entries delivered
+    to a socket that is still open are only unread, and are left pending.
+    Users not connected here are left alone: their pending entries are replayed
+    on reconnect, and claiming them would use up their delivery count.
+    The sharded layout keeps no per-user pending entries, so it has nothing to reclaim.
+    """
+    stats = ReclaimStats()
+    users = _users_for_pass()
+    stats.users = len(users)
+    if not users:
+        return stats
+
+    orphaned = await _orphaned(users)
+    if not orphaned:
+        return stats
+    claimed = await _claim(orphaned)
+    stats.claimed = len(claimed)
+
+    dead: List[_Pending] = []
+    live: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
+    for user_id, msg_id, raw, deliveries in claimed:
+        if deliveries >= MAX_DELIVERIES:
+            dead.append((user_id, msg_id, raw, deliveries))
+            continue
+        try:
+            live[user_id].append((msg_id.decode(), decode_entry(raw)))
+        except ValueError as exc:
+            logger.error("Skipping undecodable stream entry %s: %s", msg_id, exc)
+    for user_id, entries in live.items():
+        for _msg_id, frame in await resolve_frames(entries):
+            if await manager.send_personal_message(frame, user_id):
+                stats.redelivered += 1
+
+    if dead:
+        await _dead_letter(dead, {user_id: client_id for user_id, _connected_since, client_id in users})
+        stats.dead_lettered = len(dead)
+        logger.warning("Moved %d entries delivered %d times to the dead-letter stream", len(dead), MAX_DELIVERIES)
+
+    metrics.inc("reclaim_entries_claimed", stats.claimed)
+    metrics.inc("reclaim_entries_redelivered", stats.redelivered)
+    metrics.inc("reclaim_entries_dead_lettered", stats.dead_lettered)
+    return stats
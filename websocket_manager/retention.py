@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from config.client import ConfigClient
+from redis_client.client import get_binary_redis_client
+from utils.helpers import get_group_name, get_stream_key
+from utils.metrics import metrics
+from websocket_manager.lifecycle import stream_id_ms
+
+GROUP_NAME: str = get_group_name()
+SCAN_COUNT: int = int(ConfigClient.get_property("SCAN_COUNT", section="RETENTION"))
+PAUSE_SEC: float = float(ConfigClient.get_property("PAUSE_SEC", section="RETENTION"))
+IDLE_DAYS: int = int(ConfigClient.get_property("IDLE_DAYS", section="RETENTION"))
+EXPIRE_AFTER_SEC: int = int(ConfigClient.get_property("EXPIRE_AFTER_SEC", section="RETENTION"))
+
+logger = logging.getLogger(__name__)
+binary_redis_client = get_binary_redis_client()
+
+# Commands queued per stream when inspecting a batch, in this order.
+_INSPECT_COMMANDS = 5
+
+
+@dataclass
+class RetentionStats:
+    streams: int = 0
+    trimmed_streams: int = 0
+    trimmed_entries: int = 0
+    reclaimed_bytes: int = 0
+    expiring_streams: int = 0
+    expiring_bytes: int = 0
+    persisted_streams: int = 0
+
+
+@dataclass
+class _StreamState:
+    key: bytes
+    first_id: Optional[str]
+    min_id: Optional[str]  # oldest entry anyone may still need; None when unknown
+    last_active_ms: int
+    ttl: int
+
+
+def _id_tuple(message_id: str) -> Tuple[int, int]:
+    ms, _, seq = message_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _next_id(message_id: str) -> str:
+    ms, seq = _id_tuple(message_id)
+    return f"{ms}-{seq + 1}"
+
+
+def _ok(result: Any) -> bool:
+    return not isinstance(result, Exception)
+
+
+def _stream_state(key: bytes, info, groups, pending, consumers, ttl, now_ms: int) -> Optional[_StreamState]:
+    """
+    Work out from one stream's XINFO, XPENDING and TTL replies what may be trimmed
+    and when anyone last used it. Returns None if the stream vanished meanwhile.
+    """
+    if not _ok(info) or not _ok(ttl):
+        return None
+    first_entry = info.get("first-entry")
+    first_id = first_entry[0].decode() if first_entry else None
+    last_active_ms = stream_id_ms(info["last-generated-id"].decode())
+
+    group = None
+    if _ok(groups):
+        group = next((g for g in groups if g["name"].decode() == GROUP_NAME), None)
+    min_id = None
+    if group is not None:
+        # Entries before the oldest pending one are acknowledged; with nothing
+        # pending, everything up to the last delivered entry is.
+        if int(group["pending"]) and _ok(pending) and pending["min"]:
+            min_id = pending["min"].decode()
+        else:
+            min_id = _next_id(group["last-delivered-id"].decode())
+        if _ok(consumers) and consumers:
+            last_active_ms = max(last_active_ms, now_ms - min(int(c["idle"]) for c in consumers))
+    return _StreamState(key, first_id, min_id, last_active_ms, int(ttl))
+
+
+async def _inspect(keys: List[bytes], now_ms: int) -> List[_StreamState]:
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.xinfo_stream(key)
+            pipe.xinfo_groups(key)
+            pipe.xpending(key, GROUP_NAME)
+            pipe.xinfo_consumers(key, GROUP_NAME)
+            pipe.ttl(key)
+        results = await pipe.execute(raise_on_error=False)
+    states = []
+    for index, key in enumerate(keys):
+        state = _stream_state(key, *results[index * _INSPECT_COMMANDS:(index + 1) * _INSPECT_COMMANDS], now_ms)
+        if state is not None:
+            states.append(state)
+    return states
+
+
+async def _memory_usage(keys: List[bytes]) -> List[int]:
+    """
+    Approximate memory of each key in bytes; 0 where Redis cannot tell.
+    """
+    if not keys:
+        return []
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.memory_usage(key)
+        results = await pipe.execute(raise_on_error=False)
+    return [int(result) if _ok(result) and result else 0 for result in results]
+
+
+async def _apply(states: List[_StreamState], now_ms: int, stats: RetentionStats) -> None:
+    idle_before_ms = now_ms - IDLE_DAYS * 86400 * 1000
+    to_trim = [
+        s for s in states
+        if s.min_id is not None and s.first_id is not None and _id_tuple(s.min_id) > _id_tuple(s.first_id)
+    ]
+    to_expire = [s for s in states if s.ttl == -1 and s.last_active_ms < idle_before_ms]
+    to_persist = [s for s in states if s.ttl >= 0 and s.last_active_ms >= idle_before_ms]
+
+    before = await _memory_usage([s.key for s in to_trim + to_expire])
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for s in to_trim:
+            pipe.xtrim(s.key, minid=s.min_id, approximate=False)
+        for s in to_expire:
+            pipe.expire(s.key, EXPIRE_AFTER_SEC)
+        for s in to_persist:
+            pipe.persist(s.key)
+        results = await pipe.execute(raise_on_error=False)
+    after = await _memory_usage([s.key for s in to_trim])
+
+    for s, removed, used_before, used_after in zip(to_trim, results, before, after):
+        if _ok(removed) and removed:
+            stats.trimmed_streams += 1
+            stats.trimmed_entries += int(removed)
+            stats.reclaimed_bytes += max(used_before - used_after, 0)
+    for s, expiring, used in zip(to_expire, results[len(to_trim):], before[len(to_trim):]):
+        if _ok(expiring) and expiring:
+            stats.expiring_streams += 1
+            stats.expiring_bytes += used
+    stats.persisted_streams += sum(
+        1 for persisted in results[len(to_trim) + len(to_expire):] if _ok(persisted) and persisted
+    )
+
+
+async def enforce_stream_retention() -> RetentionStats:
+    """
+    One pass over every user stream, SCAN_COUNT keys at a time with a PAUSE_SEC
+    pause in between, so the pass never holds Redis for long:
+      - entries every consumer has acknowledged are trimmed with `XTRIM MINID`;
+      - streams nobody published to or read from for IDLE_DAYS get a TTL of
+        EXPIRE_AFTER_SEC, and streams that became active again lose it.
+
+    Streams without a consumer group (cursor delivery mode, or never connected)
+    are not trimmed, since only their clients know what was read; MAXLEN caps them.
+
+    Returns:
+        RetentionStats: What the pass trimmed, expired, and the memory it reclaimed.
+    """
+    stats = RetentionStats()
+    cursor = 0
+    match = get_stream_key("*")
+    while True:
+        cursor, keys = await binary_redis_client.scan(cursor, match=match, count=SCAN_COUNT, _type="stream")
+        if keys:
+            now_ms = int(time.time() * 1000)
+            stats.streams += len(keys)
+            await _apply(await _inspect(keys, now_ms), now_ms, stats)
+        if not cursor:
+            break
+        await asyncio.sleep(PAUSE_SEC)
+
+    metrics.inc("stream_retention_trimmed_entries", stats.trimmed_entries)
+    metrics.inc("stream_retention_reclaimed_bytes", stats.reclaimed_bytes)
+    metrics.inc("stream_retention_expiring_streams", stats.expiring_streams)
+    metrics.inc("stream_retention_expiring_bytes", stats.expiring_bytes)
+    metrics.set_gauge("stream_retention_streams", stats.streams)
+    return stats
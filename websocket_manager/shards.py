@@ -0,0 +1,251 @@
+import logging
+import socket
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.client import ConfigClient
+from redis_client.client import get_binary_redis_client
+from utils.helpers import get_shard_group_name, get_shard_index_key, get_shard_stream_key
+from utils.metrics import metrics
+from websocket_manager.connection_manager import manager
+from websocket_manager.entry_codec import decode_entry, encode_entry
+from websocket_manager.lifecycle import record_delivered
+from websocket_manager.payloads import resolve_frames
+
+SHARD_COUNT: int = int(ConfigClient.get_property("COUNT", section="SHARDS"))
+NODE_ID: str = ConfigClient.get_property("NODE_ID", section="SHARDS") or socket.gethostname()
+NODE_SHARDS: str = ConfigClient.get_property("NODE_SHARDS", section="SHARDS")
+SHARD_MAX_LENGTH: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", section="SHARDS"))
+READ_COUNT: int = int(ConfigClient.get_property("READ_COUNT", section="SHARDS"))
+BLOCK_MS: int = int(ConfigClient.get_property("BLOCK_MS", section="SHARDS"))
+INDEX_TTL_SEC: int = int(ConfigClient.get_property("INDEX_TTL_SEC", section="SHARDS"))
+# A user's index holds as many entries as a per-user stream would.
+INDEX_MAX_LENGTH: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", section="WEBSOCKET"))
+
+# Each node reads its shards through its own group, so every node sees every entry
+# of the shards it serves and delivers those whose user is connected to it.
+GROUP_NAME: str = get_shard_group_name(NODE_ID)
+
+logger = logging.getLogger(__name__)
+binary_redis_client = get_binary_redis_client()
+
+Entry = Tuple[str, Dict[str, Any]]
+
+# Appends the entry to the shard stream and its ID to the user's index in one
+# atomic step. The index is scored by the ID's millisecond part and capped at
+# ARGV[2] entries; ARGV[4:] are the entry's field/value pairs.
+_ADD_SCRIPT = binary_redis_client.register_script("""
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', unpack(ARGV, 4))
+redis.call('ZADD', KEYS[2], tonumber(string.match(id, '^%d+')), id)
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[2]) - 1)
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return id
+""")
+
+
+def shard_for(user_id: str) -> int:
+    """
+    The shard a user's notifications go to; stable across processes and restarts.
+    """
+    return zlib.crc32(user_id.encode()) % SHARD_COUNT
+
+
+def parse_shards(spec: str) -> List[int]:
+    """
+    Parse a shard assignment such as `all` or `0-15,32,40-47`.
+    """
+    if spec.strip().lower() == "all":
+        return list(range(SHARD_COUNT))
+    shards = set()
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        start, _, end = part.partition("-")
+        shards.update(range(int(start), int(end or start) + 1))
+    if any(shard >= SHARD_COUNT for shard in shards):
+        raise ValueError(f"Shard assignment {spec!r} exceeds the {SHARD_COUNT} configured shards")
+    return sorted(shards)
+
+
+ASSIGNED_SHARDS: List[int] = parse_shards(NODE_SHARDS)
+
+
+def _id_key(message_id: str) -> Tuple[int, int]:
+    ms, _, seq = message_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+async def add_entry(user_id: str, fields: Dict[str, Any]) -> str:
+    """
+    Append an entry for `user_id` to its shard stream and index it under the user.
+    `fields` must carry the user ID as "u". Returns the entry ID.
+    """
+    shard = shard_for(user_id)
+    args: List[Any] = [SHARD_MAX_LENGTH, INDEX_MAX_LENGTH, INDEX_TTL_SEC]
+    for name, value in encode_entry(fields).items():
+        args.extend((name, value))
+    msg_id = await _ADD_SCRIPT(keys=[get_shard_stream_key(shard), get_shard_index_key(shard, user_id)], args=args)
+    return msg_id.decode()
+
+
+async def get_indexed_entries(user_id: str, count: int, after_id: Optional[str] = None) -> List[Entry]:
+    """
+    The oldest `count` unacknowledged entries of a user, optionally only those
+    after `after_id`, read from the user's index and its shard stream. Index
+    entries whose stream entry was trimmed away are dropped from the index.
+    """
+    shard = shard_for(user_id)
+    index_key = get_shard_index_key(shard, user_id)
+    if after_id is None:
+        raw_ids = await binary_redis_client.zrange(index_key, 0, count - 1)
+    else:
+        # Entries of the same millisecond share a score, so filter those on the full ID.
+        raw_ids = await binary_redis_client.zrangebyscore(index_key, _id_key(after_id)[0], "+inf", start=0, num=count + 1)
+    message_ids = sorted((raw.decode() for raw in raw_ids), key=_id_key)
+    if after_id is not None:
+        message_ids = [m for m in message_ids if _id_key(m) > _id_key(after_id)][:count]
+    return await _load_entries(user_id, message_ids)
+
+
+async def get_indexed_entries_before(user_id: str, count: int, before_id: Optional[str] = None) -> List[Entry]:
+    """
+    The newest `count` unacknowledged entries of a user, optionally only those
+    before `before_id`, newest first.
+    """
+    index_key = get_shard_index_key(shard_for(user_id), user_id)
+    if before_id is None:
+        raw_ids = await binary_redis_client.zrevrange(index_key, 0, count - 1)
+    else:
+        raw_ids = await binary_redis_client.zrevrangebyscore(index_key, _id_key(before_id)[0], "-inf", start=0, num=count + 1)
+    message_ids = sorted((raw.decode() for raw in raw_ids), key=_id_key, reverse=True)
+    if before_id is not None:
+        message_ids = [m for m in message_ids if _id_key(m) < _id_key(before_id)][:count]
+    return await _load_entries(user_id, message_ids)
+
+
+async def _load_entries(user_id: str, message_ids: List[str]) -> List[Entry]:
+    """
+    Read indexed entries from the user's shard stream, in the given order. Index
+    entries whose stream entry was trimmed away are dropped from the index.
+    """
+    if not message_ids:
+        return []
+    shard = shard_for(user_id)
+    stream_key = get_shard_stream_key(shard)
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for message_id in message_ids:
+            pipe.xrange(stream_key, message_id, message_id)
+        results = await pipe.execute()
+    entries: List[Entry] = []
+    missing: List[str] = []
+    for message_id, found in zip(message_ids, results):
+        if not found:
+            missing.append(message_id)
+            continue
+        try:
+            entries.append((message_id, decode_entry(found[0][1])))
+        except ValueError as exc:
+            logger.error("Skipping undecodable shard entry %s: %s", message_id, exc)
+    if missing:
+        await binary_redis_client.zrem(get_shard_index_key(shard, user_id), *missing)
+    return entries
+
+
+async def acknowledge(acks: Dict[str, List[str]]) -> Dict[str, int]:
+    """
+    Remove acknowledged entries from their users' indexes in one pipelined round
+    trip. Returns how many were still unacknowledged per user ID, like XACK would.
+    """
+    user_ids = [user_id for user_id, message_ids in acks.items() if message_ids]
+    if not user_ids:
+        return {}
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for user_id in user_ids:
+            pipe.zrem(get_shard_index_key(shard_for(user_id), user_id), *acks[user_id])
+        results = await pipe.execute()
+    return dict(zip(user_ids, results))
+
+
+async def count_indexed(user_id: str, after_id: Optional[str] = None) -> int:
+    """
+    Number of unacknowledged entries of a user; with `after_id`, those from the
+    same millisecond onwards, which may count a few entries up to `after_id` too.
+    """
+    index_key = get_shard_index_key(shard_for(user_id), user_id)
+    if after_id is None:
+        return await binary_redis_client.zcard(index_key)
+    return await binary_redis_client.zcount(index_key, _id_key(after_id)[0], "+inf")
+
+
+async def ensure_shard_groups() -> None:
+    """
+    Create this node's group on each of its shards, starting from new entries:
+    entries published earlier are replayed from the users' indexes on connect.
+    """
+    for shard in ASSIGNED_SHARDS:
+        try:
+            await binary_redis_client.xgroup_create(get_shard_stream_key(shard), GROUP_NAME, id="$", mkstream=True)
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+
+async def route_shard_batch(start_id: str = ">") -> int:
+    """
+    Read one batch from this node's shards and deliver each entry to the sockets
+    its user has open on this node; entries of users connected elsewhere, or not
+    at all, are skipped. The batch is acknowledged right away: delivery state is
+    kept per user in the indexes, so the group only tracks this node's position.
+
+    Returns:
+        int: Number of entries read.
+    """
+    streams = {get_shard_stream_key(shard): start_id for shard in ASSIGNED_SHARDS}
+    response = await binary_redis_client.xreadgroup(GROUP_NAME, NODE_ID, streams, count=READ_COUNT, block=BLOCK_MS)
+    if not response:
+        return 0
+
+    read = 0
+    local: Dict[str, List[Entry]] = defaultdict(list)
+    clients: Dict[str, str] = {}
+    async with binary_redis_client.pipeline(transaction=False) as pipe:
+        for stream_key, messages in response:
+            if not messages:
+                continue
+            read += len(messages)
+            pipe.xack(stream_key, GROUP_NAME, *[msg_id for msg_id, _raw in messages])
+            if start_id != ">":
+                continue  # left over from before a restart; those sockets are gone
+            for msg_id, raw in messages:
+                try:
+                    data = decode_entry(raw)
+                except ValueError as exc:
+                    logger.error("Skipping undecodable shard entry %s: %s", msg_id, exc)
+                    continue
+                user_id = data.get("u")
+                if user_id in manager.active_connections:
+                    local[user_id].append((msg_id.decode(), data))
+                    clients[user_id] = data.get("c", "")
+        await pipe.execute()
+
+    for user_id, entries in local.items():
+        delivered: List[str] = []
+        for msg_id, frame in await resolve_frames(entries):
+            await manager.send_personal_message(frame, user_id)
+            delivered.append(msg_id)
+        if clients[user_id]:
+            await record_delivered(clients[user_id], user_id, delivered)
+    metrics.inc("shard_entries_read", read)
+    metrics.inc("shard_entries_delivered", sum(len(entries) for entries in local.values()))
+    return read
+
+
+async def consume_shards() -> None:
+    """
+    Acknowledge whatever this node left unacknowledged before a restart, then
+    follow its shards. Returns only by raising, so the caller can retry.
+    """
+    await ensure_shard_groups()
+    while await route_shard_batch("0"):
+        pass
+    while True:
+        await route_shard_batch()
@@ -1,15 +1,23 @@
+import json
 import logging
 import time
 import asyncio
-from typing import Any, Dict, List, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 from fastapi import status
+from redis.exceptions import ResponseError
 
 from constants.error_codes import ErrorCodes
 from constants.error_messages import ErrorMessages
 from exception.app_exception import AppException
-from redis_client.client import get_redis_client
+from redis_client.client import get_binary_redis_client, get_redis_client
 from config.client import ConfigClient
-from utils.helpers import get_group_name, get_stream_key
+from utils.helpers import get_cursor_key, get_group_name, get_stream_key
+from websocket_manager.connection_manager import manager
+from websocket_manager.entry_codec import decode_entry, encode_entry
+from websocket_manager.lifecycle import record_delivered
+from websocket_manager.frames import escape_json_string
+from websocket_manager.payloads import resolve_frames
+from websocket_manager import shards
 
 # Load constants from config; fallback to defaults if not set.
 GROUP_NAME: str = get_group_name()
@@ -17,85 +25,281 @@ MAX_STREAM_LENGTH: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", sect
 XREAD_TIMEOUT: int = int(ConfigClient.get_property("XREAD_TIMEOUT", section="WEBSOCKET"))
 XREAD_COUNT: int = int(ConfigClient.get_property("XREAD_COUNT", section="WEBSOCKET"))
 ERROR_SLEEP_SEC: float = float(ConfigClient.get_property("ERROR_SLEEP_SEC", section="WEBSOCKET"))
+# `per_user`: one stream and consumer group per user. `sharded`: SHARDS.COUNT shared
+# streams, consumed per node by `shards.consume_shards`, plus a per-user index.
+SHARDED: bool = ConfigClient.get_property("STREAM_LAYOUT", section="WEBSOCKET").lower() == "sharded"
+REPLAY_CHUNK_SIZE: int = int(ConfigClient.get_property("REPLAY_CHUNK_SIZE", section="WEBSOCKET"))
+KNOWN_GROUPS_MAX_SIZE: int = int(ConfigClient.get_property("KNOWN_GROUPS_MAX_SIZE", section="WEBSOCKET"))
+SERVER_SIDE_CURSORS: bool = ConfigClient.get_property("SERVER_SIDE", section="CURSORS").lower() == "true"
+CURSOR_READ_COUNT: int = int(ConfigClient.get_property("READ_COUNT", section="CURSORS"))
 
 logger = logging.getLogger(__name__)
 redis_client = get_redis_client()
+binary_redis_client = get_binary_redis_client()
 
+# Users whose stream this node has seen with a consumer group, so reconnects skip
+# the check. Cleared when full; a stale entry is noticed as NOGROUP on read.
+_known_groups: Set[str] = set()
 
-async def publish_message(user_id: str, message: str) -> None:
+# Appends an entry, first creating the stream together with its consumer group when
+# ARGV[3] is "1" and the stream does not exist yet. Clears any TTL the retention
+# worker set on an idle stream. ARGV[4:] are the entry's field/value pairs.
+_PUBLISH_SCRIPT = binary_redis_client.register_script("""
+if ARGV[3] == '1' and redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('XGROUP', 'CREATE', KEYS[1], ARGV[2], '0-0', 'MKSTREAM')
+end
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', unpack(ARGV, 4))
+redis.call('PERSIST', KEYS[1])
+return id
+""")
+
+# Creates the consumer group ARGV[1] unless the stream already has it, without
+# raising BUSYGROUP. Returns 1 if it was created. Also clears any retention TTL.
+_ENSURE_GROUP_SCRIPT = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('PERSIST', KEYS[1])
+    for _, group in ipairs(redis.call('XINFO', 'GROUPS', KEYS[1])) do
+        if group[2] == ARGV[1] then
+            return 0
+        end
+    end
+end
+redis.call('XGROUP', 'CREATE', KEYS[1], ARGV[1], '0-0', 'MKSTREAM')
+return 1
+""")
+
+
+async def publish_message(
+    user_id: str,
+    message: str,
+    client_id: Optional[str] = None,
+    consumer_group: bool = True,
+    notification_type: Optional[str] = None,
+) -> Optional[str]:
     """
     Publish a notification by writing it to a Redis Stream for the given user.
+    The message is stored already escaped for the delivery frame, so delivering it
+    needs no JSON encoding. Returns the stream entry ID, or None if the message
+    could not be added. `client_id` is kept with the entry in the sharded layout,
+    where the node delivering it does not otherwise know the client. A new stream
+    is created with its consumer group unless `consumer_group` is False (cursor mode).
+    `notification_type` is kept with the entry for backlog summaries.
+    """
+    return await _add_entry(user_id, _with_type({"f": escape_json_string(message)}, notification_type), client_id, consumer_group)
+
+
+async def publish_reference(
+    user_id: str,
+    payload_hash: str,
+    variables: Dict[str, Any],
+    client_id: Optional[str] = None,
+    consumer_group: bool = True,
+    notification_type: Optional[str] = None,
+) -> Optional[str]:
     """
+    Publish a notification whose body is in the payload store: the entry holds only
+    the body's hash and the user's variables, and the body is resolved on delivery.
+    Returns the stream entry ID, or None if the entry could not be added.
+    """
+    fields = {"h": payload_hash, "v": json.dumps(variables, separators=(",", ":"))}
+    return await _add_entry(user_id, _with_type(fields, notification_type), client_id, consumer_group)
+
+
+def _with_type(fields: Dict[str, Any], notification_type: Optional[str]) -> Dict[str, Any]:
+    if notification_type:
+        fields["t"] = notification_type
+    return fields
+
+
+async def _add_entry(
+    user_id: str, fields: Dict[str, Any], client_id: Optional[str] = None, consumer_group: bool = True
+) -> Optional[str]:
+    if SHARDED:
+        return await _add_shard_entry(user_id, fields, client_id)
     stream_key: str = get_stream_key(user_id)
-    payload: Dict[str, Any] = {"message": message, "timestamp": str(time.time())}
+    payload: Dict[str, Any] = {**fields, "timestamp": time.time()}
+    args: List[Any] = [MAX_STREAM_LENGTH, GROUP_NAME, "1" if consumer_group else "0"]
+    for name, value in encode_entry(payload).items():
+        args.extend((name, value))
     try:
-        msg_id = await redis_client.xadd(
-            stream_key,
-            payload,
-            maxlen=MAX_STREAM_LENGTH,
-            approximate=True
-        )
+        msg_id = (await _PUBLISH_SCRIPT(keys=[stream_key], args=args)).decode()
         logger.info(
             "[Redis Publisher] Added message to %s: %s (id: %s)",
             stream_key, payload, msg_id
         )
+        return msg_id
     except Exception as exc:
         logger.error("Error adding message to stream %s: %s", stream_key, exc)
+        return None
+
+
+async def _add_shard_entry(user_id: str, fields: Dict[str, Any], client_id: Optional[str]) -> Optional[str]:
+    payload: Dict[str, Any] = {**fields, "u": user_id, "timestamp": time.time()}
+    if client_id:
+        payload["c"] = client_id
+    try:
+        msg_id = await shards.add_entry(user_id, payload)
+        logger.info("[Redis Publisher] Added message for %s to shard %d (id: %s)", user_id, shards.shard_for(user_id), msg_id)
+        return msg_id
+    except Exception as exc:
+        logger.error("Error adding message for %s to shard %d: %s", user_id, shards.shard_for(user_id), exc)
+        return None
+
+
+def _decode_entries(response) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Decode the entries of an XREAD or XREADGROUP reply from the binary client; entries that
+    cannot be decoded are logged and skipped.
+    """
+    entries: List[Tuple[str, Dict[str, Any]]] = []
+    for _stream, messages in response or []:
+        for msg_id, raw in messages:
+            try:
+                entries.append((msg_id.decode(), decode_entry(raw)))
+            except ValueError as exc:
+                logger.error("Skipping undecodable stream entry %s: %s", msg_id, exc)
+    return entries
 
 
 async def create_consumer_group(user_id: str) -> None:
     """
     Ensure that a consumer group exists for a user's notifications stream.
+
+    Streams normally get their group on first publish, so this only checks, once
+    per user and node, and creates the group for streams that predate that. The
+    sharded layout has no per-user streams or groups, so there it does nothing.
     """
+    if SHARDED or user_id in _known_groups:
+        return
     stream_key: str = get_stream_key(user_id)
-    try:
-        await redis_client.xgroup_create(
-            stream_key, GROUP_NAME, id="0-0", mkstream=True
-        )
+    if await _ENSURE_GROUP_SCRIPT(keys=[stream_key], args=[GROUP_NAME]):
         logger.info("Created consumer group on stream %s", stream_key)
-    except Exception as exc:
-        # Ignore BUSYGROUP error indicating the group already exists.
-        if "BUSYGROUP" in str(exc):
-            logger.debug("Consumer group already exists for stream %s", stream_key)
-        else:
-            logger.error("Error creating consumer group on stream %s: %s", stream_key, exc)
+    if len(_known_groups) >= KNOWN_GROUPS_MAX_SIZE:
+        _known_groups.clear()
+    _known_groups.add(user_id)
+
+
+async def _recover_missing_group(user_id: str, exc: ResponseError) -> None:
+    """
+    Recreate the group of a stream that vanished (e.g. expired while idle) after
+    this node had seen it; other read errors are left to the caller.
+    """
+    if "NOGROUP" in str(exc):
+        _known_groups.discard(user_id)
+        await create_consumer_group(user_id)
 
 
-async def get_pending_notifications(user_id: str) -> List[Tuple[str, Dict[str, Any]]]:
+async def missed_chunks(
+    user_id: str, after_id: Optional[str], cursor_mode: bool = False, include_new: bool = True
+) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
     """
-    Retrieve pending notifications from a user's Redis stream using the consumer group.
-    Returns a list of (message_id, data) tuples.
+    Yield the entries a reconnecting user missed, REPLAY_CHUNK_SIZE at a time and
+    oldest first: first the entries delivered before but never acknowledged (the
+    consumer's PEL, paged by ID), then those never delivered, unless `include_new`
+    is False. Entries up to `after_id`, the last one the client received, are skipped.
+
+    In the sharded layout, the user's index holds both kinds and is paged instead.
+    In cursor mode, every entry after `after_id` is missed and read with XRANGE.
     """
+    if cursor_mode and not SHARDED:
+        stream_key = get_stream_key(user_id)
+        start_id = f"({after_id}" if after_id else "-"
+        while True:
+            messages = await binary_redis_client.xrange(stream_key, min=start_id, count=REPLAY_CHUNK_SIZE)
+            if not messages:
+                return
+            yield _decode_entries([(stream_key, messages)])
+            start_id = f"({messages[-1][0].decode()}"
+
+    if SHARDED:
+        while True:
+            entries = await shards.get_indexed_entries(user_id, REPLAY_CHUNK_SIZE, after_id)
+            if not entries:
+                return
+            yield entries
+            after_id = entries[-1][0]
+
     stream_key: str = get_stream_key(user_id)
     consumer_name = user_id  # Using user_id as the consumer identifier.
-    notifications: List[Tuple[str, Dict[str, Any]]] = []
-    try:
-        pending_resp = await redis_client.xreadgroup(
-            GROUP_NAME,
-            consumer_name,
-            {stream_key: "0"},
-            count=100,
-            block=0
+    start_id = after_id or "0"
+    while True:
+        response = await binary_redis_client.xreadgroup(
+            GROUP_NAME, consumer_name, {stream_key: start_id}, count=REPLAY_CHUNK_SIZE
         )
-        if pending_resp:
-            for _stream, messages in pending_resp:
-                notifications.extend(messages)
+        messages = response[0][1] if response else []
+        if not messages:
+            break
+        # Pending entries trimmed from the stream come back without fields and can
+        # never be delivered; acknowledge them so they leave the PEL.
+        trimmed = [msg_id for msg_id, raw in messages if not raw]
+        if trimmed:
+            await binary_redis_client.xack(stream_key, GROUP_NAME, *trimmed)
+        yield _decode_entries([(stream_key, [(msg_id, raw) for msg_id, raw in messages if raw])])
+        start_id = messages[-1][0].decode()
+
+    # Entries never delivered; reading them moves them to the PEL like live delivery does.
+    while include_new:
+        response = await binary_redis_client.xreadgroup(
+            GROUP_NAME, consumer_name, {stream_key: ">"}, count=REPLAY_CHUNK_SIZE
+        )
+        entries = _decode_entries(response)
+        if entries:
+            yield entries
+        if not response or len(response[0][1]) < REPLAY_CHUNK_SIZE:
+            return
+
+
+async def replay_notifications(
+    user_id: str, websocket, client_id: str, after_id: Optional[str] = None, include_new: bool = True
+) -> int:
+    """
+    Send a reconnecting user every notification they missed, one chunk at a time.
+    Pass `include_new=False` when the user's listener is already running on this
+    node: it delivers the undelivered entries to all of the user's sockets.
+
+    Only one chunk is held in memory, its payload references are resolved in one
+    batch, and each frame is awaited before the next is sent, so a slow client
+    throttles the replay instead of buffering it. Nothing is acknowledged here.
+    The replay stops at the first error, such as the socket closing.
+
+    Returns:
+        int: Number of notifications sent.
+    """
+    replayed = 0
+    try:
+        async for chunk in missed_chunks(user_id, after_id, include_new=include_new):
+            delivered: List[str] = []
+            for msg_id, frame in await resolve_frames(chunk):
+                await websocket.send_text(frame)
+                delivered.append(msg_id)
+            await record_delivered(client_id, user_id, delivered)
+            replayed += len(delivered)
+    except ResponseError as exc:
+        logger.error("Error replaying notifications of %s: %s", user_id, exc)
+        if not SHARDED:
+            await _recover_missing_group(user_id, exc)
     except Exception as exc:
-        logger.error("Error reading pending notifications from %s: %s", stream_key, exc)
-    return notifications
+        # A closed socket or a failed payload lookup ends the replay; what was
+        # not sent stays pending and is replayed on the next connect.
+        logger.error("Error replaying notifications of %s: %s", user_id, exc)
+    return replayed
 
 
-async def listen_for_notifications(user_id: str, websocket) -> None:
+async def listen_for_notifications(user_id: str, client_id: str) -> None:
     """
     Continuously listen for new notifications from the user's Redis stream and deliver them.
     Uses a blocking XREADGROUP call with a timeout. On errors, sleeps briefly to prevent tight loops.
+    Each delivered batch is recorded in the lifecycle event log for `client_id`.
+
+    One listener runs per user and node (see `ConnectionManager.ensure_listener`):
+    every entry is read once and written to all of the user's sockets here.
     """
     stream_key: str = get_stream_key(user_id)
     consumer_name = user_id
 
     while True:
         try:
-            new_resp = await redis_client.xreadgroup(
+            new_resp = await binary_redis_client.xreadgroup(
                 GROUP_NAME,
                 consumer_name,
                 {stream_key: ">"},
@@ -103,30 +307,95 @@ async def listen_for_notifications(user_id: str, websocket) -> None:
                 block=XREAD_TIMEOUT
             )
             if new_resp:
-                for _stream, messages in new_resp:
-                    for msg_id, data in messages:
-                        message = data.get("message")
-                        if message:
-                            # Send a JSON payload with both message id and content.
-                            await websocket.send_json({"message_id": msg_id, "message": message})
-                        # Do not automatically acknowledge the message here;
-                        # acknowledgement must be performed explicitly via the new endpoint.
+                delivered: List[str] = []
+                for msg_id, frame in await resolve_frames(_decode_entries(new_resp)):
+                    # The frame carries both message id and content, encoded at publish time.
+                    if await manager.send_personal_message(frame, user_id):
+                        delivered.append(msg_id)
+                    # Do not automatically acknowledge the message here;
+                    # acknowledgement must be performed explicitly via the new endpoint.
+                await record_delivered(client_id, user_id, delivered)
             else:
                 # Optional: Sleep briefly between reads if desired.
                 await asyncio.sleep(ERROR_SLEEP_SEC)
+        except ResponseError as exc:
+            logger.error("Error listening for notifications on stream %s: %s", stream_key, exc)
+            await _recover_missing_group(user_id, exc)
+            await asyncio.sleep(ERROR_SLEEP_SEC)
         except Exception as exc:
             logger.error("Error listening for notifications on stream %s: %s", stream_key, exc)
             await asyncio.sleep(ERROR_SLEEP_SEC)
 
 
-async def acknowledge_notifications(user_id: str, message_ids: List[str]) -> None:
+async def get_server_cursor(client_id: str, user_id: str) -> Optional[str]:
+    """
+    The ID of the last entry delivered to a cursor-mode user, as recorded by this
+    service, or None when there is none (or server-side cursors are disabled).
+    """
+    if not SERVER_SIDE_CURSORS:
+        return None
+    try:
+        return await redis_client.hget(get_cursor_key(client_id), user_id)
+    except Exception as exc:
+        logger.error("Error reading the cursor of user %s: %s", user_id, exc)
+        return None
+
+
+async def save_server_cursor(client_id: str, user_id: str, last_id: str) -> None:
+    """
+    Record `last_id` as the last entry delivered to a cursor-mode user, if server-side cursors are enabled.
+    """
+    if SERVER_SIDE_CURSORS:
+        await redis_client.hset(get_cursor_key(client_id), user_id, last_id)
+
+
+async def listen_from_cursor(user_id: str, websocket, client_id: str, last_id: str) -> None:
+    """
+    Deliver a cursor-mode user's notifications with plain XREAD, starting after `last_id`.
+
+    No consumer group is involved, so Redis keeps no pending entries list: the
+    resume cursor is the `message_id` of the last frame the client received. Entries
+    already in the stream come back without blocking, so the same loop first replays
+    the backlog and then waits for new entries. With server-side cursors enabled,
+    the last delivered ID is also written to the client's cursor hash after each batch.
+    """
+    stream_key: str = get_stream_key(user_id)
+
+    while True:
+        try:
+            response = await binary_redis_client.xread(
+                {stream_key: last_id},
+                count=CURSOR_READ_COUNT,
+                block=XREAD_TIMEOUT
+            )
+            if not response:
+                continue
+            entries = _decode_entries(response)
+            # Skip past undecodable entries too, so they are not read again.
+            last_id = response[0][1][-1][0].decode()
+            delivered: List[str] = []
+            for msg_id, frame in await resolve_frames(entries):
+                await websocket.send_text(frame)
+                delivered.append(msg_id)
+            await save_server_cursor(client_id, user_id, last_id)
+            await record_delivered(client_id, user_id, delivered)
+        except Exception as exc:
+            logger.error("Error reading notifications from stream %s after %s: %s", stream_key, last_id, exc)
+            await asyncio.sleep(ERROR_SLEEP_SEC)
+
+
+async def acknowledge_notifications(user_id: str, message_ids: List[str]) -> int:
     """
     Acknowledge (XACK) messages so that they are not redelivered.
+    Returns how many of them were still pending, i.e. newly acknowledged.
     """
     stream_key: str = get_stream_key(user_id)
     try:
-        if message_ids:
-            await redis_client.xack(stream_key, GROUP_NAME, *message_ids)
+        if not message_ids:
+            return 0
+        if SHARDED:
+            return (await shards.acknowledge({user_id: message_ids})).get(user_id, 0)
+        return await redis_client.xack(stream_key, GROUP_NAME, *message_ids)
     except Exception as exc:
         logger.error("Error acknowledging messages on stream %s: %s", stream_key, exc)
         raise AppException(
@@ -135,3 +404,35 @@ async def acknowledge_notifications(user_id: str, message_ids: List[str]) -> Non
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             error=str(exc)
         )
+
+
+async def acknowledge_notifications_bulk(acks: Dict[str, List[str]]) -> Dict[str, int]:
+    """
+    Acknowledge messages across many users' streams in a single round trip by
+    pipelining one XACK per stream.
+
+    Args:
+        acks (Dict[str, List[str]]): Message IDs to acknowledge, keyed by user ID.
+
+    Returns:
+        Dict[str, int]: Number of newly acknowledged messages per user ID.
+    """
+    user_ids = [user_id for user_id, message_ids in acks.items() if message_ids]
+    if not user_ids:
+        return {}
+    try:
+        if SHARDED:
+            return await shards.acknowledge({user_id: acks[user_id] for user_id in user_ids})
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.xack(get_stream_key(user_id), GROUP_NAME, *acks[user_id])
+            results = await pipe.execute()
+        return dict(zip(user_ids, results))
+    except Exception as exc:
+        logger.error("Error bulk acknowledging messages for %d users: %s", len(user_ids), exc)
+        raise AppException(
+            error_code=ErrorCodes.Notification.ACKNOWLEDGE_FAILED,
+            error_message=ErrorMessages.Notification.ACKNOWLEDGE_FAILED,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error=str(exc)
+        )
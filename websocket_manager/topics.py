@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import WebSocket
+
+from config.client import ConfigClient
+from redis_client.client import get_binary_redis_client
+from utils.helpers import get_topic_stream_key
+from utils.metrics import metrics
+from utils.topic_trie import TopicTrie
+from websocket_manager import heartbeat
+from websocket_manager.entry_codec import decode_entry, encode_entry
+from websocket_manager.frames import build_topic_frame, escape_json_string
+
+MAX_STREAM_LENGTH: int = int(ConfigClient.get_property("MAX_STREAM_LENGTH", section="TOPICS"))
+READ_COUNT: int = int(ConfigClient.get_property("READ_COUNT", section="TOPICS"))
+BLOCK_MS: int = int(ConfigClient.get_property("BLOCK_MS", section="TOPICS"))
+MAX_SUBSCRIPTIONS: int = int(ConfigClient.get_property("MAX_SUBSCRIPTIONS", section="TOPICS"))
+SEND_TIMEOUT_SEC: float = float(ConfigClient.get_property("SEND_TIMEOUT_SEC", section="TOPICS"))
+
+logger = logging.getLogger(__name__)
+binary_redis_client = get_binary_redis_client()
+
+# Subscriptions of this node's sockets, one trie per client, so that a client's
+# topics are only ever delivered to that client's sockets.
+_tries: Dict[str, TopicTrie[WebSocket]] = {}
+# Each subscribed socket's client and topic filters, to clean up on disconnect.
+_socket_clients: Dict[WebSocket, str] = {}
+_socket_filters: Dict[WebSocket, Set[str]] = {}
+
+
+def subscribe(websocket: WebSocket, client_id: str, topic_filters: Iterable[str]) -> Optional[List[str]]:
+    """
+    Subscribe a socket to topic filters, unless that would take it past
+    MAX_SUBSCRIPTIONS, in which case nothing changes.
+
+    Returns:
+        Optional[List[str]]: The socket's filters, or None if over the limit.
+    """
+    filters = _socket_filters.get(websocket, set())
+    new = set(topic_filters) - filters
+    if len(filters) + len(new) > MAX_SUBSCRIPTIONS:
+        return None
+    trie = _tries.setdefault(client_id, TopicTrie())
+    for topic_filter in new:
+        trie.add(topic_filter, websocket)
+    _socket_clients[websocket] = client_id
+    _socket_filters[websocket] = filters | new
+    _update_gauge()
+    return sorted(_socket_filters[websocket])
+
+
+def unsubscribe(websocket: WebSocket, topic_filters: Iterable[str]) -> List[str]:
+    """
+    Unsubscribe a socket from topic filters it follows; others are ignored.
+
+    Returns:
+        List[str]: The socket's remaining filters.
+    """
+    client_id = _socket_clients.get(websocket)
+    if client_id is None:
+        return []
+    filters = _socket_filters[websocket]
+    trie = _tries[client_id]
+    for topic_filter in set(topic_filters) & filters:
+        trie.remove(topic_filter, websocket)
+        filters.discard(topic_filter)
+    if not filters:
+        del _socket_clients[websocket]
+        del _socket_filters[websocket]
+    if not trie:
+        del _tries[client_id]
+    _update_gauge()
+    return sorted(filters)
+
+
+def _update_gauge() -> None:
+    metrics.set_gauge("topic_subscriptions", sum(len(trie) for trie in _tries.values()))
+
+
+def unsubscribe_all(websocket: WebSocket) -> None:
+    unsubscribe(websocket, list(_socket_filters.get(websocket, ())))
+
+
+async def publish_topic(
+    client_id: str, topic: str, message: str, notification_type: Optional[str] = None
+) -> Optional[str]:
+    """
+    Publish a notification to every socket of the client subscribed to `topic`,
+    on any node, by writing one entry to the shared topics stream. The message
+    is stored already escaped for the delivery frame, as for user streams.
+    Returns the stream entry ID, or None if the entry could not be added.
+    """
+    fields = {"c": client_id, "k": topic, "f": escape_json_string(message), "timestamp": time.time()}
+    if notification_type:
+        fields["t"] = notification_type
+    stream_key = get_topic_stream_key()
+    try:
+        msg_id = await binary_redis_client.xadd(
+            stream_key, encode_entry(fields), maxlen=MAX_STREAM_LENGTH, approximate=True
+        )
+        logger.info("[Redis Publisher] Added message for topic %s of client %s (id: %s)", topic, client_id, msg_id)
+        return msg_id.decode()
+    except Exception as exc:
+        logger.error("Error adding message for topic %s to stream %s: %s", topic, stream_key, exc)
+        return None
+
+
+async def _fan_out(msg_id: str, data: Dict[str, str]) -> int:
+    """
+    Write a topic entry to the subscribed sockets in parallel. Writes still
+    running after SEND_TIMEOUT_SEC are cancelled, so one full send buffer cannot
+    hold up topic delivery for the node, and their sockets are reaped, as a
+    cancelled write may leave part of a frame on them.
+    """
+    trie = _tries.get(data.get("c", ""))
+    if trie is None:
+        return 0
+    sockets = list(trie.match(data.get("k", "")))
+    if not sockets:
+        return 0
+    frame = build_topic_frame(data["k"], msg_id, data["f"])
+    tasks = [asyncio.create_task(websocket.send_text(frame)) for websocket in sockets]
+    done, pending = await asyncio.wait(tasks, timeout=SEND_TIMEOUT_SEC)
+    for task in pending:
+        task.cancel()
+    written = sum(1 for task in done if task.exception() is None)
+    if written < len(tasks):
+        # Sockets whose write failed outright are reaped by the heartbeat sweeper.
+        logger.debug("Could not send topic %s entry %s to %d sockets", data["k"], msg_id, len(tasks) - written)
+    if pending:
+        await asyncio.gather(
+            *(heartbeat.reap_websocket(websocket, "unwritable") for websocket, task in zip(sockets, tasks) if task in pending),
+            return_exceptions=True,
+        )
+    return written
+
+
+async def consume_topics() -> None:
+    """
+    Follow the topics stream from its current end and deliver each entry to the
+    sockets on this node subscribed to a matching filter. Every node reads every
+    entry with plain XREAD, so a publish costs one stream write however many
+    sockets follow the topic. Entries published while a node is not reading are
+    not delivered by it later. Returns only by raising, so the caller can retry.
+    """
+    stream_key = get_topic_stream_key()
+    latest = await binary_redis_client.xrevrange(stream_key, count=1)
+    last_id = latest[0][0].decode() if latest else "0-0"
+    while True:
+        response = await binary_redis_client.xread({stream_key: last_id}, count=READ_COUNT, block=BLOCK_MS)
+        if not response:
+            continue
+        messages = response[0][1]
+        last_id = messages[-1][0].decode()
+        metrics.inc("topic_entries_read", len(messages))
+        if not _tries:
+            continue
+        for msg_id, raw in messages:
+            try:
+                data = decode_entry(raw)
+            except ValueError as exc:
+                logger.error("Skipping undecodable topic entry %s: %s", msg_id, exc)
+                continue
+            metrics.inc("topic_frames_sent", await _fan_out(msg_id.decode(), data))
@@ -0,0 +1,155 @@
+import json
+import logging
+from typing import Collection, Dict, List, Optional
+
+from redis.exceptions import ResponseError
+
+from config.client import ConfigClient
+from redis_client.client import get_redis_client
+from utils.helpers import get_group_name, get_stream_key, get_unread_channel, get_unread_key
+from websocket_manager.connection_manager import manager
+from websocket_manager.shards import count_indexed
+from websocket_manager.streams import SHARDED
+
+GROUP_NAME: str = get_group_name()
+UNREAD_CHANNEL: str = get_unread_channel()
+RECONCILE_SCAN_COUNT: int = int(ConfigClient.get_property("RECONCILE_SCAN_COUNT", section="UNREAD"))
+
+logger = logging.getLogger(__name__)
+redis_client = get_redis_client()
+
+# Adjusts the counter by ARGV[1], clamping it at zero so a duplicate or late
+# acknowledgement can never drive it negative, and publishes the change in the
+# same atomic step so subscribers see deltas in the order they were applied.
+# ARGV[2] is the JSON event with its trailing `count` value left open.
+_ADJUST_SCRIPT = redis_client.register_script("""
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+if count < 0 then
+    redis.call('SET', KEYS[1], 0)
+    count = 0
+end
+redis.call('PUBLISH', KEYS[2], ARGV[2] .. count .. '}')
+return count
+""")
+
+
+def _event_prefix(client_id: str, user_id: str, delta: int) -> str:
+    event = json.dumps({"type": "unread", "client_id": client_id, "user_id": user_id, "delta": delta})
+    return event[:-1] + ', "count": '
+
+
+async def adjust_unread(client_id: str, user_id: str, delta: int) -> int:
+    """
+    Atomically add `delta` to a user's unread counter and publish the change.
+
+    Returns:
+        int: The counter value after the change.
+    """
+    key = get_unread_key(client_id, user_id)
+    return int(await _ADJUST_SCRIPT(keys=[key, UNREAD_CHANNEL], args=[delta, _event_prefix(client_id, user_id, delta)]))
+
+
+async def adjust_unread_many(client_id: str, deltas: Dict[str, int]) -> Dict[str, int]:
+    """
+    Apply counter changes for several users of one client in a single pipelined round trip.
+
+    Returns:
+        Dict[str, int]: The counter value after the change, per user ID.
+    """
+    user_ids = [user_id for user_id, delta in deltas.items() if delta]
+    if not user_ids:
+        return {}
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for user_id in user_ids:
+            await _ADJUST_SCRIPT(
+                keys=[get_unread_key(client_id, user_id), UNREAD_CHANNEL],
+                args=[deltas[user_id], _event_prefix(client_id, user_id, deltas[user_id])],
+                client=pipe,
+            )
+        results = await pipe.execute()
+    return {user_id: int(count) for user_id, count in zip(user_ids, results)}
+
+
+async def get_unread_counts(client_id: str, user_ids: List[str]) -> Dict[str, int]:
+    """
+    Fetch the unread counters of several users of one client with a single MGET.
+    Users without a counter have nothing unread.
+    """
+    if not user_ids:
+        return {}
+    values = await redis_client.mget([get_unread_key(client_id, user_id) for user_id in user_ids])
+    return {user_id: int(value or 0) for user_id, value in zip(user_ids, values)}
+
+
+async def count_unacknowledged(user_id: str) -> Optional[int]:
+    """
+    Number of entries in a user's stream that have not been acknowledged yet:
+    those delivered but still in the group's PEL plus those not delivered at all.
+    In the sharded layout, the size of the user's index.
+
+    Returns:
+        Optional[int]: The count, or None when Redis cannot tell how many entries
+        are undelivered (the group lag is unknown after trimming).
+    """
+    if SHARDED:
+        return await count_indexed(user_id)
+    stream_key = get_stream_key(user_id)
+    try:
+        groups = await redis_client.xinfo_groups(stream_key)
+    except ResponseError:
+        return 0  # no stream yet
+    group = next((g for g in groups if g["name"] == GROUP_NAME), None)
+    if group is None:
+        # Nobody has connected yet, so every entry is still unread.
+        return await redis_client.xlen(stream_key)
+    if group.get("lag") is None:
+        return None
+    return int(group["pending"]) + int(group["lag"])
+
+
+async def reconcile_unread_counters(skip_client_ids: Collection[str] = ()) -> int:
+    """
+    Correct every unread counter that drifted from its stream, e.g. after a
+    publish whose counter update failed or entries dropped by MAXLEN trimming.
+    The correction is applied as a delta, so a publish racing with the pass is
+    at worst off by one until the next pass.
+
+    Counters of clients in `skip_client_ids` are left alone: streams read in cursor
+    mode have no consumer group, so Redis cannot tell what their users acknowledged.
+
+    Returns:
+        int: Number of counters that were corrected.
+    """
+    pattern = get_unread_key("*", "*")
+    prefix_len = len(get_unread_key("", ""))  # "<env>:<app>:<prefix>::"
+    corrected = 0
+    async for key in redis_client.scan_iter(match=pattern, count=RECONCILE_SCAN_COUNT):
+        client_id, _, user_id = key[prefix_len - 1:].partition(":")
+        if client_id in skip_client_ids:
+            continue
+        actual = await count_unacknowledged(user_id)
+        if actual is None:
+            continue
+        current = int(await redis_client.get(key) or 0)
+        if current != actual:
+            await adjust_unread(client_id, user_id, actual - current)
+            logger.info("Reconciled unread counter %s: %d -> %d", key, current, actual)
+            corrected += 1
+    return corrected
+
+
+async def relay_unread_events() -> None:
+    """
+    Forward counter changes published by any node to the WebSocket connections
+    the affected user opened for the counter's client on this node, so a user ID
+    shared by several clients never sees another client's counts. Returns only
+    if the subscription breaks.
+    """
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(UNREAD_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            event = json.loads(message["data"])
+            await manager.send_personal_message(message["data"], event["user_id"], event["client_id"])
+    finally:
+        await pubsub.aclose()
@@ -0,0 +1,18 @@
+import logging
+
+from config.client import ConfigClient
+from websocket_manager.inbound import flush_acks
+from workers.base import run_periodically
+
+ACK_FLUSH_MS: int = int(ConfigClient.get_property("ACK_FLUSH_MS", section="INBOUND"))
+
+logger = logging.getLogger(__name__)
+
+
+async def run_ack_flusher() -> None:
+    """
+    Background worker that applies the acks this node's WebSocket clients sent,
+    every ACK_FLUSH_MS milliseconds, so a burst of acks costs a few round trips.
+    """
+    logger.info("Ack flusher started (interval=%sms)", ACK_FLUSH_MS)
+    await run_periodically("ack-flusher", flush_acks, ACK_FLUSH_MS / 1000)
@@ -0,0 +1,22 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(name: str, job: Callable[[], Awaitable[None]], interval_sec: float) -> None:
+    """
+    Run `job` forever, sleeping `interval_sec` between passes.
+
+    A failing pass is logged and retried on the next tick instead of killing the
+    worker; cancellation propagates so the worker can be stopped cleanly.
+    """
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("[%s] Pass failed: %s", name, exc, exc_info=True)
+        await asyncio.sleep(interval_sec)
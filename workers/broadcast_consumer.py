@@ -0,0 +1,16 @@
+import logging
+
+from websocket_manager.broadcast import consume_broadcasts
+from websocket_manager.streams import ERROR_SLEEP_SEC
+from workers.base import run_periodically
+
+logger = logging.getLogger(__name__)
+
+
+async def run_broadcast_consumer() -> None:
+    """
+    Background worker that delivers new entries of the shared broadcast stream
+    to the matching WebSocket connections on this node.
+    """
+    logger.info("Broadcast consumer started")
+    await run_periodically("broadcast-consumer", consume_broadcasts, ERROR_SLEEP_SEC)
@@ -0,0 +1,18 @@
+import logging
+
+from websocket_manager.heartbeat import IDLE_TIMEOUT_SEC, PING_INTERVAL_SEC, TICK_SEC, sweep
+from workers.base import run_periodically
+
+logger = logging.getLogger(__name__)
+
+
+async def run_heartbeat_sweeper() -> None:
+    """
+    Background worker that pings quiet WebSocket connections on this node and
+    reaps those that stopped answering, every TICK_SEC.
+    """
+    logger.info(
+        "Heartbeat sweeper started (ping=%ss, idle timeout=%ss, tick=%ss)",
+        PING_INTERVAL_SEC, IDLE_TIMEOUT_SEC, TICK_SEC,
+    )
+    await run_periodically("heartbeat-sweeper", sweep, TICK_SEC)
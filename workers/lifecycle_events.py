@@ -0,0 +1,68 @@
+import logging
+import os
+import socket
+from uuid import UUID
+
+from db.session import async_session
+from repository.request import RequestDAO
+from utils.metrics import metrics
+from websocket_manager.lifecycle import (
+    acknowledge_events,
+    aggregate_events,
+    ensure_lifecycle_group,
+    read_events,
+    store_latencies,
+)
+from websocket_manager.streams import ERROR_SLEEP_SEC
+from workers.base import run_periodically
+
+CONSUMER_NAME = f"{socket.gethostname()}-{os.getpid()}"
+
+logger = logging.getLogger(__name__)
+
+
+async def process_lifecycle_batch(start_id: str = ">") -> int:
+    """
+    Read one batch from the lifecycle event log, persist its deliveries with one
+    batched status update per client, fold its latencies into the histograms
+    and acknowledge it.
+
+    Returns:
+        int: Number of events processed.
+    """
+    entries = await read_events(CONSUMER_NAME, start_id)
+    if not entries:
+        return 0
+
+    histograms, delivered = aggregate_events(entries)
+    if delivered:
+        async with async_session() as session:
+            request_dao = RequestDAO(session)
+            for client_id, deliveries in delivered.items():
+                await request_dao.mark_delivered(UUID(client_id), deliveries)
+    await store_latencies(histograms)
+    await acknowledge_events([entry_id for entry_id, _event in entries])
+
+    metrics.inc("lifecycle_events_processed", len(entries))
+    return len(entries)
+
+
+async def consume_lifecycle_events() -> None:
+    """
+    Drain events left unacknowledged by a previous run of this consumer, then
+    follow the log. Returns only by raising, so the caller can retry.
+    """
+    await ensure_lifecycle_group()
+    while await process_lifecycle_batch("0"):
+        pass
+    while True:
+        await process_lifecycle_batch()
+
+
+async def run_lifecycle_consumer() -> None:
+    """
+    Background worker that turns lifecycle events into request status updates
+    and latency histograms, off the delivery path.
+    """
+    logger.info("Lifecycle event consumer %s started", CONSUMER_NAME)
+    await run_periodically("lifecycle-events", consume_lifecycle_events, ERROR_SLEEP_SEC)
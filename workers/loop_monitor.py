@@ -0,0 +1,30 @@
+import functools
+import logging
+
+from config.client import ConfigClient
+from utils.loop_monitor import SlowCallbackWatchdog, loop_monitor
+from workers.base import run_periodically
+
+SAMPLE_INTERVAL_SEC: float = float(ConfigClient.get_property("SAMPLE_INTERVAL_SEC", section="LOOP_MONITOR"))
+# 0 disables the slow-callback watchdog.
+SLOW_CALLBACK_MS: float = float(ConfigClient.get_property("SLOW_CALLBACK_MS", section="LOOP_MONITOR"))
+STACK_DEPTH: int = int(ConfigClient.get_property("STACK_DEPTH", section="LOOP_MONITOR"))
+
+logger = logging.getLogger(__name__)
+
+
+async def run_loop_monitor() -> None:
+    """
+    Background worker that keeps measuring this node's event loop lag, and runs
+    the slow-callback watchdog alongside. Each sample is itself a
+    SAMPLE_INTERVAL_SEC sleep, so no pause is added between them.
+    """
+    logger.info("Event loop monitor started (interval=%ss, slow callback=%sms)", SAMPLE_INTERVAL_SEC, SLOW_CALLBACK_MS)
+    watchdog = SlowCallbackWatchdog(SLOW_CALLBACK_MS, STACK_DEPTH) if SLOW_CALLBACK_MS else None
+    if watchdog:
+        watchdog.start()
+    try:
+        await run_periodically("loop-monitor", functools.partial(loop_monitor.sample, SAMPLE_INTERVAL_SEC), 0)
+    finally:
+        if watchdog:
+            watchdog.stop()
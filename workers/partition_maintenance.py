@@ -0,0 +1,31 @@
+import logging
+
+from config.client import ConfigClient
+from db.partitioning import maintain_partitions
+from db.session import engine
+from workers.base import run_periodically
+
+MAINTENANCE_INTERVAL_SEC: float = float(ConfigClient.get_property("MAINTENANCE_INTERVAL_SEC", section="PARTITIONING"))
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_request_partitions() -> None:
+    """
+    One maintenance pass over the partitioned requests table.
+
+    Uses an AUTOCOMMIT connection because expired partitions are detached
+    CONCURRENTLY, which cannot run inside a transaction block.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await maintain_partitions(conn)
+
+
+async def run_partition_maintenance() -> None:
+    """
+    Background worker that keeps future request partitions created and expired ones
+    detached or dropped according to client retention.
+    """
+    logger.info("Partition maintenance started (interval=%ss)", MAINTENANCE_INTERVAL_SEC)
+    await run_periodically("partition-maintenance", maintain_request_partitions, MAINTENANCE_INTERVAL_SEC)
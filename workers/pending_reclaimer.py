@@ -0,0 +1,30 @@
+import logging
+
+from config.client import ConfigClient
+from websocket_manager.reclaim import reclaim_pending_entries
+from websocket_manager.streams import SHARDED
+from workers.base import run_periodically
+
+RECLAIM_INTERVAL_SEC: float = float(ConfigClient.get_property("INTERVAL_SEC", section="RECLAIM"))
+
+logger = logging.getLogger(__name__)
+
+
+async def reclaim_pass() -> None:
+    stats = await reclaim_pending_entries()
+    if stats.claimed:
+        logger.info(
+            "Reclaimed %d idle pending entries of %d users: %d redelivered, %d dead-lettered",
+            stats.claimed, stats.users, stats.redelivered, stats.dead_lettered,
+        )
+
+
+async def run_pending_reclaimer() -> None:
+    """
+    Background worker that redelivers pending entries left idle by dead sockets
+    to the users' live sockets on this node. Only runs in the per-user stream layout.
+    """
+    if SHARDED:
+        return
+    logger.info("Pending reclaimer started (interval=%ss)", RECLAIM_INTERVAL_SEC)
+    await run_periodically("pending-reclaimer", reclaim_pass, RECLAIM_INTERVAL_SEC)
@@ -0,0 +1,37 @@
+import logging
+from datetime import datetime, timedelta
+
+from archive.exporter import archive_partitions, prune_archive
+from config.client import ConfigClient
+from db.session import async_session, engine
+from repository.payload import PayloadDAO
+from workers.base import run_periodically
+
+ARCHIVE_INTERVAL_SEC: float = float(ConfigClient.get_property("INTERVAL_SEC", section="ARCHIVE"))
+PAYLOAD_GC_GRACE_SEC: int = int(ConfigClient.get_property("GC_GRACE_SEC", section="PAYLOADS"))
+PAYLOAD_GC_BATCH_SIZE: int = int(ConfigClient.get_property("GC_BATCH_SIZE", section="PAYLOADS"))
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_requests() -> None:
+    """
+    One archival pass: move aged request partitions to archive files, delete
+    archive files past retention, and delete shared payloads no request uses any more.
+    """
+    await archive_partitions(engine)
+    await prune_archive(engine)
+
+    created_before = datetime.utcnow() - timedelta(seconds=PAYLOAD_GC_GRACE_SEC)
+    async with async_session() as session:
+        deleted = await PayloadDAO(session).delete_unreferenced(created_before, PAYLOAD_GC_BATCH_SIZE)
+    if deleted:
+        logger.info("Deleted %d unreferenced payloads", deleted)
+
+
+async def run_request_archiver() -> None:
+    """
+    Background worker that moves old requests out of Postgres into compressed archive files.
+    """
+    logger.info("Request archiver started (interval=%ss)", ARCHIVE_INTERVAL_SEC)
+    await run_periodically("request-archiver", archive_requests, ARCHIVE_INTERVAL_SEC)
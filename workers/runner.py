@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+from workers.ack_flusher import run_ack_flusher
+from workers.broadcast_consumer import run_broadcast_consumer
+from workers.heartbeat_sweeper import run_heartbeat_sweeper
+from workers.lifecycle_events import run_lifecycle_consumer
+from workers.loop_monitor import run_loop_monitor
+from workers.partition_maintenance import run_partition_maintenance
+from workers.pending_reclaimer import run_pending_reclaimer
+from workers.request_archiver import run_request_archiver
+from workers.shard_consumer import run_shard_consumer
+from workers.stream_retention import run_stream_retention
+from workers.topic_consumer import run_topic_consumer
+from workers.unread_counters import run_unread_reconciler, run_unread_relay
+from workers.webhook_ingestion import run_webhook_ingestion
+
+logger = logging.getLogger(__name__)
+
+# Long-running background workers started with the application.
+WORKERS: List[Callable[[], Awaitable[None]]] = [
+    run_partition_maintenance,
+    run_request_archiver,
+    run_stream_retention,
+    run_unread_reconciler,
+    run_unread_relay,
+    run_lifecycle_consumer,
+    run_webhook_ingestion,
+    run_shard_consumer,
+    run_ack_flusher,
+    run_pending_reclaimer,
+    run_heartbeat_sweeper,
+    run_loop_monitor,
+    run_topic_consumer,
+    run_broadcast_consumer,
+]
+
+_tasks: List[asyncio.Task] = []
+
+
+def start_workers() -> None:
+    """
+    Start every registered background worker on the running event loop.
+    Call from the application's startup (lifespan) hook.
+    """
+    for worker in WORKERS:
+        _tasks.append(asyncio.create_task(worker(), name=worker.__name__))
+    logger.info("Started %d background workers", len(_tasks))
+
+
+async def stop_workers() -> None:
+    """
+    Cancel the background workers and wait for them to finish.
+    Call from the application's shutdown (lifespan) hook.
+    """
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
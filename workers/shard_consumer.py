@@ -0,0 +1,18 @@
+import logging
+
+from websocket_manager.shards import ASSIGNED_SHARDS, NODE_ID, consume_shards
+from websocket_manager.streams import ERROR_SLEEP_SEC, SHARDED
+from workers.base import run_periodically
+
+logger = logging.getLogger(__name__)
+
+
+async def run_shard_consumer() -> None:
+    """
+    Background worker that delivers new entries of this node's shard streams to
+    the WebSocket connections on this node. Only runs in the sharded stream layout.
+    """
+    if not SHARDED:
+        return
+    logger.info("Shard consumer %s started for %d shards", NODE_ID, len(ASSIGNED_SHARDS))
+    await run_periodically("shard-consumer", consume_shards, ERROR_SLEEP_SEC)
@@ -0,0 +1,28 @@
+import logging
+
+from config.client import ConfigClient
+from websocket_manager.retention import enforce_stream_retention
+from workers.base import run_periodically
+
+RETENTION_INTERVAL_SEC: float = float(ConfigClient.get_property("INTERVAL_SEC", section="RETENTION"))
+
+logger = logging.getLogger(__name__)
+
+
+async def retention_pass() -> None:
+    stats = await enforce_stream_retention()
+    logger.info(
+        "Stream retention scanned %d streams: trimmed %d entries from %d streams (%d bytes reclaimed), "
+        "set a TTL on %d idle streams (%d bytes), cleared it on %d active ones",
+        stats.streams, stats.trimmed_entries, stats.trimmed_streams, stats.reclaimed_bytes,
+        stats.expiring_streams, stats.expiring_bytes, stats.persisted_streams,
+    )
+
+
+async def run_stream_retention() -> None:
+    """
+    Background worker that trims acknowledged entries from user streams and
+    expires the streams of users who have gone idle.
+    """
+    logger.info("Stream retention started (interval=%ss)", RETENTION_INTERVAL_SEC)
+    await run_periodically("stream-retention", retention_pass, RETENTION_INTERVAL_SEC)
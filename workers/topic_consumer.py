@@ -0,0 +1,16 @@
+import logging
+
+from websocket_manager.streams import ERROR_SLEEP_SEC
+from websocket_manager.topics import consume_topics
+from workers.base import run_periodically
+
+logger = logging.getLogger(__name__)
+
+
+async def run_topic_consumer() -> None:
+    """
+    Background worker that delivers new entries of the shared topics stream to
+    the subscribed WebSocket connections on this node.
+    """
+    logger.info("Topic consumer started")
+    await run_periodically("topic-consumer", consume_topics, ERROR_SLEEP_SEC)
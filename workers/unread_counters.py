@@ -0,0 +1,39 @@
+import logging
+
+from config.client import ConfigClient
+from db.session import async_session
+from enums.delivery_mode import DeliveryMode
+from repository.client import ClientDAO
+from websocket_manager.streams import ERROR_SLEEP_SEC
+from websocket_manager.unread import reconcile_unread_counters, relay_unread_events
+from workers.base import run_periodically
+
+RECONCILE_INTERVAL_SEC: float = float(ConfigClient.get_property("RECONCILE_INTERVAL_SEC", section="UNREAD"))
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_pass() -> None:
+    async with async_session() as session:
+        cursor_clients = await ClientDAO(session).get_client_ids_by_delivery_mode(DeliveryMode.CURSOR)
+    corrected = await reconcile_unread_counters({str(client_id) for client_id in cursor_clients})
+    if corrected:
+        logger.info("Unread reconciliation corrected %d counters", corrected)
+
+
+async def run_unread_reconciler() -> None:
+    """
+    Background worker that periodically resets unread counters to the number of
+    unacknowledged entries in each user's stream (group delivery mode only).
+    """
+    logger.info("Unread reconciler started (interval=%ss)", RECONCILE_INTERVAL_SEC)
+    await run_periodically("unread-reconciler", reconcile_pass, RECONCILE_INTERVAL_SEC)
+
+
+async def run_unread_relay() -> None:
+    """
+    Background worker that pushes unread counter changes to this node's WebSocket
+    connections, resubscribing after a short pause if the subscription drops.
+    """
+    logger.info("Unread relay started")
+    await run_periodically("unread-relay", relay_unread_events, ERROR_SLEEP_SEC)
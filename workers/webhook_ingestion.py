@@ -0,0 +1,63 @@
+import logging
+import os
+import socket
+
+from db.session import async_session
+from repository.request import RequestDAO
+from utils.metrics import metrics
+from webhooks.queue import (
+    acknowledge_status_updates,
+    coalesce_status_updates,
+    ensure_webhook_group,
+    read_status_updates,
+)
+from websocket_manager.streams import ERROR_SLEEP_SEC
+from workers.base import run_periodically
+
+CONSUMER_NAME = f"{socket.gethostname()}-{os.getpid()}"
+
+logger = logging.getLogger(__name__)
+
+
+async def process_webhook_batch(start_id: str = ">") -> int:
+    """
+    Read one batch of queued provider updates, coalesce it to one update per
+    request and write it with `RequestDAO.bulk_update_status`, then acknowledge it.
+    Updates never move a request backwards, so late or redelivered callbacks are harmless.
+
+    Returns:
+        int: Number of queued updates processed.
+    """
+    entries = await read_status_updates(CONSUMER_NAME, start_id)
+    if not entries:
+        return 0
+
+    updates = coalesce_status_updates(entries)
+    if updates:
+        async with async_session() as session:
+            updated = await RequestDAO(session).bulk_update_status(updates, forward_only=True)
+        metrics.inc("webhook_requests_updated", updated)
+    await acknowledge_status_updates([entry_id for entry_id, _fields in entries])
+
+    metrics.inc("webhook_updates_processed", len(entries))
+    return len(entries)
+
+
+async def consume_webhook_updates() -> None:
+    """
+    Drain updates left unacknowledged by a previous run of this consumer, then
+    follow the queue. Returns only by raising, so the caller can retry.
+    """
+    await ensure_webhook_group()
+    while await process_webhook_batch("0"):
+        pass
+    while True:
+        await process_webhook_batch()
+
+
+async def run_webhook_ingestion() -> None:
+    """
+    Background worker that applies queued provider status callbacks to requests in batches.
+    """
+    logger.info("Webhook ingestion consumer %s started", CONSUMER_NAME)
+    await run_periodically("webhook-ingestion", consume_webhook_updates, ERROR_SLEEP_SEC)